@@ -1,36 +1,70 @@
+import sys
+if __name__ == "__main__" and "--startup-profile" in sys.argv:
+    # Installed before any other import so their cost shows up in the report
+    from profiling.ImportProfiler import ImportProfiler
+    ImportProfiler.install()
+
 from controller.Player import PlayerState
 from controledmodel.Board import Board
-from views.BoardView import BoardView
 from controller.Player import HumanController, AIController
 from singleton.CardLoader import CardLoader
 import random
-import curses
-from typing import List
-from model.Card import UnitCard, WeatherCard, SpecialCard, Ability
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+from model.Card import UnitCard, WeatherCard, SpecialCard, Ability, Faction
 import traceback  # Add this import
 from views.ViewFactory import ViewFactory
+from model.MatchLog import MatchLog, LoggedMove
+from model.DeckLibrary import DeckLibrary, DEFAULT_DECK_FILE
+from profiling.PhaseProfiler import PhaseProfiler
 import argparse  # Add this import
 
+@dataclass
+class MatchResult:
+    """Outcome of a finished match.
+
+    moves lists the decisions of the controllers only, a pass as (player, (), None).
+    The turns the game passes for a side by itself, once that side has an
+    empty hand or has already passed, are not listed, so moves does not
+    give the number of turns a side sat out.
+    """
+    winner: Optional[str]  # Name of the winning player, None on a draw
+    round_scores: List[Tuple[int, int]] = field(default_factory=list)  # (player, opponent) per round
+    moves: List[Tuple[str, Tuple[str, ...], Optional[str]]] = field(default_factory=list)  # (player, card IDs, row)
+    seed: Optional[int] = None
+
 class GwentGame:
-    def __init__(self, view_type="curses", view_config=None):
+    def __init__(self, view_type="curses", view_config=None,
+                 player_controller=HumanController, opponent_controller=AIController, seed=None,
+                 max_fps=30, decks: Optional[Tuple[Optional[List[str]], Optional[List[str]]]] = None,
+                 shuffle_decks: bool = True):
         # Get singleton instance
         self.card_loader = CardLoader.get_instance()
+
+        # All randomness of a match goes through this RNG so a seed replays it
+        self.seed = seed
+        self.rng = random.Random(seed)
         
-        # Create basic decks
-        player_deck = self.create_basic_deck()
-        ai_deck = self.create_basic_deck()
+        # Create basic decks for the sides without a given deck
+        player_deck, ai_deck = [deck if deck is not None else self.create_basic_deck()
+                                for deck in (decks or (None, None))]
         
         # Create player states
-        player_state = PlayerState("Player", "NEUTRAL", player_deck, None)
-        ai_state = PlayerState("AI", "NEUTRAL", ai_deck, None)
+        player_state = PlayerState("Player", "NEUTRAL", player_deck, None, self.rng, shuffle_decks)
+        ai_state = PlayerState("AI", "NEUTRAL", ai_deck, None, self.rng, shuffle_decks)
+
+        # Every decision is logged against the dealt decks so the match can be replayed
+        self.match_log = MatchLog(seed, tuple(state.get_hand() + state.get_draw_pile()
+                                              for state in (player_state, ai_state)))
         
         # Initialize game components
         self.board = Board()
         self.view = ViewFactory.create_view(view_type, view_config)
         self.view.board = self.board  # Add this line to set initial board reference
         
-        self.player1 = HumanController(player_state)
-        self.player2 = AIController(ai_state)
+        self.player1 = player_controller(player_state)
+        self.player2 = opponent_controller(ai_state)
         
         # Give view access to player controllers
         self.view.setup_players(self.player1, self.player2)
@@ -39,48 +73,67 @@ class GwentGame:
         self.running = True
         self.player_score = 0
         self.opponent_score = 0
+        self.round_scores = []
+        self.moves = []
+
+        # Redraws are capped at max_fps, turns never wait for a frame
+        self.frame_interval = 1.0 / max_fps if max_fps else 0.0
+        self._next_frame_time = 0.0
+        self._frame_pending = False
 
         # Set up board controllers
         self.board.set_controllers(self.player1, self.player2)
 
+        # Phases are only timed once a profiler was installed, e.g. by --profile
+        profiler = PhaseProfiler.get_instance()
+        if profiler is not None:
+            profiler.instrument_match(self)
+
+    # Card pools for deck building as (catalog generation, pools), computed from the catalog indexes
+    _deck_pools = None
+
+    def get_deck_pools(self):
+        """Return (unit, spy, special, weather) card ID pools for deck building.
+
+        Each ID appears once per copy its catalog count allows, so sampling
+        a pool never puts more copies of a card into a deck than exist.
+        """
+        loader = self.card_loader
+        unit_ids = loader.get_card_ids_by_class(UnitCard)
+        if GwentGame._deck_pools is None or GwentGame._deck_pools[0] != loader.generation:
+            spy_ids = set(loader.get_card_ids_by_ability(Ability.SPY))
+
+            def copies(card_ids):
+                return [cid for cid in card_ids for _ in range(loader.get_card_count(cid))]
+
+            GwentGame._deck_pools = loader.generation, (
+                copies(cid for cid in unit_ids if cid not in spy_ids and loader.get_card_value(cid) > 0),
+                copies(cid for cid in unit_ids if cid in spy_ids),
+                copies(loader.get_card_ids_by_class(SpecialCard)),
+                copies(loader.get_card_ids_by_class(WeatherCard)),
+            )
+        return GwentGame._deck_pools[1]
+
     def create_basic_deck(self) -> List[str]:
         """Create a basic deck with 22 unit cards and 5 special/weather cards"""
-        all_cards = self.card_loader.get_all_card_ids()
-        
-        # Filter cards by type and ability
-        unit_cards = []
-        spy_cards = []
-        special_cards = []
-        weather_cards = []
-        
-        for card_id in all_cards:
-            card = self.card_loader.get_card_by_id(card_id)
-            if isinstance(card, UnitCard):
-                if hasattr(card, 'ability') and card.ability == Ability.SPY:
-                    spy_cards.append(card_id)
-                elif card.value > 0:  # Only cards with value
-                    unit_cards.append(card_id)
-            elif isinstance(card, WeatherCard):
-                weather_cards.append(card_id)
-            elif isinstance(card, SpecialCard):
-                special_cards.append(card_id)
+        unit_cards, spy_cards, special_cards, weather_cards = self.get_deck_pools()
 
         # Select cards for deck
         deck = []
         # Add spy cards first (at least 1 if available)
         if spy_cards:
-            deck.extend(random.sample(spy_cards, min(2, len(spy_cards))))
+            deck.extend(self.rng.sample(spy_cards, min(2, len(spy_cards))))
             
         # Fill remaining unit slots
         remaining_unit_slots = 22 - len(deck)
         if len(unit_cards) >= remaining_unit_slots:
-            deck.extend(random.sample(unit_cards, remaining_unit_slots))
+            deck.extend(self.rng.sample(unit_cards, remaining_unit_slots))
             
         # Add special and weather cards
         if len(special_cards) >= 3:
-            deck.extend(random.sample(special_cards, 3))
+            deck.extend(self.rng.sample(special_cards, 3))
         if len(weather_cards) >= 2:
-            deck.extend(random.sample(weather_cards, 2))
+            deck.extend(self.rng.sample(weather_cards, 2))
             
         return deck
 
@@ -92,19 +145,7 @@ class GwentGame:
             
             while self.running:
                 try:
-                    self.player_score = self.board.get_player_value()
-                    self.opponent_score = self.board.get_enemy_value()
-                    
-                    if self.is_player_turn:
-                        self.handle_player_turn()
-                    else:
-                        self.handle_ai_turn()
-                    
-                    # Check if round should end
-                    if (self.board.player_passed and self.board.enemy_passed) or \
-                       (not self.player1.get_hand() and not self.player2.get_hand()):
-                        self.handle_round_end()
-                    
+                    self.play_turn()
                     self.handle_input()
                         
                 except Exception as e:
@@ -122,10 +163,67 @@ class GwentGame:
         finally:
             self.end_game()
 
+    def run_headless(self) -> MatchResult:
+        """Play the match to the end without drawing or waiting for input"""
+        while self.running:
+            self.play_turn()
+        return self.get_result()
+
+    def play_turn(self):
+        """Play a single turn and end the round if both sides are done"""
+        self.player_score = self.board.get_player_value()
+        self.opponent_score = self.board.get_enemy_value()
+        
+        if self.is_player_turn:
+            self.handle_player_turn()
+        else:
+            self.handle_ai_turn()
+        
+        # Check if round should end
+        if (self.board.player_passed and self.board.enemy_passed) or \
+           (not self.player1.state.hand_size() and not self.player2.state.hand_size()):
+            self.handle_round_end()
+
+    def get_result(self) -> MatchResult:
+        """Build the structured result of the match played so far"""
+        player_out = self.player1.is_eliminated()
+        opponent_out = self.player2.is_eliminated()
+        if player_out and not opponent_out:
+            winner = self.player2.state.name
+        elif opponent_out and not player_out:
+            winner = self.player1.state.name
+        else:
+            winner = None
+        return MatchResult(winner, list(self.round_scores), list(self.moves), self.seed)
+
+    def record_move(self, controller, cards, row):
+        """Remember a move for the match result and the match log"""
+        side = 0 if controller is self.player1 else 1
+        if cards == "PASS":
+            self.moves.append((controller.state.name, (), None))
+            self.match_log.moves.append(LoggedMove(side, None))
+        else:
+            cards = cards if isinstance(cards, list) else [cards]
+            card_ids = tuple(card.id for card in cards)
+            self.moves.append((controller.state.name, card_ids, row))
+            # A medic returns [medic, revived card], a muster card lists the cards it pulled along
+            revived = card_ids[1] if len(cards) > 1 and getattr(cards[0], 'ability', None) == Ability.MEDIC else None
+            self.match_log.moves.append(LoggedMove(side, card_ids[0], row, revived))
+
+    def get_match_log(self) -> MatchLog:
+        """Return the log of the match so far, with its result once it is over"""
+        log = self.match_log
+        log.finished = self.player1.is_eliminated() or self.player2.is_eliminated()
+        winner = self.get_result().winner
+        log.winner = None if winner is None else (0 if winner == self.player1.state.name else 1)
+        log.round_scores = list(self.round_scores)
+        return log
+
     def handle_round_end(self):
         """Handle end of round logic"""
         player_score = self.board.get_player_value()
         opponent_score = self.board.get_enemy_value()
+        self.round_scores.append((player_score, opponent_score))
         
         # Determine round winner and update lives
         if player_score > opponent_score:
@@ -151,11 +249,10 @@ class GwentGame:
             self.view.log.append("Starting new round...")
 
     def handle_player_turn(self):
-        self.board.set_enemy_hand(self.player2.get_hand())
-        self.view.draw_board(self.board, self.player_score, self.opponent_score, 
-                           self.is_player_turn, self.player1.get_hand())
-                           
-        if not self.player1.get_hand() or self.player1.has_passed():
+        # A human is about to wait for input, so show the board right away
+        self.refresh_display(force=self.player1.is_player)
+
+        if not self.player1.state.hand_size() or self.player1.has_passed():
             self.player1.pass_turn()
             self.board.player_passed = True
             self.is_player_turn = False
@@ -169,6 +266,7 @@ class GwentGame:
         if move_result == "PASS":
             self.player1.pass_turn()
             self.board.player_passed = True
+            self.record_move(self.player1, "PASS", None)
             self.view.log.append("Player 1 passed")
             self.is_player_turn = False
             # Refresh display after passing
@@ -179,19 +277,21 @@ class GwentGame:
         if isinstance(move_result, tuple):
             card, row = move_result
             if isinstance(card, list):  # Handle muster cards
+                self.record_move(self.player1, card, row or "CLOSE")
                 for muster_card in card:
                     self.board.add_card_to_row(muster_card, True, row or "CLOSE")
                     self.view.log.append(f"Player 1 played {muster_card.name}")
                 self.is_player_turn = False
                 self.refresh_display()
             elif card:
+                self.record_move(self.player1, card, row or "CLOSE")
                 self.board.add_card_to_row(card, True, row or "CLOSE")
                 self.view.log.append(f"Player 1 played {card.name}")
                 self.is_player_turn = False
                 self.refresh_display()
 
     def handle_ai_turn(self):
-        if not self.player2.get_hand() or self.player2.has_passed():
+        if not self.player2.state.hand_size() or self.player2.has_passed():
             self.player2.pass_turn()
             self.board.enemy_passed = True
             self.is_player_turn = True
@@ -199,34 +299,62 @@ class GwentGame:
             return
             
         # Remove curses.napms and let view handle timing
-        card, row = self.player2.make_move(self.view)
+        move_result = self.player2.make_move(self.view)
+        if move_result == "PASS":
+            self.player2.pass_turn()
+            self.board.enemy_passed = True
+            self.record_move(self.player2, "PASS", None)
+            self.view.log.append("Player 2 passed")
+            self.is_player_turn = True
+            self.refresh_display()
+            return
+
+        card, row = move_result
         if isinstance(card, list):  # Handle muster cards
+            self.record_move(self.player2, card, row or "CLOSE")
             for muster_card in card:
                 self.board.add_card_to_row(muster_card, False, row or "CLOSE")
                 self.view.log.append(f"Player 2 played {muster_card.name}")
             self.is_player_turn = True
             self.refresh_display()
         elif card:
+            self.record_move(self.player2, card, row or "CLOSE")
             self.board.add_card_to_row(card, False, row or "CLOSE")
             self.view.log.append(f"Player 2 played {card.name}")
             self.is_player_turn = True
             # Refresh display after playing card
             self.refresh_display()
 
-    def refresh_display(self):
-        """Update the display with current game state"""
+    def refresh_display(self, force=False):
+        """Update the display with current game state, at most once per frame unless forced"""
         self.player_score = self.board.get_player_value()
         self.opponent_score = self.board.get_enemy_value()
+        self._frame_pending = True
+        self.draw_pending_frame(force)
+
+    def draw_pending_frame(self, force=False):
+        """Draw the latest state if a redraw is pending and the frame deadline has passed"""
+        if not self._frame_pending:
+            return
+        now = time.perf_counter()
+        if not force and now < self._next_frame_time:
+            return
+        self._frame_pending = False
+        self._next_frame_time = now + self.frame_interval
         self.board.set_enemy_hand(self.player2.get_hand())
         self.view.draw_board(self.board, self.player_score, self.opponent_score,
                            self.is_player_turn, self.player1.get_hand())
 
     def handle_input(self):
-        """Handle view-agnostic input events"""
-        self.view.handle_events(100)  # Use the abstract method instead of direct curses calls
+        """Handle input that arrived during the turn without waiting for more"""
+        if self.view.handle_events(0):
+            self._frame_pending = True
+        self.draw_pending_frame()
 
     def end_game(self):
         try:
+            # A frame held back by the frame cap would otherwise leave the last move undrawn
+            self.draw_pending_frame(force=True)
             self.view.cleanup_display()  # Changed from end_curses
         except:
             pass
@@ -236,14 +364,75 @@ class GwentGame:
 # Example usage:
 if __name__ == "__main__":
     # Parse command line arguments
-    parser = argparse.ArgumentParser(description='Gwent CLI Game')
+    # No abbreviations: --startup-profile is matched in sys.argv before argparse runs
+    parser = argparse.ArgumentParser(description='Gwent CLI Game', allow_abbrev=False)
     parser.add_argument('-v', '--view', 
-                       choices=['curses', 'pygame'],
                        default='curses',
-                       help='Choose view type (default: curses)')
+                       help='Choose view type: curses, pygame or an installed view (default: curses)')
+    parser.add_argument('--headless', action='store_true',
+                       help='Play AI against AI without a display and print the result')
+    parser.add_argument('--seed', type=int, default=None,
+                       help='Seed for deck building and shuffling')
+    parser.add_argument('--fps', type=int, default=30,
+                       help='Maximum redraws per second, 0 for no limit (default: 30)')
+    parser.add_argument('--startup-profile', action='store_true',
+                       help='Report the import time of every module when the game ends')
+    parser.add_argument('--packs', nargs='+', metavar='PACK', default=None,
+                       help='Only load the named card packs')
+    parser.add_argument('--factions', nargs='+', metavar='FACTION', default=None,
+                       choices=[faction.name for faction in Faction],
+                       help='Only load cards of these factions, neutral cards are always kept')
+    parser.add_argument('--deck', metavar='NAME', default=None,
+                       help='Play a named deck from the deck file instead of a random basic deck')
+    parser.add_argument('--opponent-deck', metavar='NAME', default=None,
+                       help='Give the opponent a named deck from the deck file')
+    parser.add_argument('--deck-file', metavar='FILE', default=DEFAULT_DECK_FILE,
+                       help=f'Deck lists written by simulation/DeckOptimizer.py (default: {DEFAULT_DECK_FILE})')
+    parser.add_argument('--record', metavar='FILE', default=None,
+                       help='Write a binary log of the match for --replay')
+    parser.add_argument('--replay', metavar='FILE', default=None,
+                       help='Re-execute a recorded match headlessly and check its result')
+    parser.add_argument('--frames', nargs='+', type=int, metavar='MOVE', default=(),
+                       help='With --replay, show the position after these moves in the chosen view')
+    parser.add_argument('--frame-delay', type=float, default=2.0,
+                       help='Seconds each replayed frame stays on screen (default: 2)')
+    parser.add_argument('--profile', action='store_true',
+                       help='Time turns, AI moves, scoring and drawing and report them when the game ends')
+    parser.add_argument('--profile-output', metavar='FILE', default=None,
+                       help='Write the --profile report to FILE instead of printing it')
+    parser.add_argument('--profile-cprofile', nargs='+', metavar='PHASE', default=(),
+                       help='Also run these phases under cProfile, e.g. ai.make_move or view.draw_board')
     
     args = parser.parse_args()
-    
+    if args.frames and not args.replay:
+        parser.error("--frames needs --replay")
+    if (args.deck or args.opponent_deck) and args.replay:
+        parser.error("--deck and --opponent-deck do not apply to --replay, which plays the recorded decks")
+    if (args.profile_output or args.profile_cprofile) and not args.profile:
+        parser.error("--profile-output and --profile-cprofile need --profile")
+    if (not args.headless or args.frames) and not ViewFactory.is_available(args.view):
+        parser.error(f"unknown view '{args.view}', choose from {', '.join(ViewFactory.available_views())}")
+    CardLoader.get_instance().configure(packs=args.packs, factions=args.factions)
+    decks = None
+    if args.deck or args.opponent_deck:
+        try:
+            library = DeckLibrary.load(args.deck_file)
+            decks = tuple(library.get(name) if name else None for name in (args.deck, args.opponent_deck))
+        except KeyError as e:
+            parser.error(e.args[0])
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+        known_cards = set(CardLoader.get_instance().get_all_card_ids())
+        for name, deck in zip((args.deck, args.opponent_deck), decks):
+            unknown = sorted(set(deck or ()) - known_cards)
+            if unknown:
+                parser.error(f"deck {name!r} uses cards missing from the loaded catalog: {', '.join(unknown)}")
+    if args.profile:
+        try:
+            PhaseProfiler.install(args.profile_cprofile)
+        except ValueError as e:
+            parser.error(str(e))
+
     # Different configs for different views
     configs = {
         'curses': {
@@ -265,5 +454,42 @@ if __name__ == "__main__":
         }
     }
     
-    game = GwentGame(view_type=args.view, view_config=configs[args.view])
-    game.run()
+    if args.replay:
+        from simulation.ReplayEngine import ReplayEngine
+        engine = ReplayEngine(MatchLog.load(args.replay))
+        if args.frames:
+            result = engine.run(args.frames, args.view, configs.get(args.view), args.frame_delay)
+        else:
+            problems = engine.verify()
+            result = engine.game.get_result()
+            print("\n".join(problems) if problems else "Replay matches the recorded result")
+        print(f"Winner: {result.winner or 'Draw'}")
+        print(f"Moves: {engine.moves_played} of {len(engine.log.moves)}")
+        game = None
+    elif args.headless:
+        game = GwentGame(view_type="headless", player_controller=AIController, seed=args.seed, decks=decks)
+        result = game.run_headless()
+        print(f"Winner: {result.winner or 'Draw'}")
+        for i, (player_score, opponent_score) in enumerate(result.round_scores, 1):
+            print(f"Round {i}: {player_score} - {opponent_score}")
+        print(f"Moves: {len(result.moves)}")
+    else:
+        game = GwentGame(view_type=args.view, view_config=configs.get(args.view), seed=args.seed,
+                         max_fps=args.fps, decks=decks)
+        game.run()
+
+    if args.record and game is not None:
+        game.get_match_log().save(args.record)
+        print(f"Match log written to {args.record}")
+
+    if args.profile:
+        report = PhaseProfiler.get_instance().report()
+        if args.profile_output:
+            with open(args.profile_output, "w") as f:
+                f.write(report + "\n")
+            print(f"Profile written to {args.profile_output}")
+        else:
+            print(report)
+
+    if args.startup_profile:
+        print(ImportProfiler.get_instance().report())
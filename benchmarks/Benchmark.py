@@ -0,0 +1,349 @@
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import pty
+import statistics
+import sys
+import threading
+import time
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, List, Optional
+
+from Gwent import GwentGame
+from controller.Player import AIController
+from controledmodel.Board import Board
+from model.Card import CardInstance
+from model.Deck import Deck
+from model.GameState import GameState
+from model.VectorEvaluator import VectorEvaluator
+from simulation.BatchEngine import BatchEngine
+from singleton.CardLoader import CardLoader
+
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+@dataclass
+class BenchmarkResult:
+    """Timing of one benchmark, all times in seconds per operation"""
+    name: str
+    samples: int
+    mean: float
+    p50: float
+    p90: float
+    p99: float
+
+    @property
+    def ops_per_sec(self) -> float:
+        return 1.0 / self.mean if self.mean else 0.0
+
+class Benchmark:
+    """A timed operation.
+
+    Without a setup function run() is called in batches sized so one sample
+    takes about sample_time. With a setup function every sample gets a
+    fresh state from setup(), untimed, and run(state) is timed once, for
+    operations that consume or mutate what they work on.
+    """
+    def __init__(self, name: str, run: Callable, setup: Optional[Callable] = None):
+        self.name = name
+        self.run = run
+        self.setup = setup
+
+    def measure(self, min_time: float = 1.0, min_samples: int = 5, sample_time: float = 0.001) -> BenchmarkResult:
+        timings: List[float] = []
+        clock = time.perf_counter
+        if self.setup is None:
+            # Warm up once, then size batches so timer overhead stays negligible
+            start = clock()
+            self.run()
+            number = max(1, int(sample_time / max(clock() - start, 1e-9)))
+        # Like timeit, keep garbage collection pauses out of the samples
+        gc.collect()
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            deadline = clock() + min_time
+            while len(timings) < min_samples or clock() < deadline:
+                if self.setup is None:
+                    start = clock()
+                    for _ in range(number):
+                        self.run()
+                    timings.append((clock() - start) / number)
+                else:
+                    state = self.setup()
+                    start = clock()
+                    self.run(state)
+                    timings.append(clock() - start)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        return summarize(self.name, timings)
+
+def percentile(sorted_timings: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    index = min(len(sorted_timings) - 1, max(0, int(round(fraction * len(sorted_timings))) - 1))
+    return sorted_timings[index]
+
+def summarize(name: str, timings: List[float]) -> BenchmarkResult:
+    ordered = sorted(timings)
+    return BenchmarkResult(name, len(ordered), statistics.fmean(ordered),
+                           percentile(ordered, 0.50), percentile(ordered, 0.90), percentile(ordered, 0.99))
+
+def _midgame(seed: int = 1, turns: int = 8) -> GwentGame:
+    """A headless match with a few cards on the board"""
+    game = GwentGame(view_type="headless", player_controller=AIController, seed=seed)
+    for _ in range(turns):
+        if not game.running:
+            break
+        game.play_turn()
+    return game
+
+def _filled_board(game: GwentGame) -> Board:
+    """A fresh board holding ten cards per side from the match's decks"""
+    loader = game.card_loader
+    board = Board()
+    board.set_controllers(game.player1, game.player2)
+    for is_player, state in ((True, game.player1.state), (False, game.player2.state)):
+        for handle in reversed(state.deck.deck[-10:]):  # Top ten cards
+            card = CardInstance(loader.get_card_by_id(loader.get_card_id_by_index(handle)), state)
+            row = card.row[0].name if getattr(card, "row", None) else "CLOSE"
+            board.add_card_to_row(card, is_player, row)
+    return board
+
+# Loader benchmarks
+
+def _reset_loader():
+    CardLoader._instance = None
+
+def _cold_loader_setup():
+    _reset_loader()
+    with contextlib.suppress(FileNotFoundError):
+        os.remove("cards/.catalog_cache.pickle")
+
+def loader_benchmarks() -> List[Benchmark]:
+    return [
+        Benchmark("loader_cold", lambda _: CardLoader.get_instance(), setup=_cold_loader_setup),
+        Benchmark("loader_warm", lambda _: CardLoader.get_instance(), setup=_reset_loader),
+    ]
+
+# Engine benchmarks
+
+def engine_benchmarks() -> List[Benchmark]:
+    game = _midgame()
+    card_loader = game.card_loader
+    deck_list = game.create_basic_deck()
+    deck_handles = [card_loader.get_card_index(card_id) for card_id in deck_list]
+    card = card_loader.get_card_by_id(deck_list[-1])
+
+    def add_and_score(board):
+        board.add_card_to_row(CardInstance(card), True, "CLOSE")
+        return board.get_player_value() + board.get_enemy_value()
+
+    def play_middle_card(deck):
+        deck.play_card(deck.hand[len(deck.hand) // 2])
+
+    state = GameState.from_board(game.board, game.player1.state, game.player2.state,
+                                 0 if game.is_player_turn else 1)
+    moves = state.legal_moves()
+    evaluator = VectorEvaluator()
+
+    def score_moves_one_by_one(state):
+        side = state.to_move
+        leads = []
+        for move in moves:
+            mark = state.apply(move)
+            leads.append(state.scores[side] - state.scores[1 - side])
+            state.undo(mark)
+        return leads
+
+    return [
+        Benchmark("create_basic_deck", game.create_basic_deck),
+        Benchmark("board_add_and_score", add_and_score, setup=lambda: _filled_board(game)),
+        Benchmark("board_rescore", lambda board: board.rescore(), setup=lambda: _filled_board(game)),
+        Benchmark("board_destroy_strongest_card", lambda board: board.destroy_strongest_card(),
+                  setup=lambda: _filled_board(game)),
+        Benchmark("board_clear_board", lambda board: board.clear_board(), setup=lambda: _filled_board(game)),
+        Benchmark("deck_take_cards", lambda deck: deck.take_cards(2), setup=lambda: Deck(deck_handles)),
+        Benchmark("deck_play_card", play_middle_card, setup=lambda: Deck(deck_handles)),
+        Benchmark("state_score_moves", score_moves_one_by_one, setup=lambda: state),
+        Benchmark("evaluator_score_moves", lambda state: evaluator.score_moves(state, moves), setup=lambda: state),
+        Benchmark("headless_match", lambda seed: GwentGame(view_type="headless", player_controller=AIController,
+                                                           seed=seed).run_headless(),
+                  setup=lambda: 7),
+        Benchmark("batch_engine_1000_matches", lambda engine: engine.run(),
+                  setup=lambda: BatchEngine.shuffled(deck_list, deck_list, 1000, seed=7, policy="random")),
+    ]
+
+# View benchmarks
+
+@contextlib.contextmanager
+def offscreen_terminal(lines: int = 40, columns: int = 140):
+    """Point stdin and stdout at a pseudo terminal of the given size and discard what is drawn"""
+    master, slave = pty.openpty()
+    saved_fds = os.dup(0), os.dup(1)
+    saved_env = {key: os.environ.get(key) for key in ("TERM", "LINES", "COLUMNS")}
+    os.environ.update(TERM=os.environ.get("TERM") or "xterm-256color", LINES=str(lines), COLUMNS=str(columns))
+
+    def drain():
+        with contextlib.suppress(OSError):
+            while os.read(master, 65536):
+                pass
+
+    drainer = threading.Thread(target=drain, daemon=True)
+    drainer.start()
+    sys.stdout.flush()
+    os.dup2(slave, 0)
+    os.dup2(slave, 1)
+    try:
+        yield
+    finally:
+        sys.stdout.flush()
+        os.dup2(saved_fds[0], 0)
+        os.dup2(saved_fds[1], 1)
+        for fd in (*saved_fds, slave, master):
+            os.close(fd)
+        for key, value in saved_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+class DrawBenchmark(Benchmark):
+    """Times one draw_board frame of a mid-game position.
+
+    The view is only created inside measure(), since setting it up takes
+    over the terminal or the video driver.
+    """
+    def __init__(self, name: str, view_type: str, environment: Callable[[], contextlib.AbstractContextManager]):
+        super().__init__(name, self.draw)
+        self.view_type = view_type
+        self.environment = environment
+        self.view = None
+        self.game = None
+        self.hand = None
+
+    def draw(self):
+        board = self.game.board
+        self.view.draw_board(board, board.get_player_value(), board.get_enemy_value(), True, self.hand)
+
+    def measure(self, *args, **kwargs) -> BenchmarkResult:
+        from views.ViewFactory import ViewFactory
+        self.game = _midgame()
+        self.hand = self.game.player1.get_hand()
+        with self.environment():
+            self.view = ViewFactory.create_view(self.view_type)
+            self.view.setup_players(self.game.player1, self.game.player2)
+            self.view.init_display()
+            try:
+                return super().measure(*args, **kwargs)
+            finally:
+                self.view.cleanup_display()
+
+@contextlib.contextmanager
+def dummy_video_driver():
+    """Let pygame open its window on SDL's dummy driver"""
+    saved = os.environ.get("SDL_VIDEODRIVER")
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    try:
+        yield
+    finally:
+        if saved is None:
+            os.environ.pop("SDL_VIDEODRIVER", None)
+        else:
+            os.environ["SDL_VIDEODRIVER"] = saved
+
+def view_benchmarks() -> List[Benchmark]:
+    return [
+        DrawBenchmark("boardview_draw_board", "curses", offscreen_terminal),
+        DrawBenchmark("pygameview_draw_board", "pygame", dummy_video_driver),
+    ]
+
+def run_benchmarks(name_filter: Optional[str] = None, min_time: float = 1.0,
+                   progress: Optional[Callable[[BenchmarkResult], None]] = None) -> List[BenchmarkResult]:
+    """Run every benchmark whose name contains name_filter"""
+    results = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        CardLoader.get_instance()
+        benchmarks = loader_benchmarks() + engine_benchmarks() + view_benchmarks()
+    for benchmark in benchmarks:
+        if name_filter and name_filter not in benchmark.name:
+            continue
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = benchmark.measure(min_time)
+        results.append(result)
+        if progress:
+            progress(result)
+    return results
+
+def load_baseline(path: str) -> Dict[str, dict]:
+    with open(path) as f:
+        return json.load(f)["results"]
+
+def save_baseline(path: str, results: List[BenchmarkResult]):
+    data = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "recorded": time.strftime("%Y-%m-%d"),
+        "results": {result.name: asdict(result) for result in results},
+    }
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+
+def format_result(result: BenchmarkResult, baseline: Optional[dict] = None, threshold: float = 0.25) -> str:
+    line = (f"{result.name:<30} {result.ops_per_sec:>12.1f} ops/s  p50 {_format_time(result.p50):>9}"
+            f"  p90 {_format_time(result.p90):>9}  p99 {_format_time(result.p99):>9}")
+    if baseline:
+        change = result.p50 / baseline["p50"] - 1 if baseline["p50"] else 0.0
+        line += f"  {change:+7.1%} vs baseline"
+        if change > threshold:
+            line += "  REGRESSION"
+    return line
+
+def _format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f}{unit}"
+    return f"{seconds / 1e-9:.0f}ns"
+
+def regressions(results: List[BenchmarkResult], baseline: Dict[str, dict], threshold: float = 0.25) -> List[str]:
+    """Names of benchmarks whose median got slower than the baseline by more than threshold"""
+    return [result.name for result in results
+            if result.name in baseline and baseline[result.name]["p50"]
+            and result.p50 / baseline[result.name]["p50"] - 1 > threshold]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark the Gwent engine, card loader and views')
+    parser.add_argument('-k', '--filter', default=None,
+                       help='Only run benchmarks whose name contains this text')
+    parser.add_argument('--min-time', type=float, default=1.0,
+                       help='Minimum seconds spent sampling each benchmark (default: 1.0)')
+    parser.add_argument('--baseline', default=BASELINE_FILE,
+                       help='Baseline file to compare against')
+    parser.add_argument('--save-baseline', action='store_true',
+                       help='Run every benchmark and write the results to the baseline file instead of comparing')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                       help='Slowdown of the median that counts as a regression (default: 0.25)')
+    args = parser.parse_args()
+    if args.save_baseline and args.filter:
+        parser.error("--save-baseline records all benchmarks in one run, it cannot be combined with -k")
+
+    baseline = {}
+    if not args.save_baseline and os.path.exists(args.baseline):
+        baseline = load_baseline(args.baseline)
+
+    def print_result(result: BenchmarkResult):
+        print(format_result(result, baseline.get(result.name), args.threshold), flush=True)
+
+    results = run_benchmarks(args.filter, args.min_time, print_result)
+    if args.save_baseline:
+        save_baseline(args.baseline, results)
+        print(f"Baseline written to {args.baseline}")
+    elif baseline:
+        slower = regressions(results, baseline, args.threshold)
+        if slower:
+            print(f"Regressions: {', '.join(slower)}")
+            sys.exit(1)
@@ -1,4 +1,4 @@
-from model.Card import UnitCard, HeroCard, WeatherCard, Weather, Ability, WeatherEffect, AbstractCard  # Add explicit import
+from model.Card import UnitCard, WeatherCard, Weather, Ability, WeatherEffect, AbstractCard  # Add explicit import
 from typing import List
 class Board:
 
@@ -7,7 +7,11 @@ class Board:
         self.enemy = {row: [] for row in rows}
         self.row_multiplier_player = {row: 1 for row in rows}
         self.row_multiplier_enemy = {row: 1 for row in rows}
-        self.weather = []
+        self.weather = set()
+        self._weathered_rows = set()  # Row names currently under a weather effect
+        # Cached scores, kept up to date by every method that changes the battlefield
+        self._row_values = {True: {row: 0 for row in rows}, False: {row: 0 for row in rows}}
+        self._side_values = {True: 0, False: 0}
         self.player_passed = False
         self.enemy_passed = False
         self._enemy_hand_reference = None  # Initialize reference in __init__
@@ -19,6 +23,9 @@ class Board:
     def set_controllers(self, player_controller, enemy_controller):
         self.player_controller = player_controller
         self.enemy_controller = enemy_controller
+        # Give controllers read access to the battlefield for decision making
+        player_controller.board = self
+        enemy_controller.board = self
 
     def kill_card(self, card: AbstractCard, is_player: bool):
         """Kill a card and add it to appropriate graveyard"""
@@ -42,55 +49,82 @@ class Board:
         self.enemy = {row: [] for row in rows}
         self.row_multiplier_player = {row: 1 for row in rows}
         self.row_multiplier_enemy = {row: 1 for row in rows}
-        self.weather = []
+        self.weather = set()
+        self._weathered_rows = set()
+        self._row_values = {True: {row: 0 for row in rows}, False: {row: 0 for row in rows}}
+        self._side_values = {True: 0, False: 0}
         self.player_passed = False
         self.enemy_passed = False
+
+    def _refresh_row(self, is_player, row):
+        """Recompute one cached row score and fold the change into the side total"""
+        if is_player:
+            value = self.get_value_of_row(self.player, self.row_multiplier_player, row)
+        else:
+            value = self.get_value_of_row(self.enemy, self.row_multiplier_enemy, row)
+        row_values = self._row_values[is_player]
+        self._side_values[is_player] += value - row_values[row]
+        row_values[row] = value
+
+    def _refresh_weather(self):
+        """Recompute weathered rows and rescore the rows whose weather changed"""
+        weathered_rows = {WeatherEffect[weather].name for weather in self.weather if WeatherEffect[weather]}
+        changed_rows = weathered_rows ^ self._weathered_rows
+        self._weathered_rows = weathered_rows
+        for row in changed_rows:
+            if row in self.player:
+                self._refresh_row(True, row)
+                self._refresh_row(False, row)
+    
+    def rescore(self):
+        """Recompute every cached score after rows, multipliers or weather were replaced wholesale"""
+        self._weathered_rows = {WeatherEffect[weather].name for weather in self.weather if WeatherEffect[weather]}
+        for is_player in (True, False):
+            for row in self.player:
+                self._refresh_row(is_player, row)
     
     def get_value_of_row(self, player, row_multiplier, row):
         # Returns the total value of the player's rows calculates the weather effect. If regular cards and weather cards are in the same row, the value of the card is 1 if not a hero
         
         value = 0
-        affected_rows = [ WeatherEffect[weather] for weather in self.weather]
-        affected_by_weather = False
+        affected_by_weather = row in self._weathered_rows
         multiplier = row_multiplier[row]
-        if row in affected_rows:
-            affected_by_weather = True
         for card in player[row]:
-            if issubclass(type(card), UnitCard):
-                if affected_by_weather and not card.is_hero():
+            prototype = card.prototype
+            if isinstance(prototype, UnitCard):
+                if affected_by_weather and not prototype.is_hero():
                     value += 1 * multiplier
                 else:
                     value += card.value * multiplier
-            elif issubclass(type(card), HeroCard):
-                value += card.value
 
         return value
     
     def get_player_value(self):
-        return sum([self.get_value_of_row(self.player, self.row_multiplier_player, row) for row in self.player])
+        return self._side_values[True]
     
     def get_enemy_value(self):
-        return sum([self.get_value_of_row(self.enemy, self.row_multiplier_enemy, row) for row in self.enemy])
+        return self._side_values[False]
     
     def get_player_row_Value(self, row):
-        return self.get_value_of_row(self.player, self.row_multiplier_player, row)
+        return self._row_values[True][row]
     
     def get_enemy_row_Value(self, row):
-        return self.get_value_of_row(self.enemy, self.row_multiplier_enemy, row)
+        return self._row_values[False][row]
     
     def get_value(self, is_player):
-        return self.get_player_value() if is_player else self.get_enemy_value()
+        return self._side_values[is_player]
     
     def get_row_value(self, is_player, row):
-        return self.get_player_row_Value(row) if is_player else self.get_enemy_row_Value(row)
+        return self._row_values[is_player][row]
 
     def add_card_to_row(self, card, is_player, row):
         # Check for spy using proper attribute access
-        if isinstance(card, UnitCard) and card.ability == Ability.SPY:
+        if isinstance(card.prototype, UnitCard) and card.ability == Ability.SPY:
             if is_player:
                 self.enemy[row].append(card)
             else:
                 self.player[row].append(card)
+            self._refresh_row(not is_player, row)
             return True
             
         # Normal card placement
@@ -98,6 +132,7 @@ class Board:
             self.player[row].append(card)
         else:
             self.enemy[row].append(card)
+        self._refresh_row(is_player, row)
         return False
     
     def add_value_multiplier_card(self, card, is_player, row):
@@ -105,15 +140,18 @@ class Board:
             self.row_multiplier_player[row] = card.value
         else:
             self.row_multiplier_enemy[row] = card.value
+        self._refresh_row(is_player, row)
 
     def play_weather(self, weather: WeatherCard):
         if weather.type == Weather.CLEAR:
             self.clear_weather()
         else:
-            self.weather.append(weather.type)
+            self.weather.add(weather.type)
+            self._refresh_weather()
     
     def clear_weather(self):
-        self.weather = []
+        self.weather = set()
+        self._refresh_weather()
 
     def destroy_strongest_card(self):
 
@@ -125,33 +163,36 @@ class Board:
         for player in players:
             for row in player:
                 for card in player[row]:
-                    if issubclass(type(card), UnitCard):
+                    if isinstance(card.prototype, UnitCard):
                         if card.value > largest:
                             largest = card.value
 
         # remove cards with largest value and add to graveyard
         for player, is_player in zip(players, is_players):
-            for row in player:
-                for card in player[row]:
-                    if issubclass(type(card), UnitCard):
+            for row, cards in player.items():
+                for index, card in enumerate(cards):
+                    if isinstance(card.prototype, UnitCard):
                         if card.value == largest:
-                            player[row].remove(card)
+                            # Remove this copy by position, other copies of the card stay
+                            del cards[index]
+                            self._refresh_row(is_player, row)
                             self.kill_card(card, is_player)
                             break
     
     def destroy_strongest_card_in_row(self, is_player, row):
         player = self.player if is_player else self.enemy
-        graveyard = self.player_graveyard if is_player else self.enemy_graveyard
+        cards = player[row]
         largest = 0
-        for card in player[row]:
-            if issubclass(type(card), UnitCard):
+        for card in cards:
+            if isinstance(card.prototype, UnitCard):
                 if card.value > largest:
                     largest = card.value
         
-        for card in player[row]:
-            if issubclass(type(card), UnitCard):
+        for index, card in enumerate(cards):
+            if isinstance(card.prototype, UnitCard):
                 if card.value == largest:
-                    player[row].remove(card)
+                    del cards[index]
+                    self._refresh_row(is_player, row)
                     self.kill_card(card, is_player)
                     break
 
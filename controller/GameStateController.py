@@ -0,0 +1,53 @@
+from abc import abstractmethod
+from model.Card import UnitCard, HeroCard, Ability, AbstractCard
+from model.GameState import PASS, decode_move, ROWS
+from controller.Player import PlayerController, PlayerState
+
+class GameStateController(PlayerController):
+    """AI that decides on a GameState and plays the encoded move on the live board.
+
+    Subclasses implement choose_move(). Medics revive the strongest
+    non-hero unit, the revive GameState assumes when it plays a medic.
+    """
+    def __init__(self, state: PlayerState):
+        super().__init__(state, False)
+
+    @abstractmethod
+    def choose_move(self) -> int:
+        """Encoded move to play in the current position, or PASS"""
+
+    def handle_medic_ability(self, view) -> AbstractCard:
+        """Revive the strongest non-hero unit"""
+        graveyard = self.get_graveyard()
+        revivable = [(i, card) for i, card in enumerate(graveyard)
+                     if isinstance(card, UnitCard) and not isinstance(card, HeroCard)]
+        if not revivable:
+            return None
+        choice = max(revivable, key=lambda item: item[1].value)[0]
+        card_id = self.state.get_graveyard()[choice]
+        self.state.deck.graveyard_remove(choice)
+        return self.create_instance(card_id)
+
+    def make_move(self, view):
+        """Play the move choose_move() picked"""
+        if not self.state.hand_size():
+            return None, None
+
+        move = self.choose_move()
+        if move == PASS:
+            return "PASS"
+
+        card_index, row_index = decode_move(move)
+        # The table shares the catalog's card handles, which the deck stores
+        card = self.play_card(self.state.deck.get_hand().index(card_index), view)
+        if not card:
+            return None, None
+
+        placed = card[0] if isinstance(card, list) else card
+        row = ROWS[row_index]
+
+        if hasattr(placed, 'ability') and placed.ability == Ability.SPY:
+            drawn_cards = self.handle_spy_ability()
+            view.log.append(f"{self.state.name} drew {len(drawn_cards)} cards from spy ability")
+
+        return card, row
@@ -0,0 +1,32 @@
+from typing import Optional
+from model.GameState import GameState, PASS
+from model.VectorEvaluator import VectorEvaluator
+from controller.Player import PlayerState
+from controller.GameStateController import GameStateController
+
+class GreedyController(GameStateController):
+    """AI that plays the legal move leaving it furthest ahead on the board.
+
+    All moves of the position are scored in one VectorEvaluator call. When
+    the opponent has passed and the lead is already ours, it passes to keep
+    its remaining cards, the same rule the MCTS rollouts use.
+    """
+    def __init__(self, state: PlayerState, evaluator: Optional[VectorEvaluator] = None):
+        super().__init__(state)
+        self.evaluator = evaluator or VectorEvaluator()
+
+    def _observe(self) -> GameState:
+        side = 0 if self.board.player_controller is self else 1
+        return GameState.from_board(self.board, self.board.player_controller.state,
+                                    self.board.enemy_controller.state, side)
+
+    def choose_move(self) -> int:
+        state = self._observe()
+        side = state.to_move
+        if state.passed & (1 << (1 - side)) and state.score(side) > state.score(1 - side):
+            return PASS
+        moves = [move for move in state.legal_moves() if move != PASS]
+        if not moves:
+            return PASS
+        leads = self.evaluator.score_moves(state, moves)
+        return moves[int(leads.argmax())]
@@ -0,0 +1,144 @@
+import math
+import random
+import time
+from array import array
+from typing import Optional, Tuple
+from model.Card import UnitCard
+from model.GameState import GameState, PASS, encode_move, get_card_table
+from controller.Player import PlayerState
+from controller.GameStateController import GameStateController
+from controller.TranspositionTable import TranspositionTable
+
+# Indexes into the per-move statistics kept in TranspositionTable entries
+_VISITS, _WINS, _AVAILABLE = 0, 1, 2
+
+def _ucb(stats, exploration: float) -> float:
+    if stats[_VISITS] == 0:
+        return math.inf
+    return stats[_WINS] / stats[_VISITS] + exploration * math.sqrt(math.log(max(1, stats[_AVAILABLE])) / stats[_VISITS])
+
+class MCTSController(GameStateController):
+    """AI that picks moves with information-set Monte Carlo Tree Search.
+
+    Every iteration samples the hidden information (own deck order, the
+    opponent's hand and deck) from the catalog, then descends the tree with
+    UCB1 and finishes with a heuristic rollout. The search stops when either
+    the wall-clock budget or the iteration budget is used up, so move latency
+    stays bounded, and the most visited move found so far is played.
+
+    Move statistics are keyed by the state hash in a TranspositionTable, so
+    positions reached through different move orders share one entry. Pass
+    the same table to several controllers to share it between them.
+    """
+    def __init__(self, state: PlayerState, time_budget: Optional[float] = 0.1,
+                 iteration_budget: Optional[int] = None, exploration: float = 0.7,
+                 rng: random.Random = None, transposition_table: TranspositionTable = None):
+        super().__init__(state)
+        self.time_budget = time_budget
+        self.iteration_budget = iteration_budget
+        self.exploration = exploration
+        self.rng = rng or random.Random()
+        self.transposition_table = transposition_table or TranspositionTable()
+        self.last_iterations = 0
+        self._table = get_card_table()
+        # Hidden opponent cards are sampled from the playable unit pool
+        self._hidden_pool = [self.card_loader.get_card_index(cid)
+                             for cid in self.card_loader.get_card_ids_by_class(UnitCard)
+                             if self.card_loader.get_card_value(cid) > 0]
+
+    def _my_side(self) -> int:
+        return 0 if self.board.player_controller is self else 1
+
+    def _observe(self) -> GameState:
+        """Build the search root from the live board, hashed from this side's view"""
+        state = GameState.from_board(self.board, self.board.player_controller.state,
+                                     self.board.enemy_controller.state, self._my_side())
+        state.set_perspective(state.to_move)
+        return state
+
+    def _determinize(self, root: GameState) -> GameState:
+        """Clone the root and resample everything this controller cannot see.
+
+        The resampled cards are not part of the hash, so the clone keeps the root key.
+        """
+        state = root.clone(undoable=False)
+        me = root.to_move
+        them = 1 - me
+        self.rng.shuffle(state.decks[me])
+        state.hands[them] = array('H', self.rng.choices(self._hidden_pool, k=len(state.hands[them])))
+        state.decks[them] = array('H', self.rng.choices(self._hidden_pool, k=len(state.decks[them])))
+        return state
+
+    def _rollout_move(self, state: GameState) -> int:
+        side = state.to_move
+        if state.passed & (1 << (1 - side)) and state.score(side) > state.score(1 - side):
+            return PASS  # Round is already won, keep the remaining cards
+        if self.rng.random() < 0.1:
+            return PASS
+        card = self.rng.choice(state.hands[side])
+        return encode_move(card, self._table.rows[card][0])
+
+    def search(self) -> Tuple[object, int]:
+        """Run MCTS from the current position, return (best move, iterations)"""
+        root_state = self._observe()
+        root_moves = root_state.legal_moves()
+        if len(root_moves) == 1:
+            return root_moves[0], 0
+
+        table = self.transposition_table
+        table.new_search()
+        deadline = time.perf_counter() + self.time_budget if self.time_budget else None
+        iterations = 0
+        while True:
+            if self.iteration_budget is not None and iterations >= self.iteration_budget:
+                break
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            if self.iteration_budget is None and deadline is None:
+                break
+            iterations += 1
+
+            state = self._determinize(root_state)
+            path = []  # (entry, move statistics, side that moved)
+            # Selection and expansion
+            while not state.is_terminal():
+                entry = table.store(state.hash)
+                moves = entry.moves
+                legal = state.legal_moves()
+                untried = [m for m in legal if m not in moves]
+                for move in legal:
+                    stats = moves.get(move)
+                    if stats is not None:
+                        stats[_AVAILABLE] += 1
+                side = state.to_move
+                if untried:
+                    move = self.rng.choice(untried)
+                    stats = moves[move] = [0, 0.0, 1]
+                    path.append((entry, stats, side))
+                    state.apply(move)
+                    break
+                move = max(legal, key=lambda m: _ucb(moves[m], self.exploration))
+                path.append((entry, moves[move], side))
+                state.apply(move)
+
+            # Rollout
+            state.hash = None
+            while not state.is_terminal():
+                state.apply(self._rollout_move(state))
+
+            # Backpropagation
+            for entry, stats, side in path:
+                entry.visits += 1
+                stats[_VISITS] += 1
+                stats[_WINS] += state.reward(side)
+
+        self.last_iterations = iterations
+        root = table.lookup(root_state.hash)
+        candidates = [(root.moves[m], m) for m in root_moves if root is not None and m in root.moves]
+        if not candidates:
+            return root_moves[-1], iterations
+        best = max(candidates, key=lambda item: (item[0][_VISITS], item[0][_WINS]))
+        return best[1], iterations
+
+    def choose_move(self) -> int:
+        return self.search()[0]
@@ -1,37 +1,60 @@
-import asyncio
 from model.Deck import Deck
-from typing import List
+from typing import Collection, List
+import random
 from abc import ABC, abstractmethod
 from singleton.CardLoader import CardLoader
-from model.Card import UnitCard, Weather, Special, WeatherCard, SpecialCard, AbstractCard, Ability, HeroCard
+from model.Card import UnitCard, Weather, Special, WeatherCard, SpecialCard, AbstractCard, Ability, HeroCard, CardInstance
 from controledmodel.Board import Board
 
 INITIAL_LIVES = 2  # Define constant here since it's player-related
 
 class PlayerState:
-    """Model class for player state"""
-    def __init__(self, name: str, faction: str, deck: List[str], king: str):
+    """Model class for player state, taking and returning card IDs.
+
+    The Deck underneath stores the catalog's integer card handles, see
+    CardLoader.get_card_index().
+    """
+    def __init__(self, name: str, faction: str, deck: List[str], king: str, rng: random.Random = None,
+                 shuffle: bool = True):
+        self.card_loader = CardLoader.get_instance()
         self.name: str = name
         self.faction: str = faction
-        self.deck: Deck = Deck(deck)
+        # Without shuffling the deck is dealt in the given order, first card on top
+        self.deck: Deck = Deck([self.card_loader.get_card_index(cid) for cid in deck], rng, shuffle)
         self.king: str = king
         self.lives: int = INITIAL_LIVES
         self.passed: bool = False
 
     def draw(self, n: int) -> List[str]:
-        return self.deck.take_cards(n)
+        return self.card_loader.get_card_ids_by_index(self.deck.take_cards(n))
     
     def play_card(self, card: str):
-        self.deck.play_card(card)
+        self.deck.play_card(self.card_loader.get_card_index(card))
+
+    def play_card_at(self, index: int) -> str:
+        """Play the card at a hand position and return its ID"""
+        return self.card_loader.get_card_id_by_index(self.deck.play_card_at(index))
+
+    def take_from_deck(self, cards: Collection[str]) -> List[str]:
+        """Take every copy of the given cards out of the deck, top first"""
+        index = self.card_loader.get_card_index
+        return self.card_loader.get_card_ids_by_index(self.deck.take_all(frozenset(index(cid) for cid in cards)))
 
     def discard_card(self, card: str):
-        self.deck.discard_card(card)
+        self.deck.discard_card(self.card_loader.get_card_index(card))
 
     def get_hand(self) -> List[str]:
-        return self.deck.get_hand()
+        return self.card_loader.get_card_ids_by_index(self.deck.get_hand())
+
+    def hand_size(self) -> int:
+        return len(self.deck.get_hand())
+
+    def get_draw_pile(self) -> List[str]:
+        """Cards left in the deck, top first"""
+        return self.card_loader.get_card_ids_by_index(reversed(self.deck.deck))
 
     def get_graveyard(self) -> List[str]:
-        return self.deck.get_graveyard()
+        return self.card_loader.get_card_ids_by_index(self.deck.get_graveyard())
 
     def lose_life(self) -> bool:
         self.lives -= 1
@@ -56,46 +79,48 @@ class PlayerController(ABC):
         self.state: PlayerState = state
         self.is_player: bool = is_player
         self.card_loader = CardLoader.get_instance()
+        self.board: Board = None  # Set by Board.set_controllers
 
     def get_hand(self) -> List[AbstractCard]:
         """Dynamically convert current hand from IDs to card objects"""
         return [self.card_loader.get_card_by_id(cid) for cid in self.state.get_hand()]
 
+    def create_instance(self, card_id: str) -> CardInstance:
+        """Create the copy of a card that this player puts into play"""
+        return CardInstance(self.card_loader.get_card_by_id(card_id), self.state)
+
     def handle_muster_ability(self, played_card: AbstractCard) -> List[AbstractCard]:
         """Handle muster ability by finding and playing all related cards"""
         if not hasattr(played_card, 'ability') or played_card.ability != Ability.MUSTER:
             return []
 
         mustered_cards = []
-        base_name = played_card.name.split(" - ")[0]  # Get prefix before " - " if it exists
+        muster_group = self.card_loader.get_muster_group(played_card.name)
+        if not muster_group:
+            return mustered_cards
         
         # Check hand for muster cards
         hand = self.state.get_hand()
         for card_id in hand[:]:  # Create copy to avoid modification during iteration
-            card = self.card_loader.get_card_by_id(card_id)
-            if card.name.startswith(base_name) and card.name != played_card.name:
-                self.state.play_card(card_id)
-                mustered_cards.append(card)
+            if card_id in muster_group:
+                card = self.card_loader.get_card_by_id(card_id)
+                if card.name != played_card.name:
+                    self.state.play_card(card_id)
+                    mustered_cards.append(self.create_instance(card_id))
                 
         # Check deck for muster cards
-        deck = self.state.deck.deck  # Access deck directly
-        for card_id in deck[:]:  # Create copy to avoid modification during iteration
-            card = self.card_loader.get_card_by_id(card_id)
-            if card.name.startswith(base_name):
-                deck.remove(card_id)
-                mustered_cards.append(card)
+        mustered_ids = self.state.take_from_deck(muster_group)
+        mustered_cards.extend(self.create_instance(cid) for cid in mustered_ids)
                 
         return mustered_cards
 
     def play_card(self, index: int, view=None) -> AbstractCard:
         """Final implementation of card playing - should not be overridden"""
-        hand = self.state.get_hand()
-        if index >= len(hand):
+        if index >= self.state.hand_size():
             return None
             
-        card_id = hand[index]
-        self.state.play_card(card_id)
-        played_card = self.card_loader.get_card_by_id(card_id)
+        card_id = self.state.play_card_at(index)
+        played_card = self.create_instance(card_id)
         
         # Handle muster ability if present
         if hasattr(played_card, 'ability') and played_card.ability == Ability.MUSTER:
@@ -139,15 +164,13 @@ class PlayerController(ABC):
         graveyard_cards = self.state.get_graveyard()
         card_id = graveyard_cards[choice]
         self.state.deck.graveyard_remove(choice)  # Remove from deck's graveyard
-        return self.card_loader.get_card_by_id(card_id)
+        return self.create_instance(card_id)
 
     def add_to_graveyard(self, card: AbstractCard):
         """Add a card ID to the graveyard"""
-        # Find card ID from the loaded cards
-        for card_id, loaded_card in self.card_loader.cards.items():
-            if loaded_card == card:
-                self.state.discard_card(card_id)
-                break
+        # Cards carry their catalog ID, so no catalog scan is needed
+        if card.id:
+            self.state.discard_card(card.id)
 
     def get_graveyard(self) -> List[AbstractCard]:
         """Get all cards in graveyard as card objects"""
@@ -197,7 +220,7 @@ class PlayerController(ABC):
             
         row = row or "CLOSE"
         # Check for spy ability using proper attribute access
-        if isinstance(card, UnitCard) and card.ability == Ability.SPY:
+        if isinstance(card.prototype, UnitCard) and card.ability == Ability.SPY:
             drawn_cards = self.handle_spy_ability()
             view.log.append(f"Drew {len(drawn_cards)} cards from spy ability")
                 
@@ -243,7 +266,7 @@ class AIController(PlayerController):
 
     def make_move(self, view):
         """AI player move implementation"""
-        if not self.state.get_hand():
+        if not self.state.hand_size():
             return None, None
             
         card = self.play_card(0, view)  # Pass view here
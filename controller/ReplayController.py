@@ -0,0 +1,59 @@
+from typing import Deque, Optional
+from model.Card import AbstractCard, Ability
+from model.MatchLog import LoggedMove
+from controller.Player import PlayerController, PlayerState
+
+class ReplayError(Exception):
+    """The match no longer follows its log"""
+
+class ReplayExhausted(ReplayError):
+    """The log ends before the match does, e.g. for a match that was cut short"""
+
+class ReplayController(PlayerController):
+    """Plays the moves one side made in a recorded match.
+
+    Both sides of a replay share one queue of LoggedMoves and take from
+    it in order, so a move recorded for the other side means the replay
+    has diverged from the original match.
+    """
+    def __init__(self, state: PlayerState, side: int, moves: Deque[LoggedMove]):
+        super().__init__(state, False)
+        self.side = side
+        self.moves = moves
+        self._revive: Optional[str] = None
+
+    def _next_move(self) -> LoggedMove:
+        if not self.moves:
+            raise ReplayExhausted(f"log ends before {self.state.name}'s move")
+        move = self.moves[0]
+        if move.side != self.side:
+            raise ReplayError(f"{self.state.name} is to move but the log has a move for side {move.side}")
+        return self.moves.popleft()
+
+    def make_move(self, view):
+        """Replay the next logged move"""
+        move = self._next_move()
+        if move.card is None:
+            return "PASS"
+
+        hand = self.state.get_hand()
+        if move.card not in hand:
+            raise ReplayError(f"{self.state.name} played {move.card}, which is not in their hand")
+        self._revive = move.revived
+        card = self.play_card(hand.index(move.card), view)
+
+        placed = card[0] if isinstance(card, list) else card
+        if hasattr(placed, 'ability') and placed.ability == Ability.SPY:
+            self.handle_spy_ability()
+        return card, move.row
+
+    def handle_medic_ability(self, view) -> AbstractCard:
+        """Revive the card the log says was revived"""
+        card_id, self._revive = self._revive, None
+        if card_id is None:
+            return None
+        graveyard = self.state.get_graveyard()
+        if card_id not in graveyard:
+            raise ReplayError(f"{self.state.name} revived {card_id}, which is not in their graveyard")
+        self.state.deck.graveyard_remove(graveyard.index(card_id))
+        return self.create_instance(card_id)
@@ -0,0 +1,69 @@
+from typing import Dict, List, Optional
+
+class TableEntry:
+    __slots__ = ("key", "visits", "generation", "moves")
+
+    def __init__(self, key: int, generation: int):
+        self.key = key
+        self.visits = 0
+        self.generation = generation
+        self.moves: Dict[int, List[float]] = {}  # move -> [visits, wins, available]
+
+class TranspositionTable:
+    """Bounded map from GameState hashes to search statistics.
+
+    Entries live in fixed-size buckets picked by the low bits of the key.
+    When a bucket is full the entry left over from the oldest search is
+    replaced first, then the least visited one, so the table can be shared
+    by several controllers and across moves without growing.
+    """
+    def __init__(self, capacity: int = 1 << 16, bucket_size: int = 2):
+        self.bucket_size = bucket_size
+        self.bucket_count = max(1, capacity // bucket_size)
+        self._buckets: List[List[TableEntry]] = [[] for _ in range(self.bucket_count)]
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.replacements = 0
+
+    def __len__(self):
+        return sum(len(bucket) for bucket in self._buckets)
+
+    def new_search(self):
+        """Mark existing entries as older than anything stored from now on"""
+        self.generation += 1
+
+    def lookup(self, key: int) -> Optional[TableEntry]:
+        """Return the entry for key, or None"""
+        for entry in self._buckets[key % self.bucket_count]:
+            if entry.key == key:
+                self.hits += 1
+                entry.generation = self.generation
+                return entry
+        self.misses += 1
+        return None
+
+    def store(self, key: int) -> TableEntry:
+        """Return the entry for key, creating it and evicting another if needed"""
+        bucket = self._buckets[key % self.bucket_count]
+        for entry in bucket:
+            if entry.key == key:
+                self.hits += 1
+                entry.generation = self.generation
+                return entry
+        self.misses += 1
+        entry = TableEntry(key, self.generation)
+        if len(bucket) < self.bucket_size:
+            bucket.append(entry)
+        else:
+            victim = min(range(len(bucket)),
+                         key=lambda i: (bucket[i].generation == self.generation, bucket[i].visits))
+            bucket[victim] = entry
+            self.replacements += 1
+        return entry
+
+    def clear(self):
+        for bucket in self._buckets:
+            bucket.clear()
+        self.generation = 0
+        self.hits = self.misses = self.replacements = 0
@@ -45,19 +45,42 @@ class Special(Enum):
     MADROEME = 3
 
 class AbstractCard:
+    """Catalog card, one read-only prototype per card ID shared by all its copies"""
+    __slots__ = ("id", "name", "description", "count", "_frozen")
+
     def __init__(self):
+        self.id = ""  # Catalog ID, set by CardLoader
         self.name = ""
         self.description = ""
+        self.count = 1  # Copies of the card a deck may hold
         
     def __str__(self):
         return self.name
 
+    def __setattr__(self, name, value):
+        if getattr(self, "_frozen", False):
+            raise AttributeError(f"{type(self).__name__} {self.id} is a shared prototype, change its CardInstance instead")
+        object.__setattr__(self, name, value)
+
+    def freeze(self):
+        """Make the card read-only once the loader has filled it in"""
+        object.__setattr__(self, "_frozen", True)
+
+    @property
+    def prototype(self) -> 'AbstractCard':
+        # Lets code take .prototype of a card without knowing whether it is a copy
+        return self
+
 class WeatherCard(AbstractCard):
+    __slots__ = ("type", "weather_type")
+
     def __init__(self):
         super().__init__()
         self.type : Weather = None
 
 class UnitCard(AbstractCard):
+    __slots__ = ("row", "faction", "value", "ability")
+
     def __init__(self):
         super().__init__()
         self.row : list[CombatRow] = None
@@ -69,6 +92,8 @@ class UnitCard(AbstractCard):
         return False
 
 class HeroCard(UnitCard):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__()
         
@@ -76,6 +101,42 @@ class HeroCard(UnitCard):
         return True
 
 class SpecialCard(AbstractCard):
+    __slots__ = ("type", "special_type")
+
     def __init__(self):
         super().__init__()
-        self.type : Special = None
\ No newline at end of file
+        self.type : Special = None
+
+class CardInstance:
+    """One copy of a card in play.
+
+    Holds only what differs between copies of the same prototype: the
+    PlayerState that owns it and, for units, its current strength as
+    value. Everything else is read from the prototype, so copies can be
+    told apart by identity while costing a few slots each.
+    """
+    __slots__ = ("prototype", "owner", "value")
+
+    def __init__(self, prototype: AbstractCard, owner=None):
+        self.prototype = prototype
+        self.owner = owner
+        if isinstance(prototype, UnitCard):
+            self.value = prototype.value
+
+    # Attributes read on every turn, as properties to skip the __getattr__ fallback
+    id = property(lambda self: self.prototype.id)
+    name = property(lambda self: self.prototype.name)
+    row = property(lambda self: self.prototype.row)
+    ability = property(lambda self: self.prototype.ability)
+
+    def __getattr__(self, name):
+        # Only reached for attributes the copy does not hold itself
+        if name == "prototype" or name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self.prototype, name)
+
+    def __str__(self):
+        return self.prototype.name
+
+    def __repr__(self):
+        return f"<CardInstance {self.prototype.id} {self.prototype.name}>"
@@ -1,38 +1,59 @@
-from typing import List
+from typing import Collection, List
 import random
 
 class Deck:
-    def __init__(self, deck: List[str]):
-        self.deck = deck.copy()  # Changed from self.cards to self.deck
-        random.shuffle(self.deck)  # Shuffle the deck
+    """Draw pile, hand and graveyard of one player as card handles.
+
+    Cards are the small integers CardLoader.get_card_index() hands out, so
+    piles compare ints instead of ID strings. The draw pile keeps its top
+    card at the end of the list, which makes a draw a pop rather than a
+    copy of the remaining pile.
+    """
+    def __init__(self, deck: List[int], rng: random.Random = None, shuffle: bool = True):
+        self.deck = list(deck)
+        if shuffle:
+            (rng or random).shuffle(self.deck)  # Shuffle the deck
+        self.deck.reverse()  # Top card last
         self.hand = []
         self.graveyard = []
-        
+
         # Draw initial hand
         self.take_cards(10)  # Draw 10 cards at start
 
-    def take_cards(self, n: int) -> List[str]:
-        if n > len(self.deck):
-            n = len(self.deck)
-        cards = self.deck[:n]
+    def take_cards(self, n: int) -> List[int]:
+        """Draw up to n cards from the top, returned top first"""
+        n = min(n, len(self.deck))
+        if n <= 0:
+            return []
+        cards = self.deck[-n:]
+        del self.deck[-n:]
+        cards.reverse()
         self.hand.extend(cards)
-        self.deck = self.deck[n:]
         return cards
-    
-    def play_card(self, card: str):
+
+    def take_all(self, cards: Collection[int]) -> List[int]:
+        """Remove every copy of the given cards from the draw pile in one pass, top first"""
+        taken = [card for card in reversed(self.deck) if card in cards]
+        if taken:
+            self.deck = [card for card in self.deck if card not in cards]
+        return taken
+
+    def play_card(self, card: int):
         self.hand.remove(card)
 
-    def discard_card(self, card: str):
+    def play_card_at(self, position: int) -> int:
+        """Remove and return the card at a hand position without searching for it"""
+        return self.hand.pop(position)
+
+    def discard_card(self, card: int):
         self.graveyard.append(card)
-    
-    def get_hand(self) -> List[str]:
+
+    def get_hand(self) -> List[int]:
         return self.hand
-    
-    def get_graveyard(self) -> List[str]:
+
+    def get_graveyard(self) -> List[int]:
         return self.graveyard
-    
-    def graveyard_remove(self, index: int):
+
+    def graveyard_remove(self, index: int) -> int:
         """Remove and return card from graveyard at given index"""
         return self.graveyard.pop(index)
-
-
@@ -0,0 +1,65 @@
+import json
+import os
+import re
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Optional
+
+DEFAULT_DECK_FILE = "decks.json"
+
+@dataclass
+class DeckEntry:
+    """A named deck list with how well it did when it was found"""
+    name: str
+    cards: List[str]
+    fitness: Optional[float] = None  # Score share in the games that ranked it
+    validation: Optional[float] = None  # Score share in fresh games, see DeckOptimizer
+    fingerprint: Optional[str] = None
+    settings: Optional[dict] = None  # How the deck was searched and scored
+
+@dataclass
+class DeckLibrary:
+    """Named deck lists kept in a JSON file, as written by simulation/DeckOptimizer.py.
+
+    Entries stay in the order they were ranked in. Saving under a name that
+    already exists replaces that deck, other decks in the file are kept.
+    Every entry carries the settings of the run that found it, so decks of
+    different searches can share a file.
+    """
+    decks: Dict[str, DeckEntry] = field(default_factory=dict)
+
+    def add(self, entry: DeckEntry):
+        self.decks[entry.name] = entry
+
+    def remove_ranked(self, prefix: str):
+        """Drop the decks named prefix-1, prefix-2, ... that an earlier ranking saved"""
+        ranked = re.compile(re.escape(prefix) + r"-\d+")
+        self.decks = {name: entry for name, entry in self.decks.items() if not ranked.fullmatch(name)}
+
+    def get(self, name: str) -> List[str]:
+        """Card IDs of the named deck"""
+        entry = self.decks.get(name)
+        if entry is None:
+            known = ", ".join(self.decks) or "none"
+            raise KeyError(f"no deck named {name!r}, known decks: {known}")
+        return list(entry.cards)
+
+    def names(self) -> List[str]:
+        return list(self.decks)
+
+    def save(self, path: str = DEFAULT_DECK_FILE):
+        data = {"decks": [asdict(entry) for entry in self.decks.values()]}
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
+            f.write("\n")
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_DECK_FILE, missing_ok: bool = False) -> 'DeckLibrary':
+        if missing_ok and not os.path.exists(path):
+            return cls()
+        with open(path) as f:
+            data = json.load(f)
+        try:
+            entries = [DeckEntry(**entry) for entry in data["decks"]]
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"{path} is not a deck file: {e}") from e
+        return cls({entry.name: entry for entry in entries})
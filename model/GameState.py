@@ -0,0 +1,472 @@
+import random
+from array import array
+from typing import List, Optional
+from model.Card import UnitCard, HeroCard, Ability, Weather, CombatRow, WeatherEffect, CardInstance
+from singleton.CardLoader import CardLoader
+
+ROWS = ("CLOSE", "RANGED", "SIEGE")
+PASS = -1
+
+# Card flags stored in CardTable.flags
+FLAG_UNIT = 1
+FLAG_HERO = 2
+FLAG_SPY = 4
+FLAG_MUSTER = 8
+FLAG_MEDIC = 16
+
+# Weather bitmask (bit = Weather.value) -> bitmask of affected rows (bit = CombatRow.value)
+WEATHER_ROW_MASKS = [0] * (1 << len(Weather))
+for _mask in range(len(WEATHER_ROW_MASKS)):
+    for _weather in Weather:
+        if _mask & (1 << _weather.value) and WeatherEffect[_weather] is not None:
+            WEATHER_ROW_MASKS[_mask] |= 1 << WeatherEffect[_weather].value
+
+# Zobrist zones: hands are zones 0-1, rows 2-7 (side * 3 + row), graveyards 8-9
+ZONE_HAND = 0
+ZONE_ROWS = 2
+ZONE_GRAVEYARD = 8
+ZONE_COUNT = 10
+HASH_MASK = (1 << 64) - 1
+
+# Fixed seed so hashes are comparable across processes and runs
+_zobrist_rng = random.Random(0x6E57)
+_FLAG_KEYS = {
+    "to_move": [0, _zobrist_rng.getrandbits(64)],
+    "passed": [_zobrist_rng.getrandbits(64) for _ in range(4)],
+    "weather": [_zobrist_rng.getrandbits(64) for _ in range(1 << len(Weather))],
+}
+_LIVES_KEYS = [[_zobrist_rng.getrandbits(64) for _ in range(8)] for _ in range(2)]
+_MULTIPLIER_KEYS = [[[_zobrist_rng.getrandbits(64) for _ in range(8)] for _ in ROWS] for _ in range(2)]
+_PERSPECTIVE_KEYS = [0, _zobrist_rng.getrandbits(64), _zobrist_rng.getrandbits(64)]
+
+# Undo trail operations
+_UNDO_INSERT = 0   # (op, seq, pos, value): value was popped from seq at pos
+_UNDO_POP = 1      # (op, seq): a value was appended to seq
+_UNDO_SETATTR = 2  # (op, name, old)
+_UNDO_SETITEM = 3  # (op, container, key, old)
+
+def encode_move(card: int, row: int) -> int:
+    """Pack a card handle and a row index into a move integer"""
+    return (card << 2) | row
+
+def decode_move(move: int):
+    """Unpack a move integer into (card handle, row index)"""
+    return move >> 2, move & 3
+
+class CardTable:
+    """Rule data of every catalog card, indexed by the loader's card handles"""
+    def __init__(self, card_loader: CardLoader):
+        self.card_loader = card_loader
+        card_ids = card_loader.get_all_card_ids()
+        self.generation = card_loader.generation
+        self.values = array('h')
+        self.flags = bytearray(len(card_ids))
+        self.rows: List[tuple] = []
+        self.names: List[str] = []
+        self.muster_groups: List[Optional[frozenset]] = []
+
+        # Zobrist keys per zone and card; a hidden hand hashes every card alike so only its size counts
+        card_count = len(card_ids)
+        self.zobrist_cards = [[_zobrist_rng.getrandbits(64) for _ in range(card_count)] for _ in range(ZONE_COUNT)]
+        self.zobrist_zones = []
+        for hidden_side in (None, 0, 1):
+            zones = list(self.zobrist_cards)
+            if hidden_side is not None:
+                zones[ZONE_HAND + hidden_side] = [_zobrist_rng.getrandbits(64)] * card_count
+            self.zobrist_zones.append(zones)
+
+        for card_id in card_ids:
+            index = card_loader.get_card_index(card_id)
+            card = card_loader.get_card_by_id(card_id)
+            flags = 0
+            if isinstance(card, UnitCard):
+                flags |= FLAG_UNIT
+                if isinstance(card, HeroCard):
+                    flags |= FLAG_HERO
+                if card.ability == Ability.SPY:
+                    flags |= FLAG_SPY
+                elif card.ability == Ability.MUSTER:
+                    flags |= FLAG_MUSTER
+                elif card.ability == Ability.MEDIC:
+                    flags |= FLAG_MEDIC
+            self.flags[index] = flags
+            self.values.append(card.value if isinstance(card, UnitCard) else 0)
+            self.rows.append(tuple(r.value for r in card.row) if getattr(card, 'row', None) else (CombatRow.CLOSE.value,))
+            self.names.append(card.name)
+
+        for card_id in card_ids:
+            card = card_loader.get_card_by_id(card_id)
+            group = card_loader.get_muster_group(card.name) if self.flags[card_loader.get_card_index(card_id)] & FLAG_MUSTER else None
+            self.muster_groups.append(frozenset(card_loader.get_card_index(cid) for cid in group) if group else None)
+
+    def card_id(self, index: int) -> str:
+        return self.card_loader.get_card_id_by_index(index)
+
+    def card_index(self, card_id: str) -> int:
+        return self.card_loader.get_card_index(card_id)
+
+_card_table: Optional[CardTable] = None
+
+def get_card_table() -> CardTable:
+    """Return the process-wide card table, rebuilt whenever the catalog selection changes"""
+    global _card_table
+    card_loader = CardLoader.get_instance()
+    card_loader.get_all_card_ids()
+    if _card_table is None or _card_table.generation != card_loader.generation:
+        _card_table = CardTable(card_loader)
+    return _card_table
+
+class GameState:
+    """Compact, cheaply clonable snapshot of a match for search.
+
+    Cards are small-integer handles stored in array('H'). Sides are 0 for the
+    board's player side and 1 for the enemy side, decks keep their top card
+    last so draws pop from the end, weather and passed flags are bitmasks.
+    Side totals are cached in scores and kept current by apply(); call
+    rescore() after editing rows by hand. apply() returns a mark that undo()
+    rewinds to, so search can walk a line of play in place instead of
+    cloning at every node.
+
+    hash is a Zobrist-style key of hands, rows, graveyards, weather, passed
+    flags, lives, multipliers and the side to move, updated as moves are
+    applied. Card zones are hashed additively so duplicate copies are a
+    multiset, and the flag keys are added the same way so every update
+    commutes. Deck contents are left out, as are the cards of a hidden
+    hand once set_perspective() names the searching side, so every
+    determinization of one information set shares a key. Setting hash to
+    None stops the upkeep for playouts that do not need it.
+    """
+    __slots__ = ("table", "hands", "decks", "graveyards", "rows", "multipliers",
+                 "weather", "passed", "lives", "scores", "to_move", "hash",
+                 "perspective", "_zone_keys", "_trail")
+
+    def __init__(self, table: CardTable = None):
+        self.table = table or get_card_table()
+        self.hands = [array('H'), array('H')]
+        self.decks = [array('H'), array('H')]
+        self.graveyards = [array('H'), array('H')]
+        self.rows = [[array('H') for _ in ROWS], [array('H') for _ in ROWS]]
+        self.multipliers = [array('B', [1] * len(ROWS)), array('B', [1] * len(ROWS))]
+        self.weather = 0
+        self.passed = 0
+        self.lives = [0, 0]
+        self.scores = [0, 0]
+        self.to_move = 0
+        self.perspective = None
+        self._zone_keys = self.table.zobrist_zones[0]
+        self.hash = 0
+        self._trail = []
+
+    def clone(self, undoable: bool = True) -> 'GameState':
+        """Copy the state; pass undoable=False for throwaway playouts that never undo"""
+        other = GameState.__new__(GameState)
+        other.table = self.table
+        other.hands = [self.hands[0][:], self.hands[1][:]]
+        other.decks = [self.decks[0][:], self.decks[1][:]]
+        other.graveyards = [self.graveyards[0][:], self.graveyards[1][:]]
+        other.rows = [[row[:] for row in self.rows[0]], [row[:] for row in self.rows[1]]]
+        other.multipliers = [self.multipliers[0][:], self.multipliers[1][:]]
+        other.weather = self.weather
+        other.passed = self.passed
+        other.lives = self.lives[:]
+        other.scores = self.scores[:]
+        other.to_move = self.to_move
+        other.hash = self.hash
+        other.perspective = self.perspective
+        other._zone_keys = self._zone_keys
+        other._trail = [] if undoable else None
+        return other
+
+    # Conversion from and to the live objects
+
+    @classmethod
+    def from_board(cls, board, player_state, enemy_state, to_move: int = 0) -> 'GameState':
+        """Snapshot a live Board and both PlayerStates"""
+        state = cls()
+        index = state.table.card_index
+        for side, player_state_ in enumerate((player_state, enemy_state)):
+            # Decks hold the same card handles as the table, with the top card last
+            deck = player_state_.deck
+            state.hands[side] = array('H', deck.hand)
+            state.decks[side] = array('H', deck.deck)
+            state.graveyards[side] = array('H', deck.graveyard)
+            state.lives[side] = player_state_.lives
+        for side, (rows, multipliers) in enumerate(((board.player, board.row_multiplier_player),
+                                                    (board.enemy, board.row_multiplier_enemy))):
+            for r, row in enumerate(ROWS):
+                state.rows[side][r] = array('H', [index(card.id) for card in rows[row]])
+                state.multipliers[side][r] = multipliers[row]
+        for weather in board.weather:
+            state.weather |= 1 << weather.value
+        state.passed = (1 if board.player_passed else 0) | (2 if board.enemy_passed else 0)
+        state.to_move = to_move
+        state.rescore()
+        state.rehash()
+        return state
+
+    def write_to(self, board, player_state, enemy_state):
+        """Overwrite a live Board and both PlayerStates with this snapshot"""
+        card_loader = self.table.card_loader
+        card_id = self.table.card_id
+        flags = self.table.flags
+        states = (player_state, enemy_state)
+        for side, player_state_ in enumerate((player_state, enemy_state)):
+            player_state_.deck.hand = list(self.hands[side])
+            player_state_.deck.deck = list(self.decks[side])
+            player_state_.deck.graveyard = list(self.graveyards[side])
+            player_state_.lives = self.lives[side]
+            player_state_.passed = bool(self.passed & (1 << side))
+        for side, (rows, multipliers) in enumerate(((board.player, board.row_multiplier_player),
+                                                    (board.enemy, board.row_multiplier_enemy))):
+            for r, row in enumerate(ROWS):
+                # Spies lie on the side of the player they were played against
+                rows[row] = [CardInstance(card_loader.get_card_by_id(card_id(c)),
+                                          states[1 - side] if flags[c] & FLAG_SPY else states[side])
+                             for c in self.rows[side][r]]
+                multipliers[row] = self.multipliers[side][r]
+        board.weather = {weather for weather in Weather if self.weather & (1 << weather.value)}
+        board.player_passed = bool(self.passed & 1)
+        board.enemy_passed = bool(self.passed & 2)
+        board.rescore()
+
+    # Scoring and game flow
+
+    def row_score(self, side: int, row: int) -> int:
+        values, flags = self.table.values, self.table.flags
+        weathered = WEATHER_ROW_MASKS[self.weather] >> row & 1
+        multiplier = self.multipliers[side][row]
+        score = 0
+        for card in self.rows[side][row]:
+            card_flags = flags[card]
+            if card_flags & FLAG_UNIT:
+                if weathered and not card_flags & FLAG_HERO:
+                    score += multiplier
+                else:
+                    score += values[card] * multiplier
+        return score
+
+    def score(self, side: int) -> int:
+        return self.scores[side]
+
+    def rescore(self):
+        """Recompute the cached side totals from the rows"""
+        self.scores = [sum(self.row_score(side, row) for row in range(len(ROWS))) for side in (0, 1)]
+
+    def set_perspective(self, side: Optional[int]):
+        """Hash as seen by side, hiding the opponent's hand; None hashes everything"""
+        self.perspective = side
+        self._zone_keys = self.table.zobrist_zones[0 if side is None else 2 - side]
+        self.rehash()
+
+    def rehash(self):
+        """Recompute the Zobrist key from scratch"""
+        zones = self._zone_keys
+        h = 0
+        for side in (0, 1):
+            keys = zones[ZONE_HAND + side]
+            for card in self.hands[side]:
+                h += keys[card]
+            for row in range(len(ROWS)):
+                keys = zones[ZONE_ROWS + side * 3 + row]
+                for card in self.rows[side][row]:
+                    h += keys[card]
+            keys = zones[ZONE_GRAVEYARD + side]
+            for card in self.graveyards[side]:
+                h += keys[card]
+        for name, keys in _FLAG_KEYS.items():
+            h += keys[getattr(self, name)]
+        for side in (0, 1):
+            h += _LIVES_KEYS[side][self.lives[side] & 7]
+            for row in range(len(ROWS)):
+                h += _MULTIPLIER_KEYS[side][row][self.multipliers[side][row] & 7]
+        h += _PERSPECTIVE_KEYS[0 if self.perspective is None else self.perspective + 1]
+        self.hash = h & HASH_MASK
+
+    def _place(self, side: int, row: int, card: int):
+        """Put a card on a row and add its strength to the side total"""
+        self._append(self.rows[side][row], card, ZONE_ROWS + side * 3 + row)
+        card_flags = self.table.flags[card]
+        if card_flags & FLAG_UNIT:
+            if WEATHER_ROW_MASKS[self.weather] >> row & 1 and not card_flags & FLAG_HERO:
+                value = 1
+            else:
+                value = self.table.values[card]
+            self._setitem(self.scores, side, self.scores[side] + value * self.multipliers[side][row])
+
+    def is_terminal(self) -> bool:
+        return self.lives[0] <= 0 or self.lives[1] <= 0
+
+    def reward(self, side: int) -> float:
+        """1 for a win, 0.5 for a draw and 0 for a loss of side"""
+        mine, theirs = self.lives[side] > 0, self.lives[1 - side] > 0
+        if mine and not theirs:
+            return 1.0
+        if theirs and not mine:
+            return 0.0
+        return 0.5
+
+    def legal_moves(self) -> List[int]:
+        """PASS plus one move per distinct card in hand and eligible row"""
+        moves = [PASS]
+        rows = self.table.rows
+        for card in dict.fromkeys(self.hands[self.to_move]):
+            for row in rows[card]:
+                moves.append(encode_move(card, row))
+        return moves
+
+    # Moves, with an undo trail
+
+    # The hash is restored wholesale by undo(), so helpers only update it forwards
+
+    def _pop(self, seq, pos: int, zone: int = -1) -> int:
+        value = seq.pop(pos)
+        if self._trail is not None:
+            self._trail.append((_UNDO_INSERT, seq, pos, value))
+        if zone >= 0 and self.hash is not None:
+            self.hash = (self.hash - self._zone_keys[zone][value]) & HASH_MASK
+        return value
+
+    def _append(self, seq, value: int, zone: int = -1):
+        seq.append(value)
+        if self._trail is not None:
+            self._trail.append((_UNDO_POP, seq))
+        if zone >= 0 and self.hash is not None:
+            self.hash = (self.hash + self._zone_keys[zone][value]) & HASH_MASK
+
+    def _set(self, name: str, value):
+        if self._trail is not None:
+            self._trail.append((_UNDO_SETATTR, name, getattr(self, name)))
+        if self.hash is not None:
+            keys = _FLAG_KEYS[name]
+            self.hash = (self.hash + keys[value] - keys[getattr(self, name)]) & HASH_MASK
+        setattr(self, name, value)
+
+    def _set_lives(self, side: int, value: int):
+        if self.hash is not None:
+            keys = _LIVES_KEYS[side]
+            self.hash = (self.hash + keys[value & 7] - keys[self.lives[side] & 7]) & HASH_MASK
+        self._setitem(self.lives, side, value)
+
+    def _setitem(self, container, key, value):
+        if self._trail is not None:
+            self._trail.append((_UNDO_SETITEM, container, key, container[key]))
+        container[key] = value
+
+    def apply(self, move: int) -> int:
+        """Play move for the side to move and return an undo mark"""
+        mark = len(self._trail) if self._trail is not None else 0
+        if self._trail is not None:
+            self._trail.append((_UNDO_SETATTR, "hash", self.hash))
+        side = self.to_move
+        if move == PASS:
+            self._set("passed", self.passed | (1 << side))
+        else:
+            card, row = decode_move(move)
+            table = self.table
+            hand = self.hands[side]
+            self._pop(hand, hand.index(card), ZONE_HAND + side)
+            flags = table.flags[card]
+            if flags & FLAG_SPY:
+                self._place(1 - side, row, card)
+                deck = self.decks[side]
+                for _ in range(min(2, len(deck))):
+                    self._append(hand, self._pop(deck, len(deck) - 1), ZONE_HAND + side)
+            else:
+                self._place(side, row, card)
+                if flags & FLAG_MUSTER:
+                    self._muster(side, row, card)
+                elif flags & FLAG_MEDIC:
+                    self._revive(side, row)
+        self._end_turn()
+        return mark
+
+    def _muster(self, side: int, row: int, card: int):
+        group = self.table.muster_groups[card]
+        names = self.table.names
+        hand = self.hands[side]
+        positions = [pos for pos, c in enumerate(hand) if c in group and names[c] != names[card]]
+        mustered = [hand[pos] for pos in positions]
+        for pos in reversed(positions):
+            self._pop(hand, pos, ZONE_HAND + side)
+        for c in mustered:
+            self._place(side, row, c)
+        deck = self.decks[side]
+        # Walk the deck from the top, like the live deck is walked front to back
+        from_deck = [c for c in reversed(deck) if c in group]
+        if from_deck:
+            self._setitem(self.decks, side, array('H', [c for c in deck if c not in group]))
+            for c in from_deck:
+                self._place(side, row, c)
+
+    def _revive(self, side: int, row: int):
+        graveyard = self.graveyards[side]
+        flags, values = self.table.flags, self.table.values
+        best = None
+        for pos, c in enumerate(graveyard):
+            if flags[c] & FLAG_UNIT and not flags[c] & FLAG_HERO:
+                if best is None or values[c] > values[graveyard[best]]:
+                    best = pos
+        if best is not None:
+            self._place(side, row, self._pop(graveyard, best, ZONE_GRAVEYARD + side))
+
+    def _end_turn(self):
+        self._set("to_move", 1 - self.to_move)
+        while not self.is_terminal():
+            if self.passed == 3 or (not self.hands[0] and not self.hands[1]):
+                self._end_round()
+                continue
+            side = self.to_move
+            if self.passed & (1 << side) or not self.hands[side]:
+                # GwentGame passes automatically for a side that passed or has no cards
+                self._set("passed", self.passed | (1 << side))
+                self._set("to_move", 1 - side)
+                continue
+            break
+
+    def _end_round(self):
+        player_score, enemy_score = self.scores
+        if player_score >= enemy_score:
+            self._set_lives(1, self.lives[1] - 1)
+        if enemy_score >= player_score:
+            self._set_lives(0, self.lives[0] - 1)
+        zones = self._zone_keys
+        for side in (0, 1):
+            rows = self.rows[side]
+            cleared = array('H', self.graveyards[side])
+            for r in range(len(ROWS)):
+                if rows[r]:
+                    if self.hash is not None:
+                        row_keys = zones[ZONE_ROWS + side * 3 + r]
+                        graveyard_keys = zones[ZONE_GRAVEYARD + side]
+                        h = self.hash
+                        for card in rows[r]:
+                            h += graveyard_keys[card] - row_keys[card]
+                        self.hash = h & HASH_MASK
+                    cleared.extend(rows[r])
+                    self._setitem(rows, r, array('H'))
+                if self.multipliers[side][r] != 1:
+                    if self.hash is not None:
+                        keys = _MULTIPLIER_KEYS[side][r]
+                        self.hash = (self.hash + keys[1] - keys[self.multipliers[side][r] & 7]) & HASH_MASK
+                    self._setitem(self.multipliers[side], r, 1)
+            self._setitem(self.graveyards, side, cleared)
+        self._setitem(self.scores, 0, 0)
+        self._setitem(self.scores, 1, 0)
+        if self.weather:
+            self._set("weather", 0)
+        self._set("passed", 0)
+
+    def undo(self, mark: int):
+        """Rewind every change made since apply() returned mark"""
+        trail = self._trail
+        while len(trail) > mark:
+            op = trail.pop()
+            kind = op[0]
+            if kind == _UNDO_INSERT:
+                op[1].insert(op[2], op[3])
+            elif kind == _UNDO_POP:
+                op[1].pop()
+            elif kind == _UNDO_SETATTR:
+                setattr(self, op[1], op[2])
+            else:
+                op[1][op[2]] = op[3]
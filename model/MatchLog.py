@@ -0,0 +1,148 @@
+import struct
+from dataclasses import dataclass, field
+from typing import List, NamedTuple, Optional, Tuple
+from model.GameState import ROWS
+
+MAGIC = b"GWRP"
+FORMAT_VERSION = 1
+
+# magic, version, flags, seed
+_HEADER = struct.Struct("<4sBBq")
+_COUNT = struct.Struct("<H")
+_MOVE_COUNT = struct.Struct("<I")
+_CARD = struct.Struct("<H")
+_RESULT = struct.Struct("<BB")  # winner, number of rounds
+_ROUND = struct.Struct("<HH")
+
+_HAS_SEED = 1
+_FINISHED = 2
+
+# Move header byte: bit 0 side, bit 1 pass, bit 2 revive follows, bits 3-4 row (3 = none)
+_MOVE_PASS = 2
+_MOVE_REVIVE = 4
+_NO_ROW = 3
+_DRAW = 2
+
+class LoggedMove(NamedTuple):
+    """One decision of a controller: a pass, or a card played to a row"""
+    side: int  # 0 for player1, 1 for player2
+    card: Optional[str]  # ID of the card played from the hand, None for a pass
+    row: Optional[str] = None
+    revived: Optional[str] = None  # ID of the card a medic brought back
+
+@dataclass
+class MatchLog:
+    """Everything needed to re-execute a match: its seed, dealt decks and move stream.
+
+    Decks are stored in dealt order, top card first, so a replay does not
+    depend on how they were built or shuffled. The result is kept to check
+    replays against.
+    """
+    seed: Optional[int]
+    decks: Tuple[List[str], List[str]]
+    moves: List[LoggedMove] = field(default_factory=list)
+    finished: bool = False
+    winner: Optional[int] = None  # Winning side, None on a draw
+    round_scores: List[Tuple[int, int]] = field(default_factory=list)
+
+    def to_bytes(self) -> bytes:
+        if self.seed is not None and not -(1 << 63) <= self.seed < (1 << 63):
+            raise ValueError(f"seed {self.seed} does not fit into 64 bits")
+
+        # Card IDs are written once and referenced by position
+        card_ids = {}
+        for deck in self.decks:
+            for card_id in deck:
+                card_ids.setdefault(card_id, len(card_ids))
+        for move in self.moves:
+            for card_id in (move.card, move.revived):
+                if card_id is not None:
+                    card_ids.setdefault(card_id, len(card_ids))
+
+        flags = (_HAS_SEED if self.seed is not None else 0) | (_FINISHED if self.finished else 0)
+        parts = [_HEADER.pack(MAGIC, FORMAT_VERSION, flags, self.seed or 0), _COUNT.pack(len(card_ids))]
+        for card_id in card_ids:
+            encoded = card_id.encode()
+            parts.append(bytes((len(encoded),)) + encoded)
+        for deck in self.decks:
+            parts.append(_COUNT.pack(len(deck)))
+            parts.append(struct.pack(f"<{len(deck)}H", *(card_ids[card_id] for card_id in deck)))
+
+        parts.append(_MOVE_COUNT.pack(len(self.moves)))
+        for move in self.moves:
+            row = ROWS.index(move.row) if move.row is not None else _NO_ROW
+            if move.card is None:
+                parts.append(bytes((move.side | _MOVE_PASS | row << 3,)))
+                continue
+            header = move.side | row << 3 | (_MOVE_REVIVE if move.revived is not None else 0)
+            parts.append(bytes((header,)) + _CARD.pack(card_ids[move.card]))
+            if move.revived is not None:
+                parts.append(_CARD.pack(card_ids[move.revived]))
+
+        winner = _DRAW if self.winner is None else self.winner
+        parts.append(_RESULT.pack(winner, len(self.round_scores)))
+        parts.extend(_ROUND.pack(*scores) for scores in self.round_scores)
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'MatchLog':
+        try:
+            magic, version, flags, seed = _HEADER.unpack_from(data)
+            if magic != MAGIC:
+                raise ValueError("not a match log")
+            if version != FORMAT_VERSION:
+                raise ValueError(f"unsupported match log version {version}")
+            offset = _HEADER.size
+
+            (count,) = _COUNT.unpack_from(data, offset)
+            offset += _COUNT.size
+            card_ids = []
+            for _ in range(count):
+                length = data[offset]
+                card_ids.append(data[offset + 1:offset + 1 + length].decode())
+                offset += 1 + length
+
+            decks = []
+            for _ in range(2):
+                (count,) = _COUNT.unpack_from(data, offset)
+                offset += _COUNT.size
+                decks.append([card_ids[i] for i in struct.unpack_from(f"<{count}H", data, offset)])
+                offset += 2 * count
+
+            (count,) = _MOVE_COUNT.unpack_from(data, offset)
+            offset += _MOVE_COUNT.size
+            moves = []
+            for _ in range(count):
+                header = data[offset]
+                offset += 1
+                side, row = header & 1, header >> 3 & 3
+                row = ROWS[row] if row != _NO_ROW else None
+                if header & _MOVE_PASS:
+                    moves.append(LoggedMove(side, None, row))
+                    continue
+                (card,) = _CARD.unpack_from(data, offset)
+                offset += _CARD.size
+                revived = None
+                if header & _MOVE_REVIVE:
+                    (revived,) = _CARD.unpack_from(data, offset)
+                    offset += _CARD.size
+                    revived = card_ids[revived]
+                moves.append(LoggedMove(side, card_ids[card], row, revived))
+
+            winner, rounds = _RESULT.unpack_from(data, offset)
+            offset += _RESULT.size
+            round_scores = [_ROUND.unpack_from(data, offset + i * _ROUND.size) for i in range(rounds)]
+        except (struct.error, IndexError, UnicodeDecodeError) as e:
+            raise ValueError(f"corrupt match log: {e}") from e
+
+        return cls(seed if flags & _HAS_SEED else None, (decks[0], decks[1]), moves,
+                   bool(flags & _FINISHED), None if winner == _DRAW else winner, round_scores)
+
+    def save(self, path: str):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str) -> 'MatchLog':
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
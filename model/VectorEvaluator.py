@@ -0,0 +1,178 @@
+from typing import List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from model.Card import Ability
+from model.GameState import (GameState, CardTable, get_card_table, decode_move, ROWS, PASS,
+                             WEATHER_ROW_MASKS, FLAG_UNIT, FLAG_HERO, FLAG_SPY, FLAG_MUSTER, FLAG_MEDIC)
+
+_SLOTS = 2 * len(ROWS)  # Rows of both sides, slot = side * 3 + row
+
+class BoardBatch(NamedTuple):
+    """Many boards as padded card arrays, one line per board.
+
+    cards holds card handles with -1 for padding, sides and rows say where
+    each card lies. Every board has its own weather bitmask and row
+    multipliers, so a batch may mix positions.
+    """
+    cards: np.ndarray  # (boards, cards) int32
+    sides: np.ndarray  # (boards, cards) int8, 0 for the player side
+    rows: np.ndarray  # (boards, cards) int8, index into ROWS
+    weather: np.ndarray  # (boards,) Weather bitmask like GameState.weather
+    multipliers: np.ndarray  # (boards, 2, 3) row multipliers
+
+class VectorEvaluator:
+    """Scores whole batches of boards with NumPy instead of one Board at a time.
+
+    Card strength, hero and unit flags and tight bond groups are arrays
+    indexed by card handle, taken from the CardTable. Scoring follows
+    Board.get_value_of_row: weather drops non-hero units to 1 and the row
+    multiplier (the horn) applies to every unit. With tight_bond, units
+    sharing a bond group on one row are multiplied by the number of them
+    before the horn, as in the tabletop rules; the live Board ignores
+    bonds, so it is off by default to keep rankings equal to Board scores.
+    """
+    def __init__(self, table: Optional[CardTable] = None, tight_bond: bool = False):
+        self.table = table or get_card_table()
+        self.tight_bond = tight_bond
+        flags = np.frombuffer(bytes(self.table.flags), dtype=np.uint8)
+        self.values = np.asarray(self.table.values, dtype=np.int32)
+        self.units = (flags & FLAG_UNIT).astype(bool)
+        self.heroes = (flags & FLAG_HERO).astype(bool)
+        self.weather_rows = np.asarray(WEATHER_ROW_MASKS, dtype=np.int32)
+
+        # Copies of a bond card share its name, so the name picks the group
+        loader = self.table.card_loader
+        groups = {}
+        self.bond_groups = np.full(len(flags), -1, dtype=np.int32)
+        for card_id in loader.get_card_ids_by_ability(Ability.TIGHT_BOND):
+            index = loader.get_card_index(card_id)
+            self.bond_groups[index] = groups.setdefault(self.table.names[index], len(groups))
+        self.bond_group_count = max(1, len(groups))
+
+    def row_scores(self, batch: BoardBatch) -> np.ndarray:
+        """Score of every row of every board as a (boards, 2, 3) array"""
+        cards, sides, rows = batch.cards, batch.sides.astype(np.intp), batch.rows.astype(np.intp)
+        boards = cards.shape[0]
+        present = cards >= 0
+        handles = np.where(present, cards, 0)
+        units = self.units[handles] & present
+
+        weathered = (self.weather_rows[batch.weather][:, None] >> rows) & 1
+        strength = np.where(weathered.astype(bool) & ~self.heroes[handles], 1, self.values[handles])
+
+        slots = sides * len(ROWS) + rows
+        cells = np.arange(boards)[:, None] * _SLOTS + slots
+        if self.tight_bond:
+            groups = self.bond_groups[handles]
+            bonded = units & (groups >= 0)
+            keys = cells * self.bond_group_count + groups
+            counts = np.bincount(keys[bonded], minlength=boards * _SLOTS * self.bond_group_count)
+            strength = np.where(bonded, strength * counts[np.where(bonded, keys, 0)], strength)
+
+        multipliers = np.take_along_axis(batch.multipliers.reshape(boards, _SLOTS), slots, axis=1)
+        contributions = np.where(units, strength * multipliers, 0)
+        scores = np.bincount(cells[units], weights=contributions[units], minlength=boards * _SLOTS)
+        return scores.astype(np.int64).reshape(boards, 2, len(ROWS))
+
+    def scores(self, batch: BoardBatch) -> np.ndarray:
+        """Side totals of every board as a (boards, 2) array"""
+        return self.row_scores(batch).sum(axis=2)
+
+    def candidate_batch(self, state: GameState, moves: Sequence[int]) -> BoardBatch:
+        """The board after each move, before the turn or round ends.
+
+        The board of the position is shared by every candidate, each move
+        only adds the cards it puts down: a spy on the opponent's row, the
+        cards a muster pulls from hand and deck, or the unit a medic revives.
+        """
+        base_cards, base_sides, base_rows = [], [], []
+        for side in (0, 1):
+            for row, cards in enumerate(state.rows[side]):
+                base_cards.extend(cards)
+                base_sides.extend([side] * len(cards))
+                base_rows.extend([row] * len(cards))
+
+        added = [self._placed_cards(state, move) for move in moves]
+        width = len(base_cards) + max((len(cards) for cards in added), default=0)
+        boards = len(moves)
+        cards = np.full((boards, width), -1, dtype=np.int32)
+        sides = np.zeros((boards, width), dtype=np.int8)
+        rows = np.zeros((boards, width), dtype=np.int8)
+        base = len(base_cards)
+        cards[:, :base] = base_cards
+        sides[:, :base] = base_sides
+        rows[:, :base] = base_rows
+        for board, placed in enumerate(added):
+            for column, (card, side, row) in enumerate(placed, base):
+                cards[board, column] = card
+                sides[board, column] = side
+                rows[board, column] = row
+
+        multipliers = np.asarray([state.multipliers[0], state.multipliers[1]], dtype=np.int32)
+        return BoardBatch(cards, sides, rows, np.full(boards, state.weather, dtype=np.int32),
+                          np.broadcast_to(multipliers, (boards, 2, len(ROWS))))
+
+    def _placed_cards(self, state: GameState, move: int) -> List[tuple]:
+        """(card, side, row) of everything move puts on the board, mirroring GameState.apply"""
+        if move == PASS:
+            return []
+        table = self.table
+        side = state.to_move
+        card, row = decode_move(move)
+        flags = table.flags[card]
+        if flags & FLAG_SPY:
+            return [(card, 1 - side, row)]
+        placed = [(card, side, row)]
+        if flags & FLAG_MUSTER:
+            group, names = table.muster_groups[card], table.names
+            placed.extend((c, side, row) for c in state.hands[side] if c in group and names[c] != names[card])
+            placed.extend((c, side, row) for c in reversed(state.decks[side]) if c in group)
+        elif flags & FLAG_MEDIC:
+            best = None
+            for c in state.graveyards[side]:
+                if table.flags[c] & FLAG_UNIT and not table.flags[c] & FLAG_HERO:
+                    if best is None or table.values[c] > table.values[best]:
+                        best = c
+            if best is not None:
+                placed.append((best, side, row))
+        return placed
+
+    def placed_scores(self, state: GameState, moves: Sequence[int]) -> np.ndarray:
+        """Side totals after each move as a (moves, 2) array, scoring only the cards moves put down.
+
+        Without bonds a card's strength does not depend on its row mates, so
+        every candidate is the position's cached totals plus its own cards.
+        """
+        cards, sides, rows, boards = [], [], [], []
+        for board, move in enumerate(moves):
+            for card, side, row in self._placed_cards(state, move):
+                cards.append(card)
+                sides.append(side)
+                rows.append(row)
+                boards.append(board)
+        totals = np.empty((len(moves), 2), dtype=np.int64)
+        totals[:] = state.scores
+        if cards:
+            cards = np.asarray(cards, dtype=np.intp)
+            sides = np.asarray(sides, dtype=np.intp)
+            rows = np.asarray(rows, dtype=np.intp)
+            weathered = ((WEATHER_ROW_MASKS[state.weather] >> rows) & 1).astype(bool)
+            strength = np.where(weathered & ~self.heroes[cards], 1, self.values[cards])
+            strength *= np.asarray([state.multipliers[0], state.multipliers[1]], dtype=np.int32)[sides, rows]
+            strength[~self.units[cards]] = 0
+            totals += np.bincount(np.asarray(boards, dtype=np.intp) * 2 + sides, weights=strength,
+                                  minlength=2 * len(moves)).astype(np.int64).reshape(-1, 2)
+        return totals
+
+    def score_moves(self, state: GameState, moves: Optional[Sequence[int]] = None) -> np.ndarray:
+        """Score lead of the side to move right after each move, all moves in one batch"""
+        if moves is None:
+            moves = state.legal_moves()
+        if self.tight_bond:
+            # A bonded card changes the strength of its row mates, so whole boards are scored
+            totals = self.scores(self.candidate_batch(state, moves))
+        else:
+            totals = self.placed_scores(state, moves)
+        side = state.to_move
+        return totals[:, side] - totals[:, 1 - side]
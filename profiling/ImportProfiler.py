@@ -0,0 +1,94 @@
+import sys
+import time
+from importlib.abc import MetaPathFinder
+from typing import Dict, List, Optional, Tuple
+
+class _TimedLoader:
+    """Wraps a module loader and times its exec_module()"""
+    def __init__(self, loader, profiler: 'ImportProfiler'):
+        self._loader = loader
+        self._profiler = profiler
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._profiler._enter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._leave(module.__name__)
+
+    def __getattr__(self, name):
+        # Resource readers, get_data() and friends go to the real loader
+        return getattr(self._loader, name)
+
+class ImportProfiler(MetaPathFinder):
+    """Records how long each module takes to import.
+
+    Installed at the front of sys.meta_path, it asks the remaining finders
+    for each spec and wraps the loader, so only modules imported after
+    install() are seen. Self time excludes the imports a module triggers,
+    cumulative time includes them.
+    """
+    _instance: Optional['ImportProfiler'] = None
+
+    def __init__(self):
+        self.timings: Dict[str, Tuple[float, float]] = {}  # module -> (self, cumulative)
+        self._stack: List[List[float]] = []  # [start, time spent in nested imports]
+        self._finding = set()
+
+    @classmethod
+    def install(cls) -> 'ImportProfiler':
+        if cls._instance is None:
+            cls._instance = ImportProfiler()
+            sys.meta_path.insert(0, cls._instance)
+        return cls._instance
+
+    @classmethod
+    def uninstall(cls):
+        if cls._instance is not None and cls._instance in sys.meta_path:
+            sys.meta_path.remove(cls._instance)
+
+    @classmethod
+    def get_instance(cls) -> Optional['ImportProfiler']:
+        return cls._instance
+
+    def find_spec(self, fullname, path, target=None):
+        if fullname in self._finding:
+            return None
+        self._finding.add(fullname)
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                        spec.loader = _TimedLoader(spec.loader, self)
+                    return spec
+            return None
+        finally:
+            self._finding.discard(fullname)
+
+    def _enter(self):
+        self._stack.append([time.perf_counter(), 0.0])
+
+    def _leave(self, name: str):
+        start, nested = self._stack.pop()
+        cumulative = time.perf_counter() - start
+        self.timings[name] = (cumulative - nested, cumulative)
+        if self._stack:
+            self._stack[-1][1] += cumulative
+
+    def total(self) -> float:
+        """Time spent executing profiled modules"""
+        return sum(self_time for self_time, _ in self.timings.values())
+
+    def report(self, limit: int = 25) -> str:
+        ranked = sorted(self.timings.items(), key=lambda item: item[1][0], reverse=True)
+        lines = [f"Imported {len(self.timings)} modules in {self.total() * 1000:.1f} ms",
+                 f"{'self ms':>9} {'cumul. ms':>10}  module"]
+        for name, (self_time, cumulative) in ranked[:limit]:
+            lines.append(f"{self_time * 1000:9.1f} {cumulative * 1000:10.1f}  {name}")
+        return "\n".join(lines)
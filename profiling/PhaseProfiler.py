@@ -0,0 +1,175 @@
+import functools
+import time
+from typing import Dict, Iterable, List, Optional
+
+# Phases instrument_match() registers, in the order it wraps them
+PHASES = ("turn.player", "turn.ai", "ai.make_move", "board.score", "board.rescore", "board.clear_board",
+          "view.draw_board", "view.handle_events")
+
+# Latencies are bucketed by powers of two nanoseconds, bucket i holds [2**(i-1), 2**i)
+_BUCKETS = 48
+
+def _format_ns(ns: float) -> str:
+    if ns >= 1e9:
+        return f"{ns / 1e9:.2f}s"
+    if ns >= 1e6:
+        return f"{ns / 1e6:.2f}ms"
+    if ns >= 1e3:
+        return f"{ns / 1e3:.1f}us"
+    return f"{ns:.0f}ns"
+
+class PhaseStats:
+    """Call count and latency histogram of one phase"""
+    __slots__ = ("name", "calls", "total", "self_total", "max", "buckets")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.total = 0  # Inclusive nanoseconds
+        self.self_total = 0  # Nanoseconds not spent in nested phases
+        self.max = 0
+        self.buckets = [0] * _BUCKETS
+
+    def add(self, elapsed: int, self_elapsed: int):
+        self.calls += 1
+        self.total += elapsed
+        self.self_total += self_elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+        self.buckets[min(elapsed.bit_length(), _BUCKETS - 1)] += 1
+
+    def percentile(self, fraction: float) -> int:
+        """Upper bound of the bucket holding the given fraction of calls"""
+        threshold = fraction * self.calls
+        seen = 0
+        for bucket, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= threshold:
+                return min(1 << bucket, self.max)
+        return self.max
+
+class PhaseProfiler:
+    """Times the phases of a match: turns, AI moves, scoring and drawing.
+
+    Nothing is measured until install() is called. From then on every
+    GwentGame wraps its phases on its own instances via instrument_match(),
+    so a disabled profiler costs one check per game and nothing per call.
+    Self time excludes nested phases, e.g. drawing during an AI turn.
+    Phases named in cprofile_phases also run under cProfile.
+    """
+    _instance: Optional['PhaseProfiler'] = None
+
+    def __init__(self, cprofile_phases: Iterable[str] = ()):
+        self.phases: Dict[str, PhaseStats] = {}
+        self.cprofile_phases = frozenset(cprofile_phases)
+        self._stack: List[int] = []  # Time spent in nested phases, per open phase
+        self._cprofile = None
+        self._cprofile_depth = 0
+
+    @classmethod
+    def install(cls, cprofile_phases: Iterable[str] = ()) -> 'PhaseProfiler':
+        unknown = sorted(set(cprofile_phases) - set(PHASES))
+        if unknown:
+            raise ValueError(f"unknown phase {', '.join(unknown)}, choose from {', '.join(PHASES)}")
+        if cls._instance is None:
+            cls._instance = PhaseProfiler(cprofile_phases)
+        return cls._instance
+
+    @classmethod
+    def uninstall(cls):
+        cls._instance = None
+
+    @classmethod
+    def get_instance(cls) -> Optional['PhaseProfiler']:
+        return cls._instance
+
+    def instrument_match(self, game):
+        """Wrap the phases of a GwentGame, its board, AI controllers and view"""
+        self.instrument(game, "handle_player_turn", "turn.player")
+        self.instrument(game, "handle_ai_turn", "turn.ai")
+        for controller in (game.player1, game.player2):
+            if not controller.is_player:
+                self.instrument(controller, "make_move", "ai.make_move")
+        self.instrument(game.board, "get_value_of_row", "board.score")
+        self.instrument(game.board, "rescore", "board.rescore")
+        self.instrument(game.board, "clear_board", "board.clear_board")
+        self.instrument(game.view, "draw_board", "view.draw_board")
+        self.instrument(game.view, "handle_events", "view.handle_events")
+
+    def instrument(self, obj, method_name: str, phase: str):
+        """Time calls of obj.method_name as phase, shadowing the method on the instance only"""
+        method = getattr(obj, method_name)
+        stats = self.phases.get(phase)
+        if stats is None:
+            stats = self.phases[phase] = PhaseStats(phase)
+        stack = self._stack
+        clock = time.perf_counter_ns
+        profiled = phase in self.cprofile_phases
+
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            if profiled:
+                self._enter_cprofile()
+            stack.append(0)
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed = clock() - start
+                if profiled:
+                    self._leave_cprofile()
+                nested = stack.pop()
+                if stack:
+                    stack[-1] += elapsed
+                stats.add(elapsed, elapsed - nested)
+
+        setattr(obj, method_name, timed)
+
+    def _enter_cprofile(self):
+        if self._cprofile is None:
+            import cProfile
+            self._cprofile = cProfile.Profile()
+        # Nested profiled phases share the outermost enable()
+        if self._cprofile_depth == 0:
+            self._cprofile.enable()
+        self._cprofile_depth += 1
+
+    def _leave_cprofile(self):
+        self._cprofile_depth -= 1
+        if self._cprofile_depth == 0:
+            self._cprofile.disable()
+
+    def report(self, histograms: bool = True, cprofile_limit: int = 25) -> str:
+        ranked = sorted((stats for stats in self.phases.values() if stats.calls),
+                        key=lambda stats: stats.self_total, reverse=True)
+        total = sum(stats.self_total for stats in ranked)
+        lines = [f"Phase profile, {_format_ns(total)} in profiled phases",
+                 f"{'phase':<20} {'calls':>8} {'total':>9} {'self':>9} {'self %':>7} "
+                 f"{'mean':>9} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9}"]
+        for stats in ranked:
+            lines.append(f"{stats.name:<20} {stats.calls:>8} {_format_ns(stats.total):>9} "
+                         f"{_format_ns(stats.self_total):>9} {stats.self_total / total if total else 0:>7.1%} "
+                         f"{_format_ns(stats.total / stats.calls):>9} {_format_ns(stats.percentile(0.5)):>9} "
+                         f"{_format_ns(stats.percentile(0.9)):>9} {_format_ns(stats.percentile(0.99)):>9} "
+                         f"{_format_ns(stats.max):>9}")
+
+        if histograms:
+            for stats in ranked:
+                lines.append("")
+                lines.append(f"{stats.name} latency")
+                peak = max(stats.buckets)
+                for bucket, count in enumerate(stats.buckets):
+                    if count:
+                        low = 1 << (bucket - 1) if bucket else 0
+                        bar = "#" * max(1, round(40 * count / peak))
+                        lines.append(f"  {_format_ns(low):>8} - {_format_ns(1 << bucket):<8} {count:>8}  {bar}")
+
+        if self._cprofile is not None:
+            import io
+            import pstats
+            out = io.StringIO()
+            pstats.Stats(self._cprofile, stream=out).sort_stats("cumulative").print_stats(cprofile_limit)
+            lines.append("")
+            lines.append(f"cProfile of {', '.join(sorted(self.cprofile_phases))}")
+            lines.append(out.getvalue().rstrip())
+        return "\n".join(lines)
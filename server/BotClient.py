@@ -0,0 +1,71 @@
+import asyncio
+import time
+from typing import List, Optional
+
+from server.Connection import Connection, ConnectionClosed, KIND_STATE
+from server.StateSync import StateDecoder
+
+class BotClient:
+    """Plays one match through a Connection the way AIController does.
+
+    It plays the first card of its hand to the card's first row and revives
+    the first revivable card, so a served match between two bots ends like
+    the same seed played headlessly with AIControllers. The round trip of
+    every move, from sending it to the server echoing it, is kept in rtts.
+    The board is followed through the server's state frames in state.
+    """
+    def __init__(self, connection: Connection, name: str = "bot", think_time: float = 0.0):
+        self.connection = connection
+        self.name = name
+        self.think_time = think_time
+        self.side: Optional[int] = None
+        self.result: Optional[dict] = None
+        self.errors: List[str] = []
+        self.rtts: List[float] = []
+        self.state = StateDecoder()
+        self.state_bytes = 0
+
+    async def play(self) -> Optional[dict]:
+        """Join the lobby and play until the server sends the result, which is returned"""
+        connection = self.connection
+        sent_at = None
+        try:
+            await connection.send({"type": "hello", "name": self.name})
+            while self.result is None:
+                frame_kind, payload = await connection.receive_frame()
+                if frame_kind == KIND_STATE:
+                    self.state_bytes += len(payload)
+                    if not self.state.apply(payload):
+                        await connection.send({"type": "resync"})
+                    continue
+                message = connection.decode_message(payload)
+                kind = message.get("type")
+                if kind == "start":
+                    self.side = message["side"]
+                elif kind == "turn":
+                    if self.think_time:
+                        await asyncio.sleep(self.think_time)
+                    sent_at = time.perf_counter()
+                    await connection.send(self.choose_move(message))
+                elif kind == "moved" and message["side"] == self.side and sent_at is not None:
+                    self.rtts.append(time.perf_counter() - sent_at)
+                    sent_at = None
+                elif kind == "error":
+                    self.errors.append(message["message"])
+                    if self.side is None:
+                        break  # Refused before a match started
+                elif kind == "result":
+                    self.result = message
+        except ConnectionClosed as e:
+            self.errors.append(str(e))
+        finally:
+            await connection.close()
+        return self.result
+
+    def choose_move(self, turn: dict) -> dict:
+        # The server fills in the first row of the card when none is given
+        if not turn["hand"]:
+            return {"type": "move", "card": None}
+        revivable = turn["revivable"]
+        return {"type": "move", "card": turn["hand"][0], "row": None,
+                "revive": revivable[0] if revivable else None}
@@ -0,0 +1,108 @@
+import asyncio
+import json
+import struct
+from typing import Iterable, Optional, Tuple
+
+# Every frame is its payload length, a kind byte and the payload
+_FRAME = struct.Struct("<IB")
+KIND_MESSAGE = 0  # UTF-8 JSON object
+KIND_STATE = 1  # Binary board state, see server.StateSync
+MAX_FRAME = 1 << 16  # Larger frames are a protocol error, no message comes close
+
+# Bytes buffered for a peer before send() starts waiting for it to read
+WRITE_BUFFER_LIMIT = 64 * 1024
+
+class ConnectionClosed(Exception):
+    """The peer went away, stopped reading or broke the protocol"""
+
+class Connection:
+    """Framed message channel to one peer over an asyncio stream.
+
+    send() waits while the outgoing buffer is above WRITE_BUFFER_LIMIT, so a
+    client that stops reading stalls only the match it plays in, and with a
+    send timeout gets dropped instead of growing the server's memory.
+    """
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                 send_timeout: Optional[float] = None):
+        self.reader = reader
+        self.writer = writer
+        self.send_timeout = send_timeout
+        writer.transport.set_write_buffer_limits(high=WRITE_BUFFER_LIMIT)
+
+    @classmethod
+    async def open_tcp(cls, host: str, port: int) -> 'Connection':
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    @classmethod
+    async def open_unix(cls, path: str) -> 'Connection':
+        reader, writer = await asyncio.open_unix_connection(path)
+        return cls(reader, writer)
+
+    async def send_frame(self, kind: int, payload: bytes):
+        await self.send_frames(((kind, payload),))
+
+    async def send_frames(self, frames: Iterable[Tuple[int, bytes]]):
+        """Send several frames with a single write"""
+        if self.writer.is_closing():
+            raise ConnectionClosed("connection is closed")
+        self.writer.write(b"".join(_FRAME.pack(len(payload), kind) + payload for kind, payload in frames))
+        # Only a full buffer makes drain() wait, and wait_for() costs a task per call
+        if self.writer.transport.get_write_buffer_size() <= WRITE_BUFFER_LIMIT:
+            return
+        try:
+            await asyncio.wait_for(self.writer.drain(), self.send_timeout)
+        except TimeoutError:
+            raise ConnectionClosed("peer stopped reading") from None
+        except ConnectionError as e:
+            raise ConnectionClosed(str(e)) from e
+
+    def try_send_frame(self, kind: int, payload: bytes) -> bool:
+        """Send without waiting, False if the peer is behind and the frame was dropped"""
+        if self.writer.is_closing() or self.writer.transport.get_write_buffer_size() > WRITE_BUFFER_LIMIT:
+            return False
+        self.writer.write(_FRAME.pack(len(payload), kind) + payload)
+        return True
+
+    async def receive_frame(self) -> Tuple[int, bytes]:
+        try:
+            length, kind = _FRAME.unpack(await self.reader.readexactly(_FRAME.size))
+            if length > MAX_FRAME:
+                raise ConnectionClosed(f"frame of {length} bytes exceeds {MAX_FRAME}")
+            return kind, await self.reader.readexactly(length)
+        except asyncio.IncompleteReadError:
+            raise ConnectionClosed("peer closed the connection") from None
+        except ConnectionError as e:
+            raise ConnectionClosed(str(e)) from e
+
+    async def send(self, message: dict):
+        await self.send_frame(KIND_MESSAGE, self.encode_message(message))
+
+    @staticmethod
+    def encode_message(message: dict) -> bytes:
+        return json.dumps(message, separators=(",", ":")).encode()
+
+    async def receive(self) -> dict:
+        """Wait for the next JSON message, skipping frames of kinds this side does not know"""
+        while True:
+            kind, payload = await self.receive_frame()
+            if kind == KIND_MESSAGE:
+                return self.decode_message(payload)
+
+    @staticmethod
+    def decode_message(payload: bytes) -> dict:
+        try:
+            message = json.loads(payload)
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise ConnectionClosed(f"malformed message: {e}") from e
+        if not isinstance(message, dict):
+            raise ConnectionClosed("message is not an object")
+        return message
+
+    async def close(self):
+        if not self.writer.is_closing():
+            self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
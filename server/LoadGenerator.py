@@ -0,0 +1,162 @@
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass, field, asdict
+from typing import Awaitable, Callable, List
+
+from server.BotClient import BotClient
+from server.Connection import Connection
+from server.MatchServer import MatchServer
+from singleton.CardLoader import CardLoader
+
+@dataclass
+class LoadReport:
+    """Throughput and latency of one load run, times in seconds"""
+    transport: str
+    matches: int = 0
+    completed: int = 0  # Matches both bots saw a result for
+    failed: int = 0
+    elapsed: float = 0.0
+    peak_matches: int = 0
+    moves: int = 0
+    state_bytes: int = 0  # Board state frames received by the bots
+    rtts: List[float] = field(default_factory=list)
+
+    @property
+    def matches_per_second(self) -> float:
+        return self.completed / self.elapsed if self.elapsed else 0.0
+
+    def rtt_percentile(self, fraction: float) -> float:
+        if not self.rtts:
+            return 0.0
+        ordered = sorted(self.rtts)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def summary(self) -> dict:
+        """Numbers worth publishing, without the raw samples"""
+        data = asdict(self)
+        del data["rtts"]
+        data.update(matches_per_second=self.matches_per_second,
+                    rtt_mean=sum(self.rtts) / len(self.rtts) if self.rtts else 0.0,
+                    rtt_p50=self.rtt_percentile(0.5), rtt_p90=self.rtt_percentile(0.9),
+                    rtt_p99=self.rtt_percentile(0.99), rtt_max=max(self.rtts, default=0.0))
+        return data
+
+    def report(self) -> str:
+        summary = self.summary()
+        lines = [f"Matches: {self.completed} of {self.matches} over {self.transport} in {self.elapsed:.2f}s "
+                 f"({self.matches_per_second:.0f} matches/sec, {self.failed} failed)",
+                 f"Peak concurrent matches: {self.peak_matches}, moves: {self.moves}"]
+        lines.append(f"State frames: {self.state_bytes / max(1, self.moves):.0f} bytes per move and seat")
+        lines.append("Move round trip: " + ", ".join(f"{name} {summary['rtt_' + name] * 1e3:.2f}ms"
+                                                       for name in ("mean", "p50", "p90", "p99", "max")))
+        return "\n".join(lines)
+
+async def generate_load(connect: Callable[[], Awaitable[Connection]], matches: int, concurrency: int,
+                        transport: str = "local", think_time: float = 0.0) -> LoadReport:
+    """Play matches between pairs of BotClients, keeping concurrency matches in flight"""
+    report = LoadReport(transport, matches)
+    active = 0
+    pending = asyncio.Semaphore(concurrency)
+
+    async def play_pair(index: int):
+        nonlocal active
+        connections = []
+        playing = False
+        try:
+            for _ in (0, 1):
+                connections.append(await connect())
+            bots = [BotClient(connection, f"bot{index}-{side}", think_time)
+                    for side, connection in enumerate(connections)]
+            active += 1
+            playing = True
+            report.peak_matches = max(report.peak_matches, active)
+            # Both bots run to the end even if one fails, so neither is left behind
+            results = await asyncio.gather(*(bot.play() for bot in bots), return_exceptions=True)
+            if all(isinstance(result, dict) and result["reason"] == "finished" for result in results):
+                report.completed += 1
+            else:
+                report.failed += 1
+            for bot in bots:
+                report.rtts.extend(bot.rtts)
+                report.moves += len(bot.rtts)
+                report.state_bytes += bot.state_bytes
+        except Exception:
+            # A failed connect counts as a failed match rather than ending the whole run
+            report.failed += 1
+        finally:
+            if playing:
+                active -= 1
+            for connection in connections:
+                await connection.close()
+            pending.release()
+
+    start = time.perf_counter()
+    tasks = []
+    for index in range(matches):
+        await pending.acquire()
+        tasks.append(asyncio.create_task(play_pair(index)))
+    await asyncio.gather(*tasks)
+    report.elapsed = time.perf_counter() - start
+    return report
+
+async def _run(args) -> LoadReport:
+    if args.connect:
+        host, _, port = args.connect.rpartition(":")
+        if args.transport == "unix":
+            return await generate_load(lambda: Connection.open_unix(args.connect), args.matches,
+                                       args.concurrency, "unix", args.think_time)
+        return await generate_load(lambda: Connection.open_tcp(host, int(port)), args.matches,
+                                   args.concurrency, "tcp", args.think_time)
+
+    # Without --connect the server runs in this process, so this measures matches per process
+    server = MatchServer(max_matches=args.concurrency, max_waiting=2 * args.concurrency, first_seed=args.seed)
+    try:
+        if args.transport == "tcp":
+            port = await server.start_tcp()
+            connect = lambda: Connection.open_tcp("127.0.0.1", port)
+        elif args.transport == "unix":
+            path = os.path.join(tempfile.mkdtemp(), "gwent.sock")
+            await server.start_unix(path)
+            connect = lambda: Connection.open_unix(path)
+        else:
+            connect = server.connect_local
+        report = await generate_load(connect, args.matches, args.concurrency, args.transport, args.think_time)
+        report.peak_matches = server.stats.peak_matches
+    finally:
+        await server.close()
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Measure match throughput and move latency of a match server')
+    parser.add_argument('-n', '--matches', type=int, default=1000,
+                       help='Matches to play (default: 1000)')
+    parser.add_argument('-c', '--concurrency', type=int, default=100,
+                       help='Matches in flight at once (default: 100)')
+    parser.add_argument('--transport', choices=['local', 'tcp', 'unix'], default='local',
+                       help='How bots reach the in-process server (default: local socket pairs)')
+    parser.add_argument('--connect', metavar='ADDRESS', default=None,
+                       help='Load an already running server at HOST:PORT, or a socket path with --transport unix')
+    parser.add_argument('--think-time', type=float, default=0.0,
+                       help='Seconds each bot waits before moving (default: 0)')
+    parser.add_argument('--seed', type=int, default=0,
+                       help='Seed of the first match of the in-process server')
+    parser.add_argument('--output', metavar='FILE', default=None,
+                       help='Also write the summary as JSON to FILE')
+    args = parser.parse_args()
+    if args.connect and args.transport == 'local':
+        parser.error("--connect needs --transport tcp or unix")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        CardLoader.get_instance()
+    report = asyncio.run(_run(args))
+    print(report.report())
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report.summary(), f, indent=2)
+        print(f"Summary written to {args.output}")
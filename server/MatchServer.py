@@ -0,0 +1,243 @@
+import argparse
+import asyncio
+import contextlib
+import io
+import socket
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set
+
+from server.Connection import Connection, ConnectionClosed
+from server.MatchSession import MatchSession, Seat, SessionResult
+from singleton.CardLoader import CardLoader
+
+@dataclass
+class ServerStats:
+    """Counters of a running MatchServer"""
+    connections: int = 0
+    refused: int = 0  # Clients turned away because the lobby was full
+    matches_started: int = 0
+    matches_finished: int = 0
+    forfeits: int = 0
+    timeouts: int = 0
+    active_matches: int = 0
+    peak_matches: int = 0
+    moves: int = 0
+    spectators: int = 0
+
+class MatchServer:
+    """Hosts many matches at once on one asyncio event loop.
+
+    Clients connect over TCP, a Unix socket or connect_local(), say hello
+    with their name and wait in the lobby until they are paired with the
+    next client. At most max_matches run at a time; further pairs wait for
+    a slot, and once max_waiting clients are queued new ones are refused,
+    so load beyond capacity is turned away instead of slowing every match.
+
+    Instead of hello a client may send list, answered with the running
+    match IDs, or watch with a match ID to follow that match's state frames
+    as a spectator, sending resync whenever it lost track.
+    """
+    def __init__(self, max_matches: int = 1000, max_waiting: int = 1000, move_timeout: float = 30.0,
+                 match_timeout: float = 900.0, send_timeout: float = 10.0, hello_timeout: float = 10.0,
+                 first_seed: Optional[int] = None, record_dir: Optional[str] = None,
+                 max_spectators: int = 100, keyframe_interval: int = 32):
+        self.max_matches = max_matches
+        self.max_spectators = max_spectators
+        self.keyframe_interval = keyframe_interval
+        self.move_timeout = move_timeout
+        self.match_timeout = match_timeout
+        self.send_timeout = send_timeout
+        self.hello_timeout = hello_timeout
+        self.record_dir = record_dir
+        self.stats = ServerStats()
+        self.results: List[SessionResult] = []
+        self._next_seed = first_seed
+        self._next_match_id = 0
+        self._lobby: asyncio.Queue = asyncio.Queue(max_waiting)
+        self._slots = asyncio.Semaphore(max_matches)
+        self._servers: List[asyncio.AbstractServer] = []
+        self._tasks: Set[asyncio.Task] = set()
+        self._matchmaker: Optional[asyncio.Task] = None
+        self._sessions: Dict[int, MatchSession] = {}
+
+    def _spawn(self, coroutine) -> asyncio.Task:
+        # The loop only keeps weak references to tasks
+        task = asyncio.create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def _start_matchmaker(self):
+        if self._matchmaker is None:
+            self._matchmaker = asyncio.create_task(self._pair_seats())
+
+    async def start_tcp(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """Listen on a TCP port and return it, port 0 picks a free one"""
+        self._start_matchmaker()
+        server = await asyncio.start_server(self._handle_client, host, port)
+        self._servers.append(server)
+        return server.sockets[0].getsockname()[1]
+
+    async def start_unix(self, path: str):
+        self._start_matchmaker()
+        self._servers.append(await asyncio.start_unix_server(self._handle_client, path))
+
+    async def connect_local(self) -> Connection:
+        """Connect an in-process client through a socket pair, with the same framing and backpressure"""
+        self._start_matchmaker()
+        server_socket, client_socket = socket.socketpair()
+        reader, writer = await asyncio.open_connection(sock=server_socket)
+        self._spawn(self._handle_client(reader, writer))
+        reader, writer = await asyncio.open_connection(sock=client_socket)
+        return Connection(reader, writer)
+
+    async def serve_forever(self):
+        await asyncio.gather(*(server.serve_forever() for server in self._servers))
+
+    async def close(self):
+        for server in self._servers:
+            server.close()
+        if self._matchmaker is not None:
+            self._matchmaker.cancel()
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        connection = Connection(reader, writer, self.send_timeout)
+        self.stats.connections += 1
+        try:
+            try:
+                hello = await asyncio.wait_for(connection.receive(), self.hello_timeout)
+            except TimeoutError:
+                return
+            if hello.get("type") == "list":
+                await connection.send({"type": "matches", "matches": sorted(self._sessions)})
+                return
+            if hello.get("type") == "watch":
+                await self._watch(connection, hello.get("match"))
+                return
+            if hello.get("type") != "hello" or not isinstance(hello.get("name"), str):
+                await connection.send({"type": "error", "message": "expected hello with a name"})
+                return
+            seat = Seat(hello["name"][:32], connection, asyncio.get_running_loop().create_future())
+            try:
+                self._lobby.put_nowait(seat)
+            except asyncio.QueueFull:
+                self.stats.refused += 1
+                await connection.send({"type": "error", "message": "server busy, try again later"})
+                return
+            await connection.send({"type": "waiting"})
+            await seat.done
+        except ConnectionClosed:
+            pass
+        finally:
+            await connection.close()
+
+    async def _watch(self, connection: Connection, match_id):
+        session = self._sessions.get(match_id)
+        if session is None:
+            await connection.send({"type": "error", "message": f"no running match {match_id!r}"})
+            return
+        if len(session.spectators) >= self.max_spectators:
+            await connection.send({"type": "error", "message": "too many spectators"})
+            return
+        self.stats.spectators += 1
+        session.add_spectator(connection)
+        receiving = asyncio.ensure_future(connection.receive())
+        try:
+            while True:
+                await asyncio.wait((receiving, session.finished), return_when=asyncio.FIRST_COMPLETED)
+                if session.finished.done():
+                    break
+                if receiving.result().get("type") == "resync":
+                    session.resync_spectator(connection)
+                receiving = asyncio.ensure_future(connection.receive())
+        finally:
+            receiving.cancel()
+            session.remove_spectator(connection)
+            self.stats.spectators -= 1
+
+    async def _pair_seats(self):
+        while True:
+            await self._slots.acquire()
+            first = await self._lobby.get()
+            second = await self._lobby.get()
+            self._spawn(self._run_match((first, second)))
+
+    async def _run_match(self, seats):
+        stats = self.stats
+        match_id = self._next_match_id
+        self._next_match_id += 1
+        seed = self._next_seed
+        if seed is not None:
+            self._next_seed += 1
+        stats.matches_started += 1
+        stats.active_matches += 1
+        stats.peak_matches = max(stats.peak_matches, stats.active_matches)
+        session = None
+        try:
+            session = MatchSession(match_id, seats, seed, self.move_timeout, self.match_timeout, self.record_dir,
+                                   self.keyframe_interval)
+            self._sessions[match_id] = session
+            result = await session.run()
+            self.results.append(result)
+            stats.matches_finished += 1
+            stats.moves += result.moves
+            if result.reason == "forfeit":
+                stats.forfeits += 1
+            elif result.reason == "timeout":
+                stats.timeouts += 1
+        finally:
+            if session is not None:
+                del self._sessions[match_id]
+                if not session.finished.done():
+                    session.finished.cancel()
+            stats.active_matches -= 1
+            self._slots.release()
+            for seat in seats:
+                if not seat.done.done():
+                    seat.done.set_result(None)
+
+async def _serve(args):
+    server = MatchServer(args.max_matches, args.max_waiting, args.move_timeout, args.match_timeout,
+                         first_seed=args.seed, record_dir=args.record_dir)
+    if args.unix:
+        await server.start_unix(args.unix)
+        print(f"Serving on {args.unix}", flush=True)
+    else:
+        port = await server.start_tcp(args.host, args.port)
+        print(f"Serving on {args.host}:{port}", flush=True)
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Host Gwent matches for network clients')
+    parser.add_argument('--host', default='127.0.0.1',
+                       help='Address to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=7777,
+                       help='TCP port to listen on (default: 7777)')
+    parser.add_argument('--unix', metavar='PATH', default=None,
+                       help='Listen on a Unix socket instead of TCP')
+    parser.add_argument('--max-matches', type=int, default=1000,
+                       help='Matches played at once, further pairs wait (default: 1000)')
+    parser.add_argument('--max-waiting', type=int, default=1000,
+                       help='Clients queued before new ones are refused (default: 1000)')
+    parser.add_argument('--move-timeout', type=float, default=30.0,
+                       help='Seconds a player has to move before passing (default: 30)')
+    parser.add_argument('--match-timeout', type=float, default=900.0,
+                       help='Seconds before a match is abandoned as a draw (default: 900)')
+    parser.add_argument('--seed', type=int, default=None,
+                       help='Seed of the first match, later matches use the following seeds')
+    parser.add_argument('--record-dir', default=None,
+                       help='Write a match log of every finished match into this directory')
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        CardLoader.get_instance()
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,230 @@
+import asyncio
+import os
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from Gwent import GwentGame
+from controller.ReplayController import ReplayController
+from model.Card import Ability, HeroCard, UnitCard
+from model.GameState import ROWS
+from model.MatchLog import LoggedMove
+from server.Connection import Connection, ConnectionClosed, KIND_MESSAGE, KIND_STATE
+from server.StateSync import StateEncoder
+
+class Seat(NamedTuple):
+    """A connected client waiting for or playing a match"""
+    name: str
+    connection: Connection
+    done: asyncio.Future  # Resolved once the match no longer needs the connection
+
+class SeatLost(Exception):
+    """A seat's connection failed during the match"""
+    def __init__(self, side: int, reason: str):
+        super().__init__(reason)
+        self.side = side
+
+@dataclass
+class SessionResult:
+    """Outcome of a served match, round scores from side 0's point of view"""
+    match_id: int
+    seed: Optional[int]
+    winner: Optional[int]  # Winning side, None on a draw
+    reason: str  # "finished", "forfeit" or "timeout"
+    round_scores: List[Tuple[int, int]] = field(default_factory=list)
+    moves: int = 0
+
+class MatchSession:
+    """Plays one match between two remote seats on the server's event loop.
+
+    Both seats are ReplayControllers sharing a queue of LoggedMoves. The
+    session asks the seat to move, validates the answer against the game,
+    queues it and runs the synchronous turn, so the engine never waits on
+    the network. A seat that does not answer within move_timeout passes,
+    one whose connection fails forfeits, and a match running longer than
+    match_timeout ends as a draw.
+
+    The board reaches seats and spectators as StateEncoder frames: a
+    keyframe when they join or ask to resync, then one delta per turn that
+    changed something, encoded once for everybody.
+    """
+    def __init__(self, match_id: int, seats: Tuple[Seat, Seat], seed: Optional[int] = None,
+                 move_timeout: float = 30.0, match_timeout: float = 900.0, record_dir: Optional[str] = None,
+                 keyframe_interval: int = 32):
+        self.match_id = match_id
+        self.seats = seats
+        self.seed = seed
+        self.move_timeout = move_timeout
+        self.match_timeout = match_timeout
+        self.record_dir = record_dir
+        self.moves = deque()
+        self.game = GwentGame(view_type="headless",
+                              player_controller=lambda state: ReplayController(state, 0, self.moves),
+                              opponent_controller=lambda state: ReplayController(state, 1, self.moves),
+                              seed=seed)
+        self.state = StateEncoder(self.game, keyframe_interval)
+        # Spectator connections, mapped to whether they missed a frame and need a keyframe
+        self.spectators: Dict[Connection, bool] = {}
+        self.finished = asyncio.get_running_loop().create_future()
+
+    def controller(self, side: int) -> ReplayController:
+        return self.game.player1 if side == 0 else self.game.player2
+
+    async def run(self) -> SessionResult:
+        game = self.game
+        try:
+            async with asyncio.timeout(self.match_timeout):
+                for side, seat in enumerate(self.seats):
+                    await self._send(side, {"type": "start", "match": self.match_id, "side": side,
+                                            "opponent": self.seats[1 - side].name, "seed": self.seed})
+                    await self._send_state(side, self.state.keyframe())
+                while game.running:
+                    side = 0 if game.is_player_turn else 1
+                    state = self.controller(side).state
+                    # Seats without cards or that passed are moved on by the game itself
+                    if state.hand_size() and not state.has_passed():
+                        self.moves.append(await self._request_move(side))
+                    logged, rounds = len(game.moves), len(game.round_scores)
+                    game.play_turn()
+                    await self._announce(logged, rounds)
+            result = self._result(game.get_match_log().winner, "finished")
+        except SeatLost as e:
+            result = self._result(1 - e.side, "forfeit")
+        except TimeoutError:
+            result = self._result(None, "timeout")
+
+        if self.record_dir is not None and result.reason == "finished":
+            game.get_match_log().save(os.path.join(self.record_dir, f"match-{self.match_id}.gwrp"))
+        message = {"type": "result", "winner": result.winner, "reason": result.reason,
+                   "round_scores": result.round_scores}
+        await asyncio.gather(*(self._send(side, message) for side in (0, 1)), return_exceptions=True)
+        encoded = Connection.encode_message(message)
+        for connection in self.spectators:
+            connection.try_send_frame(KIND_MESSAGE, encoded)
+        self.finished.set_result(result)
+        return result
+
+    def _result(self, winner: Optional[int], reason: str) -> SessionResult:
+        return SessionResult(self.match_id, self.seed, winner, reason,
+                             [tuple(scores) for scores in self.game.round_scores], len(self.game.moves))
+
+    async def _send(self, side: int, message: dict):
+        try:
+            await self.seats[side].connection.send(message)
+        except ConnectionClosed as e:
+            raise SeatLost(side, str(e)) from e
+
+    async def _send_state(self, side: int, payload: bytes):
+        try:
+            await self.seats[side].connection.send_frame(KIND_STATE, payload)
+        except ConnectionClosed as e:
+            raise SeatLost(side, str(e)) from e
+
+    def _publish_state(self) -> Optional[bytes]:
+        """Encode the delta of the last turn and pass it on to every spectator"""
+        payload = self.state.update()
+        if payload is None:
+            return None
+        for connection, behind in self.spectators.items():
+            # Spectators never hold up the match, one that fell behind gets a keyframe once it reads again
+            self.spectators[connection] = not connection.try_send_frame(
+                KIND_STATE, self.state.keyframe() if behind else payload)
+        return payload
+
+    def add_spectator(self, connection: Connection):
+        self.spectators[connection] = not connection.try_send_frame(KIND_STATE, self.state.keyframe())
+
+    def resync_spectator(self, connection: Connection):
+        if connection in self.spectators:
+            self.spectators[connection] = not connection.try_send_frame(KIND_STATE, self.state.keyframe())
+
+    def remove_spectator(self, connection: Connection):
+        self.spectators.pop(connection, None)
+
+    async def _announce(self, logged: int, rounds: int):
+        """Tell both seats about the moves, round ends and state change the last turn produced"""
+        game = self.game
+        frames = []
+        for (_, cards, row), move in zip(game.moves[logged:], game.match_log.moves[logged:]):
+            frames.append((KIND_MESSAGE, Connection.encode_message(
+                {"type": "moved", "side": move.side, "cards": list(cards), "row": row, "revived": move.revived})))
+        for player_score, enemy_score in game.round_scores[rounds:]:
+            frames.append((KIND_MESSAGE, Connection.encode_message(
+                {"type": "round", "scores": [player_score, enemy_score],
+                 "lives": [self.controller(0).get_lives(), self.controller(1).get_lives()]})))
+        state = self._publish_state()
+        if state is not None:
+            frames.append((KIND_STATE, state))
+        if not frames:
+            return
+        # One write per seat and turn, both seats get the same bytes
+        for side in (0, 1):
+            try:
+                await self.seats[side].connection.send_frames(frames)
+            except ConnectionClosed as e:
+                raise SeatLost(side, str(e)) from e
+
+    def state_message(self, side: int) -> dict:
+        """What only the seat to move may see, the board comes as state frames"""
+        return {
+            "type": "turn",
+            "hand": self.controller(side).state.get_hand(),
+            "revivable": self.revivable(side),
+            "version": self.state.version,
+            "timeout": self.move_timeout,
+        }
+
+    def revivable(self, side: int) -> List[str]:
+        """Graveyard cards a medic may bring back, in graveyard order"""
+        loader = self.game.card_loader
+        return [card_id for card_id in self.controller(side).state.get_graveyard()
+                if isinstance(loader.get_card_by_id(card_id), UnitCard)
+                and not isinstance(loader.get_card_by_id(card_id), HeroCard)]
+
+    async def _request_move(self, side: int) -> LoggedMove:
+        """Ask a seat for its move until it sends a legal one, passing for it on timeout"""
+        await self._send(side, self.state_message(side))
+        connection = self.seats[side].connection
+        try:
+            async with asyncio.timeout(self.move_timeout):
+                while True:
+                    try:
+                        message = await connection.receive()
+                    except ConnectionClosed as e:
+                        raise SeatLost(side, str(e)) from e
+                    if message.get("type") == "resync":
+                        await self._send_state(side, self.state.keyframe())
+                        continue
+                    move, error = self.parse_move(side, message)
+                    if move is not None:
+                        return move
+                    await self._send(side, {"type": "error", "message": error})
+        except TimeoutError:
+            await self._send(side, {"type": "error", "message": "move timed out, passing"})
+            return LoggedMove(side, None)
+
+    def parse_move(self, side: int, message: dict) -> Tuple[Optional[LoggedMove], Optional[str]]:
+        """Turn a move message into a LoggedMove, or explain why it is illegal"""
+        if message.get("type") != "move":
+            return None, f"expected a move, got {message.get('type')!r}"
+        card_id = message.get("card")
+        if card_id is None:
+            return LoggedMove(side, None), None
+        if card_id not in self.controller(side).state.get_hand():
+            return None, f"{card_id!r} is not in your hand"
+
+        card = self.game.card_loader.get_card_by_id(card_id)
+        row = message.get("row")
+        card_rows = [r.name for r in card.row] if getattr(card, "row", None) else ROWS
+        if row is None:
+            # Like AIController, units go to their first row and other cards to CLOSE
+            row = card_rows[0]
+        elif row not in card_rows:
+            return None, f"{card_id!r} cannot be played to {row!r}"
+
+        revived = None
+        if getattr(card, "ability", None) == Ability.MEDIC:
+            revived = message.get("revive")
+            if revived is not None and revived not in self.revivable(side):
+                return None, f"{revived!r} cannot be revived"
+        return LoggedMove(side, card_id, row, revived), None
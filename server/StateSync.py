@@ -0,0 +1,210 @@
+import struct
+from typing import Dict, List, Optional, Tuple
+
+from model.Card import Weather
+from model.GameState import ROWS
+
+FORMAT_VERSION = 1
+
+# format version, flags, state version, version the delta applies to
+_HEADER = struct.Struct("<BBII")
+_FIELD = struct.Struct("<BB")  # field, op
+_VALUE = struct.Struct("<H")
+
+_KEYFRAME = 1
+
+OP_SET = 0  # A number
+OP_REPLACE = 1  # A whole card list
+OP_APPEND = 2  # Cards added to the end of a list
+
+# Fields of one side, side 1's follow side 0's. Lists hold match card handles,
+# the rest are numbers.
+_SIDE_FIELDS = tuple(row.lower() for row in ROWS) + ("graveyard", "hand", "deck", "lives", "passed") + \
+    tuple(f"{row.lower()}_score" for row in ROWS)
+FIELD_NAMES = tuple(f"{side}.{name}" for side in ("side0", "side1") for name in _SIDE_FIELDS) + \
+    ("weather", "to_move")
+_LIST_FIELDS = frozenset(side * len(_SIDE_FIELDS) + i for side in (0, 1) for i in range(len(ROWS) + 1))
+WEATHER_FIELD = FIELD_NAMES.index("weather")
+_FIELD_IDS = range(len(FIELD_NAMES))
+
+class StateEncoder:
+    """Versioned binary snapshots of what every watcher of a match may see.
+
+    Hands are only counted, so one encoding serves both seats and all
+    spectators. Cards are one-byte handles into the match's card table,
+    which only keyframes carry: every card in play comes from the two
+    dealt decks. A delta holds the fields that changed since the previous
+    version, lists that only grew hold just their new cards, so encoding a
+    move costs what the move changed. Every keyframe_interval versions the
+    update is a keyframe instead, which resynchronises clients that
+    dropped a frame.
+    """
+    def __init__(self, game, keyframe_interval: int = 32):
+        self.game = game
+        self.keyframe_interval = keyframe_interval
+        loader = game.card_loader
+        self.cards: List[str] = []
+        self._local: Dict[str, int] = {}
+        for deck in game.match_log.decks:
+            for card_id in deck:
+                self._add_card(card_id)
+        self._global_to_local = {loader.get_card_index(card_id): handle for card_id, handle in self._local.items()}
+        # Per row and graveyard: the cards seen last time and their handles
+        self._zones: Dict[Tuple[bool, str], Tuple[list, Tuple[int, ...]]] = {}
+        self.version = 0
+        self.fields = self.capture()
+        self._keyframe: Optional[Tuple[int, bytes]] = None
+
+    def _add_card(self, card_id: str) -> int:
+        handle = self._local.get(card_id)
+        if handle is None:
+            # The keyframe sends the card count in one byte
+            if len(self.cards) >= 0xFF:
+                raise ValueError("a match uses more than 255 distinct cards")
+            handle = self._local[card_id] = len(self.cards)
+            self.cards.append(card_id)
+        return handle
+
+    def _handle(self, card) -> int:
+        """Handle of a card in play, or of a card handle in a graveyard"""
+        if isinstance(card, int):
+            handle = self._global_to_local.get(card)
+            return handle if handle is not None else \
+                self._add_card(self.game.card_loader.get_card_id_by_index(card))
+        handle = self._local.get(card.id)
+        return handle if handle is not None else self._add_card(card.id)
+
+    def _zone_handles(self, key, cards: list) -> Tuple[int, ...]:
+        """Handles of a row or graveyard, only mapping cards added since the last capture"""
+        seen = self._zones.get(key)
+        if seen is not None:
+            old_cards, handles = seen
+            count = len(old_cards)
+            # Rows and graveyards mostly stay the same or grow at the end, comparing card objects is done in C
+            if len(cards) == count and cards == old_cards:
+                return handles
+            if len(cards) > count and cards[:count] == old_cards:
+                handles += tuple(self._handle(card) for card in cards[count:])
+                self._zones[key] = list(cards), handles
+                return handles
+        handles = tuple(self._handle(card) for card in cards)
+        self._zones[key] = list(cards), handles
+        return handles
+
+    def capture(self) -> list:
+        """Read the current fields off the board and player states"""
+        game = self.game
+        board = game.board
+        zone_handles = self._zone_handles
+        fields = []
+        for is_player, controller in ((True, game.player1), (False, game.player2)):
+            rows = board.player if is_player else board.enemy
+            state = controller.state
+            deck = state.deck
+            fields += [zone_handles((is_player, row), rows[row]) for row in ROWS]
+            fields += (zone_handles((is_player, "graveyard"), deck.graveyard),
+                       len(deck.hand), len(deck.deck), state.lives, int(state.passed))
+            fields += [board.get_row_value(is_player, row) for row in ROWS]
+        weather = 0
+        for effect in board.weather:
+            weather |= 1 << effect.value
+        fields.append(weather)
+        fields.append(0 if game.is_player_turn else 1)
+        return fields
+
+    def update(self) -> Optional[bytes]:
+        """Advance to the current state and encode it, None when nothing visible changed"""
+        known_cards = len(self.cards)
+        fields = self.capture()
+        changes = []
+        for field, old, new in zip(_FIELD_IDS, self.fields, fields):
+            if old == new:
+                continue
+            if field not in _LIST_FIELDS:
+                changes.append(_FIELD.pack(field, OP_SET) + _VALUE.pack(new))
+            elif len(new) > len(old) and new[:len(old)] == old:
+                added = new[len(old):]
+                changes.append(_FIELD.pack(field, OP_APPEND) + bytes((len(added),)) + bytes(added))
+            else:
+                changes.append(_FIELD.pack(field, OP_REPLACE) + bytes((len(new),)) + bytes(new))
+        if not changes:
+            return None
+
+        base = self.version
+        self.version += 1
+        self.fields = fields
+        # New cards are only announced in keyframes
+        if self.version % self.keyframe_interval == 0 or len(self.cards) != known_cards:
+            return self.keyframe()
+        return _HEADER.pack(FORMAT_VERSION, 0, self.version, base) + b"".join(changes)
+
+    def keyframe(self) -> bytes:
+        """The full current state, e.g. for a client that just connected or lost track"""
+        if self._keyframe is not None and self._keyframe[0] == self.version:
+            return self._keyframe[1]
+        parts = [_HEADER.pack(FORMAT_VERSION, _KEYFRAME, self.version, self.version), bytes((len(self.cards),))]
+        for card_id in self.cards:
+            encoded = card_id.encode()
+            parts.append(bytes((len(encoded),)) + encoded)
+        for field, value in enumerate(self.fields):
+            if field in _LIST_FIELDS:
+                parts.append(_FIELD.pack(field, OP_REPLACE) + bytes((len(value),)) + bytes(value))
+            else:
+                parts.append(_FIELD.pack(field, OP_SET) + _VALUE.pack(value))
+        payload = b"".join(parts)
+        self._keyframe = self.version, payload
+        return payload
+
+class StateDecoder:
+    """Client side of StateEncoder, rebuilding the fields from keyframes and deltas"""
+    def __init__(self):
+        self.version: Optional[int] = None
+        self.cards: List[str] = []
+        self.fields: list = [() if field in _LIST_FIELDS else 0 for field in range(len(FIELD_NAMES))]
+
+    def apply(self, payload: bytes) -> bool:
+        """Apply a keyframe or delta, False if a delta does not follow the held version and a keyframe is needed"""
+        try:
+            format_version, flags, version, base = _HEADER.unpack_from(payload)
+            if format_version != FORMAT_VERSION:
+                raise ValueError(f"unsupported state format {format_version}")
+            offset = _HEADER.size
+            if flags & _KEYFRAME:
+                cards = []
+                for _ in range(payload[offset]):
+                    length = payload[offset + 1]
+                    cards.append(payload[offset + 2:offset + 2 + length].decode())
+                    offset += 1 + length
+                offset += 1
+                self.cards = cards
+            elif base != self.version:
+                return False
+
+            fields = self.fields
+            while offset < len(payload):
+                field, op = _FIELD.unpack_from(payload, offset)
+                offset += _FIELD.size
+                if op == OP_SET:
+                    (fields[field],) = _VALUE.unpack_from(payload, offset)
+                    offset += _VALUE.size
+                    continue
+                count = payload[offset]
+                cards = tuple(payload[offset + 1:offset + 1 + count])
+                offset += 1 + count
+                fields[field] = fields[field] + cards if op == OP_APPEND else cards
+        except (struct.error, IndexError, UnicodeDecodeError) as e:
+            raise ValueError(f"corrupt state frame: {e}") from e
+        self.version = version
+        return True
+
+    def snapshot(self) -> dict:
+        """The fields by name, with card IDs and weather names"""
+        cards = self.cards
+        state = {}
+        for field, (name, value) in enumerate(zip(FIELD_NAMES, self.fields)):
+            if field in _LIST_FIELDS:
+                value = [cards[card] for card in value]
+            elif field == WEATHER_FIELD:
+                value = [weather.name for weather in Weather if value & 1 << weather.value]
+            state[name] = value
+        return state
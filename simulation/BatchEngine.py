@@ -0,0 +1,442 @@
+import argparse
+import contextlib
+import io
+import time
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from controller.Player import INITIAL_LIVES
+from model.Card import Ability, Special, SpecialCard, UnitCard, Weather, WeatherCard
+from model.GameState import (CardTable, get_card_table, ROWS, WEATHER_ROW_MASKS,
+                             FLAG_UNIT, FLAG_HERO, FLAG_SPY, FLAG_MUSTER, FLAG_MEDIC)
+from singleton.CardLoader import CardLoader
+
+# Where a dealt card is, seen from the side that owns it. Spies lie on the
+# opponent's rows and end up in the opponent's graveyard.
+DECK = 0
+HAND = 1
+OWN_ROW = 2  # + row index
+OTHER_ROW = 5  # + row index
+OWN_GRAVEYARD = 8
+OTHER_GRAVEYARD = 9
+UNUSED = 10  # Padding behind decks shorter than the longest
+
+MAX_ROUNDS = 2 * INITIAL_LIVES - 1
+HAND_SIZE = 10
+POLICIES = ("ai", "random")
+
+_ORDER_STRIDE = 1 << 20  # Graveyard order is (burial, row) first and placement second
+_NEVER = np.int64(np.iinfo(np.int64).max)  # A typed scalar, so np.where() promotes int32 orders to int64
+_CLEAR = Weather.CLEAR.value
+_OWNERS = np.arange(2)[None, :, None]
+_ON_ROW = np.asarray([OWN_ROW <= location < OWN_GRAVEYARD for location in range(UNUSED + 1)])
+_LOCATION_ROW_BITS = np.asarray([1 << (location - OWN_ROW) % len(ROWS) if _ON_ROW[location] else 0
+                                 for location in range(UNUSED + 1)], dtype=np.int8)
+
+class BatchEngine:
+    """Thousands of matches at once as NumPy arrays, one turn of every match per step.
+
+    Every dealt card keeps its deck position, so a match is a (2, deck)
+    array of card handles and one of locations: deck, hand, a row of
+    either side or either graveyard. Hand order is deck order, draws take
+    the first cards still in the deck, and placement stamps keep the order
+    of rows and graveyards that medics and scorch look at.
+
+    The "ai" policy plays like AIController on the NullView, so a batch
+    dealt from seeds ends exactly like the live matches, see verify().
+    "random" plays a random hand card to a random row of it and passes once
+    the opponent passed and it is ahead, for cheap Monte Carlo playouts.
+
+    The live game puts weather and special cards on a row as dead cards.
+    card_effects applies them instead, with the rules of Board.play_weather()
+    and Board.destroy_strongest_card() for scorch cards and scorch units.
+    """
+    def __init__(self, cards: np.ndarray, policy: str = "ai", card_effects: bool = False,
+                 seed: Optional[int] = None, table: Optional[CardTable] = None):
+        if policy not in POLICIES:
+            raise ValueError(f"unknown policy {policy!r}, choose from {', '.join(POLICIES)}")
+        self.policy = policy
+        self.card_effects = card_effects
+        self.rng = np.random.default_rng(seed)
+        self.table = table or get_card_table()
+        self._build_card_arrays()
+
+        # cards holds handles in dealt order, top card first, -1 behind short decks
+        cards = np.asarray(cards)
+        games, _, width = cards.shape
+        self.cards = np.where(cards >= 0, cards, 0).astype(np.int16)
+        self.location = np.where(cards >= 0, DECK, UNUSED).astype(np.int8)
+        self.location[:, :, :HAND_SIZE] = np.where(cards[:, :, :HAND_SIZE] >= 0, HAND, UNUSED)
+        self.placed = np.zeros((games, 2, width), dtype=np.int32)
+        self.grave_order = np.zeros((games, 2, width), dtype=np.int64)
+        self.clock = np.zeros(games, dtype=np.int32)  # Cards placed so far
+        self.burials = np.zeros(games, dtype=np.int64)  # Graveyard order of the next burial
+
+        self.weather = np.zeros(games, dtype=np.int32)
+        self.passed = np.zeros((games, 2), dtype=bool)
+        self.lives = np.full((games, 2), INITIAL_LIVES, dtype=np.int8)
+        self.to_move = np.zeros(games, dtype=np.intp)
+        self.done = np.zeros(games, dtype=bool)
+        self.rounds = np.zeros(games, dtype=np.intp)
+        self.round_scores = np.zeros((games, MAX_ROUNDS, 2), dtype=np.int32)
+        self.moves = np.zeros(games, dtype=np.int32)  # Cards played and passes chosen, like MatchResult.moves
+        self.steps = 0
+
+    @classmethod
+    def from_decks(cls, decks: Sequence[Tuple[Sequence[str], Sequence[str]]], **kwargs) -> 'BatchEngine':
+        """One match per (player, opponent) pair of card ID lists, dealt in the given order"""
+        index = CardLoader.get_instance().get_card_index
+        width = max(len(deck) for pair in decks for deck in pair)
+        cards = np.full((len(decks), 2, width), -1, dtype=np.int32)
+        for game, pair in enumerate(decks):
+            for side, deck in enumerate(pair):
+                cards[game, side, :len(deck)] = [index(card_id) for card_id in deck]
+        return cls(cards, **kwargs)
+
+    @classmethod
+    def from_seeds(cls, seeds: Iterable[int], **kwargs) -> 'BatchEngine':
+        """The matches GwentGame deals for these seeds"""
+        from Gwent import GwentGame
+        return cls.from_decks([GwentGame(view_type="headless", seed=seed).match_log.decks for seed in seeds],
+                              **kwargs)
+
+    @classmethod
+    def shuffled(cls, player_deck: Sequence[str], opponent_deck: Sequence[str], games: int,
+                 seed: Optional[int] = None, **kwargs) -> 'BatchEngine':
+        """games matches between two decks, each dealt from its own shuffle"""
+        return cls.shuffled_pairs([(player_deck, opponent_deck)], games, seed, **kwargs)
+
+    @classmethod
+    def shuffled_pairs(cls, pairs: Sequence[Tuple[Sequence[str], Sequence[str]]], games: int,
+                       seed: Optional[int] = None, **kwargs) -> 'BatchEngine':
+        """games matches for every (player, opponent) pair of decks, in pair order, each from its own shuffle"""
+        rng = np.random.default_rng(seed)
+        index = CardLoader.get_instance().get_card_index
+        width = max(len(deck) for pair in pairs for deck in pair)
+        base = np.full((len(pairs), 2, width), -1, dtype=np.int32)
+        for pair, decks in enumerate(pairs):
+            for side, deck in enumerate(decks):
+                base[pair, side, :len(deck)] = [index(card_id) for card_id in deck]
+        base = np.repeat(base, games, axis=0)
+        # Sorting random keys shuffles every deck at once, padding sorts last
+        keys = rng.random(base.shape)
+        keys[base < 0] = 2.0
+        cards = np.take_along_axis(base, keys.argsort(axis=2), axis=2)
+        engine = cls(cards, **kwargs)
+        engine.rng = rng
+        return engine
+
+    def _build_card_arrays(self):
+        table = self.table
+        loader = table.card_loader
+        count = len(table.values)
+        flags = np.frombuffer(bytes(table.flags), dtype=np.uint8)
+        self._flags = flags
+        self._values = np.asarray(table.values, dtype=np.int32)
+        self._units = (flags & FLAG_UNIT).astype(bool)
+        self._heroes = (flags & FLAG_HERO).astype(bool)
+        self._revivable = self._units & ~self._heroes
+        # What a card adds to its row, in clear weather and under weather
+        self._strength = np.where(self._units, self._values, 0).astype(np.int16)
+        self._weathered_strength = np.where(self._revivable, 1, self._strength).astype(np.int16)
+        self._weather_rows = np.asarray(WEATHER_ROW_MASKS, dtype=np.int8)
+        self._first_row = np.asarray([rows[0] for rows in table.rows], dtype=np.int8)
+        self._row_counts = np.asarray([len(rows) for rows in table.rows], dtype=np.int8)
+        self._row_choices = np.asarray([(rows * len(ROWS))[:len(ROWS)] for rows in table.rows], dtype=np.int8)
+        names = {}
+        self._name_ids = np.asarray([names.setdefault(name, len(names)) for name in table.names], dtype=np.int32)
+        self._muster_members = np.zeros((count, count), dtype=bool)
+        for card, group in enumerate(table.muster_groups):
+            if group:
+                self._muster_members[card, list(group)] = True
+
+        self._weather = np.full(count, -1, dtype=np.int8)  # Weather value of weather cards
+        self._scorch = np.zeros(count, dtype=bool)
+        for card in range(count):
+            prototype = loader.get_card_by_id(table.card_id(card))
+            if isinstance(prototype, WeatherCard):
+                # Weather packs name the weather in weather_type
+                weather = prototype.type or Weather.__members__.get(getattr(prototype, "weather_type", None) or "")
+                if weather is not None:
+                    self._weather[card] = weather.value
+            elif isinstance(prototype, SpecialCard):
+                special = prototype.type or Special.__members__.get(getattr(prototype, "special_type", None) or "")
+                self._scorch[card] = special == Special.SCORCH
+            elif isinstance(prototype, UnitCard):
+                self._scorch[card] = prototype.ability == Ability.SCORCH
+
+    # Running the batch
+
+    def run(self, max_steps: int = 1000) -> 'BatchEngine':
+        """Step until every match is over"""
+        while self.step():
+            if self.steps >= max_steps:
+                raise RuntimeError(f"matches still running after {max_steps} steps")
+        return self
+
+    def step(self) -> int:
+        """Play one turn in every running match, like GwentGame.play_turn(), and return how many still run"""
+        active = np.flatnonzero(~self.done)
+        if not active.size:
+            return 0
+        self.steps += 1
+        side = self.to_move[active]
+        other = 1 - side
+        hand = self.location[active, side] == HAND
+        plays = hand.any(axis=1) & ~self.passed[active, side]
+        if self.policy == "random":
+            # Keep the remaining cards once the round is won, like the MCTS rollouts
+            deciding = np.flatnonzero(plays & self.passed[active, other])
+            if deciding.size:
+                scores = self.scores(active[deciding])
+                rows = np.arange(deciding.size)
+                ahead = deciding[scores[rows, side[deciding]] > scores[rows, other[deciding]]]
+                self.moves[active[ahead]] += 1
+                plays[ahead] = False
+        self.passed[active[~plays], side[~plays]] = True
+        if plays.any():
+            self._play(active[plays], side[plays], hand[plays])
+        self.to_move[active] = other
+
+        hands = (self.location[active] == HAND).any(axis=2)
+        round_over = self.passed[active].all(axis=1) | ~hands.any(axis=1)
+        if round_over.any():
+            self._end_round(active[round_over])
+        return int(np.count_nonzero(~self.done))
+
+    def _play(self, games: np.ndarray, side: np.ndarray, hand: np.ndarray):
+        count = games.size
+        other = 1 - side
+        if self.policy == "ai":
+            position = hand.argmax(axis=1)  # AIController plays the first card of its hand
+        else:
+            position = np.where(hand, self.rng.random(hand.shape), -1.0).argmax(axis=1)
+        card = self.cards[games, side, position]
+        flags = self._flags[card]
+        if self.policy == "ai":
+            row = self._first_row[card].astype(np.intp)
+        else:
+            choice = (self.rng.random(count) * self._row_counts[card]).astype(np.intp)
+            row = self._row_choices[card, choice].astype(np.intp)
+        self.moves[games] += 1
+
+        spy = (flags & FLAG_SPY).astype(bool)
+        muster = (flags & FLAG_MUSTER).astype(bool)
+        medic = (flags & FLAG_MEDIC).astype(bool)
+        revived = self._revive_targets(games[medic], side[medic]) if medic.any() else None
+        if self.policy == "ai":
+            # AIController sends a muster group or a medic with its revived card to CLOSE
+            grouped = muster.copy()
+            if revived is not None:
+                grouped[medic] = revived[0]
+            row[grouped] = 0
+
+        effect = np.zeros(count, dtype=bool)
+        if self.card_effects:
+            weather = self._weather[card]
+            effect = (weather >= 0) | (self._scorch[card] & ~self._units[card])
+            is_weather = weather >= 0
+            if is_weather.any():
+                affected, kind = games[is_weather], weather[is_weather].astype(np.int32)
+                self.weather[affected] = np.where(kind == _CLEAR, 0, self.weather[affected] | (1 << kind))
+
+        placed = ~effect
+        self._place(games[placed], side[placed], position[placed], np.where(spy, other, side)[placed], row[placed])
+        if effect.any():
+            # Played weather and scorch cards go straight to their owner's graveyard
+            self._bury(games[effect], side[effect], position[effect], side[effect],
+                       np.zeros(np.count_nonzero(effect), dtype=np.intp))
+            self.burials[games[effect]] += 1
+        if spy.any():
+            self._draw(games[spy], side[spy], 2)
+        if muster.any():
+            self._muster(games[muster], side[muster], card[muster], row[muster])
+        if revived is not None:
+            found, owner, target = revived
+            medics = np.flatnonzero(medic)[found]
+            target_spy = (self._flags[self.cards[games[medics], owner[found], target[found]]] & FLAG_SPY).astype(bool)
+            # Board.add_card_to_row() sends a revived spy to the other side
+            self._place(games[medics], owner[found], target[found],
+                        np.where(target_spy, other[medics], side[medics]), row[medics])
+        if self.card_effects:
+            scorch = self._scorch[card]
+            if scorch.any():
+                self._destroy_strongest(games[scorch])
+
+    def _place(self, games: np.ndarray, owner: np.ndarray, position: np.ndarray, row_side: np.ndarray,
+               row: np.ndarray):
+        """Put one card per match on a row, after everything placed before"""
+        self.location[games, owner, position] = np.where(row_side == owner, OWN_ROW, OTHER_ROW) + row
+        self.placed[games, owner, position] = self.clock[games]
+        self.clock[games] += 1
+
+    def _bury(self, games: np.ndarray, owner: np.ndarray, position: np.ndarray, grave_side: np.ndarray,
+              row: np.ndarray):
+        """Move one card per match into the graveyard of grave_side, behind earlier burials"""
+        self.location[games, owner, position] = np.where(grave_side == owner, OWN_GRAVEYARD, OTHER_GRAVEYARD)
+        self.grave_order[games, owner, position] = ((self.burials[games] + row) * _ORDER_STRIDE
+                                                    + self.placed[games, owner, position])
+
+    def _draw(self, games: np.ndarray, side: np.ndarray, count: int):
+        location = self.location[games, side]
+        deck = location == DECK
+        taken = deck & (np.cumsum(deck, axis=1) <= count)
+        self.location[games, side] = np.where(taken, HAND, location)
+
+    def _muster(self, games: np.ndarray, side: np.ndarray, card: np.ndarray, row: np.ndarray):
+        """Pull the group from hand, other names only, then every copy from the deck, top first"""
+        location = self.location[games, side]
+        cards = self.cards[games, side]
+        group = self._muster_members[card[:, None], cards]
+        from_hand = (location == HAND) & group & (self._name_ids[cards] != self._name_ids[card][:, None])
+        from_deck = (location == DECK) & group
+        pulled = from_hand | from_deck
+        if not pulled.any():
+            return
+        order = np.where(from_hand, np.cumsum(from_hand, axis=1),
+                         np.cumsum(from_deck, axis=1) + np.count_nonzero(from_hand, axis=1)[:, None]) - 1
+        self.location[games, side] = np.where(pulled, OWN_ROW + row[:, None], location)
+        self.placed[games, side] = np.where(pulled, self.clock[games][:, None] + order, self.placed[games, side])
+        self.clock[games] += np.count_nonzero(pulled, axis=1).astype(np.int32)
+
+    def _revive_targets(self, games: np.ndarray, side: np.ndarray):
+        """(found, owner, position) of the first revivable unit in each side's graveyard"""
+        owners = np.stack((side, 1 - side), axis=1)
+        location = self.location[games[:, None], owners]
+        graveyard = location == np.array([OWN_GRAVEYARD, OTHER_GRAVEYARD])[None, :, None]
+        revivable = graveyard & self._revivable[self.cards[games[:, None], owners]]
+        order = np.where(revivable, self.grave_order[games[:, None], owners], _NEVER).reshape(games.size, -1)
+        first = order.argmin(axis=1)
+        width = location.shape[2]
+        found = order[np.arange(games.size), first] != _NEVER
+        return found, owners[np.arange(games.size), first // width], first % width
+
+    def _destroy_strongest(self, games: np.ndarray):
+        """Board.destroy_strongest_card(): the first unit of the highest base value on every row goes"""
+        location = self.location[games]
+        cards = self.cards[games]
+        on_row = (location >= OWN_ROW) & (location < OWN_GRAVEYARD)
+        units = on_row & self._units[cards]
+        values = self._values[cards]
+        largest = np.where(units, values, 0).max(axis=(1, 2))
+        hit = units & (values == largest[:, None, None]) & (largest > 0)[:, None, None]
+        row_side = np.where(location < OTHER_ROW, _OWNERS, 1 - _OWNERS)
+        cells = row_side * len(ROWS) + (location - OWN_ROW) % len(ROWS)
+        order = np.where(hit, self.placed[games], _NEVER)
+        width = location.shape[2]
+        for cell in range(2 * len(ROWS)):
+            in_cell = np.where(cells == cell, order, _NEVER).reshape(games.size, -1)
+            first = in_cell.argmin(axis=1)
+            found = in_cell[np.arange(games.size), first] != _NEVER
+            if found.any():
+                first = first[found]
+                self._bury(games[found], first // width, first % width, np.full(first.size, cell // len(ROWS)),
+                           np.full(first.size, cell % len(ROWS)))
+        self.burials[games] += len(ROWS)
+
+    def _end_round(self, games: np.ndarray):
+        """Score the round like GwentGame.handle_round_end() and clear the board of matches that go on"""
+        scores = self.scores(games)
+        self.round_scores[games, self.rounds[games]] = scores
+        self.rounds[games] += 1
+        self.lives[games, 1] -= scores[:, 0] >= scores[:, 1]
+        self.lives[games, 0] -= scores[:, 1] >= scores[:, 0]
+        over = (self.lives[games] <= 0).any(axis=1)
+        self.done[games[over]] = True
+        games = games[~over]
+        if not games.size:
+            return
+
+        location = self.location[games]
+        on_row = (location >= OWN_ROW) & (location < OWN_GRAVEYARD)
+        own_row = location < OTHER_ROW
+        # Board.clear_board() buries every side's rows in row order into that side's graveyard
+        order = (self.burials[games][:, None, None] + (location - OWN_ROW) % len(ROWS)) * _ORDER_STRIDE + \
+            self.placed[games]
+        self.location[games] = np.where(on_row, np.where(own_row, OWN_GRAVEYARD, OTHER_GRAVEYARD), location)
+        self.grave_order[games] = np.where(on_row, order, self.grave_order[games])
+        self.burials[games] += len(ROWS)
+        self.weather[games] = 0
+        self.passed[games] = False
+
+    # Results
+
+    def scores(self, games: Optional[np.ndarray] = None) -> np.ndarray:
+        """Board totals of both sides as a (games, 2) array"""
+        if games is None:
+            games = np.arange(self.done.size)
+        location = self.location[games]
+        cards = self.cards[games]
+        # Bit of the location's row in the weather row mask, 0 off the rows
+        weathered = (self._weather_rows[self.weather[games]][:, None, None] & _LOCATION_ROW_BITS[location]) != 0
+        strength = np.where(weathered, self._weathered_strength[cards], self._strength[cards])
+        strength = np.where(_ON_ROW[location], strength, 0)
+        own = np.where(location < OTHER_ROW, strength, 0).sum(axis=2)
+        other = strength.sum(axis=2) - own
+        return own + other[:, ::-1]
+
+    def winners(self) -> np.ndarray:
+        """0 or 1 for the winning side of every match, -1 for a draw or a match still running"""
+        out = self.lives <= 0
+        return np.where(out[:, 1] & ~out[:, 0], 0, np.where(out[:, 0] & ~out[:, 1], 1, -1))
+
+    def win_rates(self) -> Tuple[float, float, float]:
+        """Share of player wins, opponent wins and draws"""
+        winners = self.winners()
+        games = max(1, winners.size)
+        return tuple(float(np.count_nonzero(winners == side) / games) for side in (0, 1, -1))
+
+def verify(seeds: Sequence[int]) -> List[str]:
+    """Play the seeds with AIControllers on the live objects and as one batch, describe every match that differs"""
+    from Gwent import GwentGame
+    from controller.Player import AIController
+    games = [GwentGame(view_type="headless", player_controller=AIController, seed=seed) for seed in seeds]
+    batch = BatchEngine.from_decks([game.match_log.decks for game in games]).run()
+    winners = batch.winners()
+    problems = []
+    for i, (seed, game) in enumerate(zip(seeds, games)):
+        result = game.run_headless()
+        winner = None if result.winner is None else (0 if result.winner == game.player1.state.name else 1)
+        batch_winner = None if winners[i] < 0 else int(winners[i])
+        round_scores = [tuple(int(score) for score in scores) for scores in batch.round_scores[i, :batch.rounds[i]]]
+        if winner != batch_winner:
+            problems.append(f"seed {seed}: winner is side {batch_winner}, live match has side {winner}")
+        if round_scores != [tuple(scores) for scores in result.round_scores]:
+            problems.append(f"seed {seed}: round scores {round_scores}, live match has {result.round_scores}")
+        if batch.moves[i] != len(result.moves):
+            problems.append(f"seed {seed}: {batch.moves[i]} moves, live match has {len(result.moves)}")
+    return problems
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Play many Gwent matches at once as NumPy arrays')
+    parser.add_argument('-n', '--games', type=int, default=10000,
+                       help='Matches in the batch (default: 10000)')
+    parser.add_argument('--seed', type=int, default=0,
+                       help='Seed of the first match, later matches use the following seeds')
+    parser.add_argument('--policy', choices=POLICIES, default='ai',
+                       help='ai plays like AIController, random plays random cards (default: ai)')
+    parser.add_argument('--card-effects', action='store_true',
+                       help='Apply weather and scorch cards instead of placing them as dead cards')
+    parser.add_argument('--verify', action='store_true',
+                       help='Also play the seeds on the live objects and report matches that differ')
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        CardLoader.get_instance()
+    seeds = range(args.seed, args.seed + args.games)
+    start = time.perf_counter()
+    engine = BatchEngine.from_seeds(seeds, policy=args.policy, card_effects=args.card_effects, seed=args.seed)
+    dealt = time.perf_counter()
+    engine.run()
+    elapsed = time.perf_counter() - dealt
+    player, opponent, draws = engine.win_rates()
+    print(f"Dealt {args.games} matches in {dealt - start:.2f}s, played them in {elapsed:.2f}s "
+          f"({args.games / elapsed:.0f} games/sec, {engine.steps} steps)")
+    print(f"Player win rate: {player:.1%}, opponent win rate: {opponent:.1%}, draw rate: {draws:.1%}")
+    if args.verify:
+        if args.policy != 'ai' or args.card_effects:
+            parser.error("--verify needs --policy ai without --card-effects, like the live matches")
+        problems = verify(seeds)
+        print("\n".join(problems) if problems else f"All {args.games} matches end like the live matches")
+        raise SystemExit(1 if problems else 0)
@@ -0,0 +1,369 @@
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from Gwent import GwentGame
+from model.DeckLibrary import DeckLibrary, DeckEntry, DEFAULT_DECK_FILE
+from simulation.BatchEngine import BatchEngine, POLICIES
+from singleton.CardLoader import CardLoader
+
+Deck = Tuple[str, ...]  # Card IDs in sorted order, so equal decks compare equal
+
+def deck_fingerprint(deck: Iterable[str]) -> str:
+    """Key of a deck list that ignores card order"""
+    return hashlib.sha1("\n".join(sorted(deck)).encode()).hexdigest()[:16]
+
+def score_deck(deck: Sequence[str], opponents: Sequence[Sequence[str]], games: int, seed: int,
+               policy: str = "ai") -> float:
+    """Share of the points deck takes from games matches against every opponent in either seat.
+
+    A win is worth 1 and a draw 0.5. The shuffles only depend on seed and
+    the deck sizes, so decks scored with one seed meet the same deals.
+    """
+    pairs = [(deck, opponent) for opponent in opponents] + [(opponent, deck) for opponent in opponents]
+    engine = BatchEngine.shuffled_pairs(pairs, games, seed, policy=policy).run()
+    as_player, as_opponent = engine.winners().reshape(2, -1)
+    points = (as_player == 0).sum() + (as_opponent == 1).sum() + 0.5 * ((as_player == -1).sum() + (as_opponent == -1).sum())
+    return float(points / (2 * as_player.size))
+
+_worker_settings = None
+
+def _init_worker(opponents, games: int, policy: str):
+    """Load the card catalog once per worker process"""
+    global _worker_settings
+    _worker_settings = (opponents, games, policy)
+    with contextlib.redirect_stdout(io.StringIO()):
+        CardLoader.get_instance()
+
+def _score_task(task: Tuple[Deck, int]) -> float:
+    deck, seed = task
+    opponents, games, policy = _worker_settings
+    return score_deck(deck, opponents, games, seed, policy)
+
+@dataclass(frozen=True)
+class DeckConstraints:
+    """What a candidate deck is made of, by default what GwentGame.create_basic_deck() builds.
+
+    Special and weather slots shrink to what the loaded catalog offers, like
+    create_basic_deck() leaves them out when a pool is too small.
+    """
+    units: int = 22  # Unit cards, spies included
+    min_spies: int = 0
+    max_spies: int = 2
+    specials: int = 3
+    weather: int = 2
+
+class DeckOptimizer:
+    """Searches the catalog for strong decks with a genetic algorithm.
+
+    Every candidate plays the opponent decks in both seats on the
+    BatchEngine, and all candidates of a search meet the same shuffles, so
+    their scores differ by the decks rather than by luck. Scores are cached
+    per deck fingerprint and the decks of a generation are scored in
+    parallel worker processes. The best decks are scored again on fresh
+    shuffles before they are ranked, so a deck that got lucky with the
+    search shuffles does not come out on top.
+
+    Card copies never exceed what the catalog allows, as in the deck pools
+    of GwentGame.
+    """
+    def __init__(self, constraints: DeckConstraints = DeckConstraints(),
+                 opponents: Optional[Sequence[Sequence[str]]] = None, opponent_count: int = 8, games: int = 100,
+                 workers: Optional[int] = None, seed: int = 0, policy: str = "ai"):
+        self.constraints = constraints
+        self.games = games
+        self.workers = workers or os.cpu_count() or 1
+        self.seed = seed
+        self.policy = policy
+        self.rng = random.Random(seed)
+
+        # Build the catalog cache in the parent so workers never parse TOML
+        with contextlib.redirect_stdout(io.StringIO()):
+            CardLoader.get_instance()
+        dealer = GwentGame(view_type="headless", seed=seed)
+        units, spies, specials, weather = dealer.get_deck_pools()
+        if opponents is None:
+            opponents = [dealer.create_basic_deck() for _ in range(opponent_count)]
+        self.opponents = [tuple(opponent) for opponent in opponents]
+
+        self._pools = {"unit": units, "spy": spies, "special": specials, "weather": weather}
+        self._copies = Counter(units + spies + specials + weather)
+        self._category = {card_id: category for category, pool in self._pools.items() for card_id in pool}
+        self._max_spies = min(constraints.max_spies, len(spies), constraints.units)
+        self._min_spies = min(constraints.min_spies, self._max_spies)
+        if constraints.units - self._min_spies > len(units):
+            raise ValueError(f"the catalog holds {len(units)} unit cards, a deck needs "
+                             f"{constraints.units - self._min_spies}")
+        self._slots = {"special": min(constraints.specials, len(specials)),
+                       "weather": min(constraints.weather, len(weather))}
+
+        self.cache: Dict[Tuple[int, str], float] = {}  # (shuffle seed, deck fingerprint) -> score
+        self.played = 0  # Decks actually scored, cache hits excluded
+        self._pool = None
+
+    # Building decks
+
+    def random_deck(self) -> Deck:
+        rng = self.rng
+        pools = self._pools
+        spies = rng.randint(self._min_spies, self._max_spies)
+        cards = rng.sample(pools["spy"], spies) + rng.sample(pools["unit"], self.constraints.units - spies)
+        for category, slots in self._slots.items():
+            cards += rng.sample(pools[category], slots)
+        return tuple(sorted(cards))
+
+    def _replace(self, cards: List[str], position: int):
+        """Swap the card at position for another card that fits its slot"""
+        category = self._category[cards[position]]
+        categories = [category]
+        if category in ("unit", "spy"):
+            spies = sum(1 for card_id in cards if self._category[card_id] == "spy")
+            if category == "unit" and spies < self._max_spies:
+                categories.append("spy")
+            elif category == "spy" and spies > self._min_spies:
+                categories.append("unit")
+        counts = Counter(cards)
+        # Sorted, so a seed gives the same search in every process
+        options = sorted({card_id for category in categories for card_id in self._pools[category]
+                          if counts[card_id] < self._copies[card_id] and card_id != cards[position]})
+        if options:
+            cards[position] = self.rng.choice(options)
+
+    def mutate(self, deck: Deck, swaps: int = 2) -> Deck:
+        cards = list(deck)
+        for _ in range(swaps):
+            self._replace(cards, self.rng.randrange(len(cards)))
+        return tuple(sorted(cards))
+
+    def crossover(self, first: Deck, second: Deck) -> Deck:
+        """A deck of cards drawn from both parents, slot group by slot group"""
+        rng = self.rng
+        groups = {"unit": ("unit", "spy"), "special": ("special",), "weather": ("weather",)}
+        sizes = {"unit": self.constraints.units, **self._slots}
+        cards = []
+        for group, categories in groups.items():
+            genes = [card_id for card_id in first + second if self._category[card_id] in categories]
+            rng.shuffle(genes)
+            taken = Counter()
+            for card_id in genes:
+                if sum(taken.values()) == sizes[group]:
+                    break
+                if taken[card_id] < self._copies[card_id]:
+                    taken[card_id] += 1
+            cards += taken.elements()
+        cards.sort()
+        # Both parents keep to the spy limits, a mix of them may not
+        while True:
+            spies = [i for i, card_id in enumerate(cards) if self._category[card_id] == "spy"]
+            if len(spies) > self._max_spies:
+                self._replace(cards, rng.choice(spies))
+            elif len(spies) < self._min_spies:
+                self._replace(cards, rng.choice([i for i, card_id in enumerate(cards)
+                                                 if self._category[card_id] == "unit"]))
+            else:
+                return tuple(sorted(cards))
+
+    # Scoring
+
+    def evaluate(self, decks: Sequence[Deck], seed: Optional[int] = None) -> List[float]:
+        """Scores of decks on the shuffles of seed, playing only the decks not cached yet"""
+        seed = self.seed if seed is None else seed
+        keys = [(seed, deck_fingerprint(deck)) for deck in decks]
+        missing = {}
+        for key, deck in zip(keys, decks):
+            if key not in self.cache:
+                missing.setdefault(key, deck)
+        if missing:
+            tasks = [(deck, seed) for deck in missing.values()]
+            if self._pool is not None:
+                scores = self._pool.map(_score_task, tasks, chunksize=1)
+            else:
+                _init_worker(self.opponents, self.games, self.policy)
+                scores = map(_score_task, tasks)
+            for key, score in zip(missing, scores):
+                self.cache[key] = score
+            self.played += len(missing)
+        return [self.cache[key] for key in keys]
+
+    def _tournament(self, ranked: List[Tuple[float, Deck]], size: int = 3) -> Deck:
+        return max(self.rng.sample(ranked, min(size, len(ranked))), key=lambda item: item[0])[1]
+
+    def optimize(self, generations: int = 20, population: int = 32, elite: int = 4, mutations: int = 2,
+                 finalists: int = 8, progress: Optional[Callable[[int, List[Tuple[float, Deck]]], None]] = None
+                 ) -> List[Tuple[float, float, Deck]]:
+        """Evolve decks and return (validation score, search score, deck) of the finalists, best first"""
+        pool = None
+        if self.workers > 1:
+            pool = multiprocessing.Pool(self.workers, initializer=_init_worker,
+                                        initargs=(self.opponents, self.games, self.policy))
+        self._pool = pool
+        try:
+            decks = [self.random_deck() for _ in range(population)]
+            best: Dict[Deck, float] = {}
+            for generation in range(generations):
+                ranked = sorted(zip(self.evaluate(decks), decks), key=lambda item: item[0], reverse=True)
+                best.update((deck, score) for score, deck in ranked)
+                if progress:
+                    progress(generation, ranked)
+                if generation == generations - 1:
+                    break
+                decks = [deck for _, deck in ranked[:elite]]
+                seen = set(decks)
+                attempts = 0
+                while len(decks) < population:
+                    child = self.mutate(self.crossover(self._tournament(ranked), self._tournament(ranked)), mutations)
+                    attempts += 1
+                    # Repeats would only hit the cache, unless the search keeps producing them
+                    if child not in seen or attempts > 10 * population:
+                        seen.add(child)
+                        decks.append(child)
+
+            top = sorted(best.items(), key=lambda item: item[1], reverse=True)[:finalists]
+            finalist_decks = [deck for deck, _ in top]
+            validation = self.evaluate(finalist_decks, self.seed + 1)
+        finally:
+            self._pool = None
+            if pool is not None:
+                pool.close()
+                pool.join()
+        return sorted(((checked, score, deck) for checked, (deck, score) in zip(validation, top)),
+                      key=lambda item: (item[0], item[1]), reverse=True)
+
+    # Cache and results on disk
+
+    def settings(self) -> dict:
+        """Everything a score depends on apart from the deck and the shuffle seed"""
+        return {"games": self.games, "policy": self.policy,
+                "opponents": [deck_fingerprint(opponent) for opponent in self.opponents],
+                "catalog": deck_fingerprint(CardLoader.get_instance().get_all_card_ids())}
+
+    def load_cache(self, path: str) -> int:
+        """Reuse scores saved by save_cache() under the same settings, returns how many were loaded"""
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return 0
+        if data.get("settings") != self.settings():
+            return 0
+        for key, score in data["scores"].items():
+            seed, fingerprint = key.split(":", 1)
+            self.cache[int(seed), fingerprint] = score
+        return len(data["scores"])
+
+    def save_cache(self, path: str):
+        data = {"settings": self.settings(),
+                "scores": {f"{seed}:{fingerprint}": score for (seed, fingerprint), score in self.cache.items()}}
+        with open(path, "w") as f:
+            json.dump(data, f)
+
+    def save_decks(self, ranked: Sequence[Tuple[float, float, Deck]], path: str = DEFAULT_DECK_FILE,
+                   prefix: str = "optimized") -> List[str]:
+        """Save the ranked decks to a deck file as prefix-1, prefix-2, ... and return the names.
+
+        Decks an earlier ranking saved under the same prefix are dropped, other
+        decks in the file are kept.
+        """
+        library = DeckLibrary.load(path, missing_ok=True)
+        library.remove_ranked(prefix)
+        settings = {**self.settings(), "seed": self.seed, "constraints": asdict(self.constraints)}
+        names = []
+        for rank, (checked, score, deck) in enumerate(ranked, 1):
+            name = f"{prefix}-{rank}"
+            library.add(DeckEntry(name, list(deck), score, checked, deck_fingerprint(deck), settings))
+            names.append(name)
+        library.save(path)
+        return names
+
+if __name__ == "__main__":
+    # Run as a module from the repository root, the script's own directory cannot import Gwent
+    parser = argparse.ArgumentParser(prog='python -m simulation.DeckOptimizer',
+                                     description='Search for strong Gwent decks with simulated matches')
+    parser.add_argument('-g', '--generations', type=int, default=20,
+                       help='Generations to evolve (default: 20)')
+    parser.add_argument('-p', '--population', type=int, default=32,
+                       help='Decks per generation (default: 32)')
+    parser.add_argument('--elite', type=int, default=4,
+                       help='Best decks carried into the next generation unchanged (default: 4)')
+    parser.add_argument('--mutations', type=int, default=2,
+                       help='Cards swapped in every new deck (default: 2)')
+    parser.add_argument('--games', type=int, default=100,
+                       help='Matches per opponent and seat when scoring a deck (default: 100)')
+    parser.add_argument('--opponents', type=int, default=8,
+                       help='Basic decks every candidate plays against (default: 8)')
+    parser.add_argument('--opponent-decks', nargs='+', metavar='NAME', default=None,
+                       help='Play against these decks of --deck-file instead of basic decks')
+    parser.add_argument('--deck-file', default=DEFAULT_DECK_FILE,
+                       help=f'Deck file holding --opponent-decks (default: {DEFAULT_DECK_FILE})')
+    parser.add_argument('--policy', choices=POLICIES, default='ai',
+                       help='How both sides play, ai like AIController (default: ai)')
+    parser.add_argument('--units', type=int, default=22,
+                       help='Unit cards per deck, spies included (default: 22)')
+    parser.add_argument('--min-spies', type=int, default=0,
+                       help='Fewest spies per deck (default: 0)')
+    parser.add_argument('--max-spies', type=int, default=2,
+                       help='Most spies per deck (default: 2)')
+    parser.add_argument('--specials', type=int, default=3,
+                       help='Special cards per deck, if the catalog has them (default: 3)')
+    parser.add_argument('--weather', type=int, default=2,
+                       help='Weather cards per deck (default: 2)')
+    parser.add_argument('--finalists', type=int, default=8,
+                       help='Best decks scored again on fresh shuffles and saved (default: 8)')
+    parser.add_argument('--name', default='optimized',
+                       help='Saved decks are named NAME-1, NAME-2, ... (default: optimized)')
+    parser.add_argument('-o', '--output', default=DEFAULT_DECK_FILE,
+                       help=f'Deck file to add the ranked decks to (default: {DEFAULT_DECK_FILE})')
+    parser.add_argument('--cache', metavar='FILE', default=None,
+                       help='Keep deck scores in FILE between runs')
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                       help='Worker processes (default: all cores)')
+    parser.add_argument('--seed', type=int, default=0,
+                       help='Seed of the search, the opponent decks and the shuffles')
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        CardLoader.get_instance()
+    opponents = None
+    if args.opponent_decks:
+        try:
+            library = DeckLibrary.load(args.deck_file)
+            opponents = [library.get(name) for name in args.opponent_decks]
+        except KeyError as e:
+            parser.error(e.args[0])
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+    constraints = DeckConstraints(args.units, args.min_spies, args.max_spies, args.specials, args.weather)
+    try:
+        optimizer = DeckOptimizer(constraints, opponents, args.opponents, args.games, args.workers, args.seed,
+                                  args.policy)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.cache:
+        print(f"Loaded {optimizer.load_cache(args.cache)} cached scores from {args.cache}")
+
+    start = time.perf_counter()
+
+    def print_progress(generation: int, ranked: List[Tuple[float, Deck]]):
+        mean = sum(score for score, _ in ranked) / len(ranked)
+        print(f"Generation {generation + 1}/{args.generations}: best {ranked[0][0]:.3f}, mean {mean:.3f}, "
+              f"{optimizer.played} decks played in {time.perf_counter() - start:.1f}s", flush=True)
+
+    ranked = optimizer.optimize(args.generations, args.population, args.elite, args.mutations, args.finalists,
+                                print_progress)
+    if args.cache:
+        optimizer.save_cache(args.cache)
+    names = optimizer.save_decks(ranked, args.output, args.name)
+    print(f"Scored {optimizer.played} decks in {time.perf_counter() - start:.1f}s "
+          f"on {optimizer.workers} worker{'s' if optimizer.workers != 1 else ''}")
+    for name, (checked, score, deck) in zip(names, ranked):
+        print(f"{name}: {checked:.3f} on fresh shuffles, {score:.3f} in the search, {len(deck)} cards")
+    print(f"Decks written to {args.output}, play one with: python Gwent.py --deck {names[0]}")
@@ -0,0 +1,125 @@
+import argparse
+import contextlib
+import io
+import time
+from collections import deque
+from typing import Collection, List, Optional
+
+from Gwent import GwentGame, MatchResult
+from controller.ReplayController import ReplayController, ReplayExhausted
+from model.MatchLog import MatchLog
+from singleton.CardLoader import CardLoader
+from views.ViewFactory import ViewFactory
+
+class ReplayEngine:
+    """Re-executes a MatchLog headlessly, optionally showing chosen frames in a view.
+
+    Frame n is the position after the first n logged moves, frame 0 the
+    dealt hands. Moves between the shown frames run at full speed without
+    drawing anything.
+    """
+    def __init__(self, log: MatchLog):
+        self.log = log
+        self.game: Optional[GwentGame] = None
+        self.moves_played = 0
+
+    def create_game(self, log_lines: int = 0) -> GwentGame:
+        """Set up the logged match with both seats replaying their moves"""
+        moves = deque(self.log.moves)
+        game = GwentGame(view_type="headless", view_config={'log_lines': log_lines},
+                         player_controller=lambda state: ReplayController(state, 0, moves),
+                         opponent_controller=lambda state: ReplayController(state, 1, moves),
+                         seed=self.log.seed, decks=self.log.decks, shuffle_decks=False)
+        self.game = game
+        self.moves_played = 0
+        return game
+
+    def run(self, frames: Collection[int] = (), view_type: str = "curses", view_config: Optional[dict] = None,
+            frame_delay: float = 2.0) -> MatchResult:
+        """Replay the whole log, showing each frame in frames for frame_delay seconds"""
+        frames = set(frames)
+        game = self.create_game(log_lines=1000 if frames else 0)
+        moves = game.player1.moves
+        view = None
+        try:
+            if frames:
+                view = ViewFactory.create_view(view_type, view_config)
+                view.board = game.board
+                view.setup_players(game.player1, game.player2)
+                view.init_display()
+            if 0 in frames:
+                self._show_frame(view, frame_delay)
+            while game.running:
+                try:
+                    game.play_turn()
+                except ReplayExhausted:
+                    break
+                played = len(self.log.moves) - len(moves)
+                if played != self.moves_played:
+                    self.moves_played = played
+                    if played in frames:
+                        self._show_frame(view, frame_delay)
+        finally:
+            if view is not None:
+                view.cleanup_display()
+        return game.get_result()
+
+    def _show_frame(self, view, frame_delay: float):
+        game = self.game
+        # The views read the log attribute directly, like the controllers append to it
+        view.log[:] = game.view.log
+        view.log.append(f"Replay: move {self.moves_played} of {len(self.log.moves)}")
+        game.board.set_enemy_hand(game.player2.get_hand())
+        draw = lambda: view.draw_board(game.board, game.board.get_player_value(), game.board.get_enemy_value(),
+                                       game.is_player_turn, game.player1.get_hand())
+        draw()
+        deadline = time.perf_counter() + frame_delay
+        while (remaining := deadline - time.perf_counter()) > 0:
+            if view.handle_events(max(1, int(remaining * 1000))):
+                draw()
+
+    def verify(self) -> List[str]:
+        """Replay the log and describe every way the outcome differs from the recorded one"""
+        result = self.run()
+        log = self.log
+        problems = []
+        if self.moves_played != len(log.moves):
+            problems.append(f"replayed {self.moves_played} of {len(log.moves)} moves")
+        finished = self.game.player1.is_eliminated() or self.game.player2.is_eliminated()
+        if finished != log.finished:
+            problems.append(f"match {'ended' if finished else 'did not end'}, log says the opposite")
+        if log.finished:
+            winner = None if result.winner is None else (0 if result.winner == self.game.player1.state.name else 1)
+            if winner != log.winner:
+                problems.append(f"winner is side {winner}, log has side {log.winner}")
+        if [tuple(scores) for scores in result.round_scores] != [tuple(scores) for scores in log.round_scores]:
+            problems.append(f"round scores {result.round_scores}, log has {log.round_scores}")
+        return problems
+
+if __name__ == "__main__":
+    # Run as a module from the repository root, the script's own directory cannot import Gwent
+    parser = argparse.ArgumentParser(prog='python -m simulation.ReplayEngine',
+                                     description='Replay recorded Gwent matches and check their outcomes')
+    parser.add_argument('logs', nargs='+', help='Match log files written with Gwent.py --record')
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        CardLoader.get_instance()
+
+    start = time.perf_counter()
+    failures = 0
+    moves = 0
+    for path in args.logs:
+        try:
+            engine = ReplayEngine(MatchLog.load(path))
+            problems = engine.verify()
+        except Exception as e:
+            problems = [f"{type(e).__name__}: {e}"]
+        else:
+            moves += engine.moves_played
+        if problems:
+            failures += 1
+            print(f"{path}: " + "; ".join(problems))
+    elapsed = time.perf_counter() - start
+    print(f"Replayed {len(args.logs)} matches ({moves} moves) in {elapsed:.2f}s, {failures} diverged")
+    raise SystemExit(1 if failures else 0)
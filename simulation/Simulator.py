@@ -0,0 +1,153 @@
+import argparse
+import contextlib
+import functools
+import inspect
+import io
+import multiprocessing
+import os
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from Gwent import GwentGame
+from controller.Player import AIController
+from controller.GreedyController import GreedyController
+from controller.MCTSController import MCTSController
+from singleton.CardLoader import CardLoader
+
+# Search per move for MCTS seats, counted in iterations so the result does not depend on machine speed
+MCTS_ITERATIONS = 200
+
+# Controllers the command line can put in either seat
+CONTROLLERS = {"ai": AIController, "greedy": GreedyController,
+               "mcts": functools.partial(MCTSController, time_budget=None, iteration_budget=MCTS_ITERATIONS)}
+
+# (seed, winner, round scores, number of moves) - kept small so it pickles cheaply
+GameSummary = Tuple[int, Optional[str], List[Tuple[int, int]], int]
+
+_worker_controllers = (AIController, AIController)
+
+def _init_worker(player_controller, opponent_controller):
+    """Load the card catalog once per worker process"""
+    global _worker_controllers
+    _worker_controllers = (player_controller, opponent_controller)
+    with contextlib.redirect_stdout(io.StringIO()):
+        CardLoader.get_instance()
+
+def _seat(controller, seed: int, side: int):
+    """Controller of one seat, with an rng drawn from the match seed if it takes one"""
+    if "rng" in inspect.signature(controller).parameters:
+        return functools.partial(controller, rng=random.Random(f"{seed}:{side}"))
+    return controller
+
+def _play_game(seed: int) -> GameSummary:
+    """Play one headless match in a worker, the seed fixing every random choice of it"""
+    player_controller, opponent_controller = _worker_controllers
+    game = GwentGame(view_type="headless", player_controller=_seat(player_controller, seed, 0),
+                     opponent_controller=_seat(opponent_controller, seed, 1), seed=seed)
+    result = game.run_headless()
+    return seed, result.winner, result.round_scores, len(result.moves)
+
+@dataclass
+class SimulationStats:
+    """Aggregated results of a batch of headless matches"""
+    games: int = 0
+    wins: Dict[str, int] = field(default_factory=dict)
+    draws: int = 0
+    rounds: int = 0
+    player_points: int = 0
+    opponent_points: int = 0
+    moves: int = 0
+    elapsed: float = 0.0
+
+    def add(self, summary: GameSummary):
+        _, winner, round_scores, moves = summary
+        self.games += 1
+        if winner is None:
+            self.draws += 1
+        else:
+            self.wins[winner] = self.wins.get(winner, 0) + 1
+        self.rounds += len(round_scores)
+        self.player_points += sum(score[0] for score in round_scores)
+        self.opponent_points += sum(score[1] for score in round_scores)
+        self.moves += moves
+
+    def win_rate(self, name: str) -> float:
+        return self.wins.get(name, 0) / self.games if self.games else 0.0
+
+    def average_round_scores(self) -> Tuple[float, float]:
+        if not self.rounds:
+            return 0.0, 0.0
+        return self.player_points / self.rounds, self.opponent_points / self.rounds
+
+    def games_per_second(self) -> float:
+        return self.games / self.elapsed if self.elapsed else 0.0
+
+    def report(self) -> str:
+        player_avg, opponent_avg = self.average_round_scores()
+        lines = [f"Games: {self.games} in {self.elapsed:.2f}s ({self.games_per_second():.0f} games/sec)"]
+        for name in sorted(self.wins):
+            lines.append(f"{name} win rate: {self.win_rate(name):.1%}")
+        lines.append(f"Draw rate: {self.draws / self.games if self.games else 0.0:.1%}")
+        lines.append(f"Average round score: {player_avg:.1f} - {opponent_avg:.1f}")
+        return "\n".join(lines)
+
+def iter_games(games: int, workers: Optional[int] = None, first_seed: int = 0,
+               player_controller=AIController, opponent_controller=AIController,
+               chunksize: Optional[int] = None) -> Iterator[GameSummary]:
+    """Play games with seeds first_seed.. across a process pool, yielding summaries as they finish"""
+    workers = workers or os.cpu_count() or 1
+    if chunksize is None:
+        # Large enough to amortise IPC, small enough to keep every core busy until the end
+        chunksize = max(1, min(256, games // (workers * 8)))
+
+    # Build the catalog cache in the parent so workers never parse TOML
+    with contextlib.redirect_stdout(io.StringIO()):
+        CardLoader.get_instance()
+
+    seeds = range(first_seed, first_seed + games)
+    if workers == 1:
+        _init_worker(player_controller, opponent_controller)
+        yield from map(_play_game, seeds)
+        return
+
+    with multiprocessing.Pool(workers, initializer=_init_worker,
+                              initargs=(player_controller, opponent_controller)) as pool:
+        yield from pool.imap_unordered(_play_game, seeds, chunksize)
+
+def run_simulation(games: int, workers: Optional[int] = None, first_seed: int = 0,
+                   player_controller=AIController, opponent_controller=AIController,
+                   progress: Optional[Callable[[SimulationStats], None]] = None,
+                   progress_every: int = 1000) -> SimulationStats:
+    """Play a batch of games and aggregate the results"""
+    stats = SimulationStats()
+    start = time.perf_counter()
+    for summary in iter_games(games, workers, first_seed, player_controller, opponent_controller):
+        stats.add(summary)
+        if progress and stats.games % progress_every == 0:
+            stats.elapsed = time.perf_counter() - start
+            progress(stats)
+    stats.elapsed = time.perf_counter() - start
+    return stats
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Run headless Gwent matches in parallel')
+    parser.add_argument('-n', '--games', type=int, default=10000,
+                       help='Number of matches to play (default: 10000)')
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                       help='Worker processes (default: all cores)')
+    parser.add_argument('--seed', type=int, default=0,
+                       help='Seed of the first match, later matches use the following seeds')
+    parser.add_argument('--player', choices=CONTROLLERS, default='ai',
+                       help='Controller of the first seat, reported as Player (default: ai)')
+    parser.add_argument('--opponent', choices=CONTROLLERS, default='ai',
+                       help='Controller of the second seat, reported as AI (default: ai)')
+    args = parser.parse_args()
+
+    def print_progress(stats: SimulationStats):
+        print(f"{stats.games}/{args.games} games, {stats.games_per_second():.0f} games/sec", flush=True)
+
+    stats = run_simulation(args.games, args.workers, args.seed,
+                           CONTROLLERS[args.player], CONTROLLERS[args.opponent], progress=print_progress, progress_every=max(1, args.games // 10))
+    print(stats.report())
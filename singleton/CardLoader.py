@@ -1,20 +1,51 @@
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple, FrozenSet, Iterable, Union
 from model.Card import AbstractCard, HeroCard, SpecialCard, WeatherCard, UnitCard, Weather, Special, Faction, Ability, CombatRow
 import tomllib
 import os.path
+import hashlib
+import pickle
+
+# Bump whenever the pickled card layout changes so stale caches are rebuilt
+CATALOG_CACHE_VERSION = 8
+
+ABILITY_MAP = {
+    "horn": "HORN",
+    "bond": "TIGHT_BOND",
+    "medic": "MEDIC",
+    "spy": "SPY",
+    "muster": "MUSTER",
+    "morale": "MORALE_BOOST",
+    "scorch": "SCORCH",
+}
+
+# What the indexes need to know about a card without building it:
+# (card class, ability, faction, rows, name, value, count)
+CardMetadata = Tuple[type, Optional[Ability], Optional[Faction], Tuple[CombatRow, ...], str, int, int]
 
 class CardLoader:
+    """Card catalog.
+
+    Packs are parsed (or read from the catalog cache) into raw records plus
+    a little metadata per card, which is enough to build the ID and query
+    indexes. Card objects are only created by the first get_card_by_id()
+    for their ID. configure() narrows the catalog to some packs or
+    factions.
+    """
     _instance: Optional['CardLoader'] = None
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
             cls._instance.cards: Dict[str, AbstractCard] = None
+            cls._instance._pack_filter = None
+            cls._instance._faction_filter = None
+            cls._instance.generation = 0  # Bumped whenever the selected cards change
         return cls._instance
 
     def __init__(self):
         # Only load cards once when first instance is created
         self.include_file = "cards/_cardpacks.toml"
+        self.cache_file = "cards/.catalog_cache.pickle"
         if self.cards is None:
             self._load_cards()
 
@@ -27,15 +58,170 @@ class CardLoader:
 
     def get_all_card_ids(self):
         """Return list of all valid card IDs"""
-        return list(self.cards.keys())
+        self._load_cards()
+        return list(self._card_locations)
+
+    def configure(self, packs: Optional[Iterable[str]] = None,
+                  factions: Optional[Iterable[Union[Faction, str]]] = None):
+        """Restrict the catalog to the given packs (by name or file name) and factions.
+
+        Cards of any faction and cards without one (weather, specials) are
+        kept by a faction filter. None lifts a restriction. Card objects
+        already built for cards that stay selected are reused.
+        """
+        self._pack_filter = frozenset(packs) if packs is not None else None
+        self._faction_filter = (frozenset(f if isinstance(f, Faction) else Faction[f] for f in factions)
+                                if factions is not None else None)
+        if self.cards is not None:
+            self._select_cards()
 
     def _load_cards(self):
         # open toml file and load cards
         if self.cards is not None:
             return
-        
-        # Initialize empty dictionary
+
+        # Fast path: reuse the compiled catalog if no pack changed
+        catalog = self._read_catalog_cache()
+        if catalog is None:
+            catalog = self._parse_card_packs()
+            self._write_catalog_cache(catalog)
+        self._packs = catalog["packs"]
+        self._records = catalog["records"]
         self.cards = {}
+        self._select_cards()
+        print(f"Indexed {len(self._card_locations)} cards from {len(self._packs)} packs")
+
+    def _select_cards(self):
+        """Index the cards of the selected packs and factions by ID, building none of them"""
+        locations: Dict[str, Tuple[int, int]] = {}
+        for pack_index, (pack_name, pack_file) in enumerate(self._packs):
+            if self._pack_filter is not None and not {pack_name, os.path.basename(pack_file)} & self._pack_filter:
+                continue
+            for position, (record, metadata) in enumerate(self._records[pack_index]):
+                faction = metadata[2]
+                if (self._faction_filter is not None and faction not in (None, Faction.ANY)
+                        and faction not in self._faction_filter):
+                    continue
+                # A later pack replaces a card with the same ID, keeping its catalog position
+                locations[record["id"]] = (pack_index, position)
+
+        # Keep built cards whose record is still the selected one
+        previous = getattr(self, "_card_locations", {})
+        self.cards = {card_id: card for card_id, card in self.cards.items()
+                      if card_id in locations and previous.get(card_id) == locations[card_id]}
+        self._card_locations = locations
+        self.generation += 1
+        self._build_indexes()
+
+    def _build_indexes(self):
+        """Build the read-only secondary indexes used by deck building and abilities"""
+        by_class: Dict[type, List[str]] = {}
+        by_ability: Dict[Ability, List[str]] = {}
+        by_faction: Dict[Faction, List[str]] = {}
+        by_row: Dict[CombatRow, List[str]] = {}
+        names: Dict[str, str] = {}
+        values: Dict[str, int] = {}
+        counts: Dict[str, int] = {}
+
+        for card_id, location in self._card_locations.items():
+            card_class, ability, faction, rows, name, value, count = self._records[location[0]][location[1]][1]
+            names[card_id] = name
+            values[card_id] = value
+            counts[card_id] = count
+
+            # Index under every card class so UnitCard queries include heroes
+            for cls in card_class.__mro__:
+                if issubclass(cls, AbstractCard):
+                    by_class.setdefault(cls, []).append(card_id)
+
+            if ability is not None:
+                by_ability.setdefault(ability, []).append(card_id)
+
+            if faction is not None:
+                by_faction.setdefault(faction, []).append(card_id)
+
+            for row in rows:
+                by_row.setdefault(row, []).append(card_id)
+
+        self._ids_by_class = {key: tuple(ids) for key, ids in by_class.items()}
+        self._ids_by_ability = {key: tuple(ids) for key, ids in by_ability.items()}
+        self._ids_by_faction = {key: tuple(ids) for key, ids in by_faction.items()}
+        self._ids_by_row = {key: tuple(ids) for key, ids in by_row.items()}
+        self._values = values
+        self._counts = counts
+
+        # Small-integer handles for compact game states, in catalog order
+        self._card_ids = tuple(self._card_locations)
+        self._card_indices = {card_id: index for index, card_id in enumerate(self._card_ids)}
+
+        # Muster summons every card whose name starts with the musterer's base name
+        self._muster_groups: Dict[str, FrozenSet[str]] = {}
+        for card_id in self._ids_by_ability.get(Ability.MUSTER, ()):
+            name = names[card_id]
+            if name in self._muster_groups:
+                continue
+            base_name = name.split(" - ")[0]
+            self._muster_groups[name] = frozenset(
+                other_id for other_id, other_name in names.items()
+                if other_name.startswith(base_name)
+            )
+
+    def get_card_ids_by_class(self, card_class: type) -> Tuple[str, ...]:
+        """Return IDs of all cards that are instances of card_class"""
+        self._load_cards()
+        return self._ids_by_class.get(card_class, ())
+
+    def get_card_ids_by_ability(self, ability: Ability) -> Tuple[str, ...]:
+        """Return IDs of all cards with the given ability"""
+        self._load_cards()
+        return self._ids_by_ability.get(ability, ())
+
+    def get_card_ids_by_faction(self, faction: Faction) -> Tuple[str, ...]:
+        """Return IDs of all cards belonging to faction"""
+        self._load_cards()
+        return self._ids_by_faction.get(faction, ())
+
+    def get_card_ids_by_row(self, row: CombatRow) -> Tuple[str, ...]:
+        """Return IDs of all cards that may be played in row"""
+        self._load_cards()
+        return self._ids_by_row.get(row, ())
+
+    def get_card_value(self, card_id: str) -> int:
+        """Return the printed strength of a card, 0 for cards that are not units"""
+        self._load_cards()
+        return self._values[card_id]
+
+    def get_card_count(self, card_id: str) -> int:
+        """Return how many copies of a card a deck may hold"""
+        self._load_cards()
+        return self._counts[card_id]
+
+    def get_muster_group(self, card_name: str) -> FrozenSet[str]:
+        """Return IDs of all cards summoned when a muster card named card_name is played"""
+        self._load_cards()
+        return self._muster_groups.get(card_name, frozenset())
+
+    def get_card_index(self, card_id: str) -> int:
+        """Return the small-integer handle of a card ID"""
+        self._load_cards()
+        return self._card_indices[card_id]
+
+    def get_card_id_by_index(self, index: int) -> str:
+        """Return the card ID behind a small-integer handle"""
+        self._load_cards()
+        return self._card_ids[index]
+
+    def get_card_ids_by_index(self, indices: Iterable[int]) -> List[str]:
+        """Return the card IDs behind several handles at once"""
+        self._load_cards()
+        card_ids = self._card_ids
+        return [card_ids[index] for index in indices]
+
+    def _parse_card_packs(self) -> dict:
+        """Parse every pack listed in the include file into raw records and card metadata"""
+        packs = []
+        records = []
+        sources = []  # Every listed pack file, loaded or not, so fixing a broken one invalidates the cache
         
         # Load include file
         with open(self.include_file, "rb") as f:
@@ -47,76 +233,154 @@ class CardLoader:
         # Load each pack
         for pack in include_data.get("pack", []):
             pack_file = os.path.join(base_dir, pack["file"])
-            print(f"Loading card pack: {pack['name']}")
-            
-            num_cards = 0
+            sources.append(pack_file)
+            pack_records = []
             try:
                 with open(pack_file, "rb") as f:
                     data = tomllib.load(f)
-                    for card in data["cards"]:
-                        # Skip cards without IDs
-                        if not card.get("id"):
-                            continue
-
-                        num_cards += 1
-                        try:
-                            class_name = card["card_class"]
-                            card_obj = globals()[class_name]()
-
-                            # ...existing card loading code...
-                            for key, value in card.items():
-                                if key in ("card_class", "id", "filename"):
-                                    continue
-
-                                # Handle enums
-                                try:
-                                    if key == "type" and value:
-                                        if class_name == "WeatherCard":
-                                            value = Weather[value]
-                                        elif class_name == "SpecialCard":
-                                            value = Special[value]
-                                    elif key == "faction" and value:
-                                        value = Faction[value]
-                                    elif key == "ability" and value:
-                                        ability_map = {
-                                            "horn": "HORN",
-                                            "bond": "TIGHT_BOND",
-                                            "medic": "MEDIC",
-                                            "spy": "SPY",
-                                            "muster": "MUSTER",
-                                            "morale": "MORALE_BOOST",
-                                            "scorch": "SCORCH",
-                                        }
-                                        if not value:
-                                            value = None
-                                        else:
-                                            value = ability_map.get(value.lower(), None)
-                                            if value:
-                                                value = Ability[value]
-                                    elif key == "row" and value:
-                                        if isinstance(value, list):
-                                            value = [CombatRow[r] for r in value]
-                                        else:
-                                            continue
-
-                                    setattr(card_obj, key, value)
-                                except (KeyError, ValueError):
-                                    if key == "ability":
-                                        setattr(card_obj, key, Ability.NONE)
-                                    else:
-                                        setattr(card_obj, key, None)
-
-                            self.cards[card["id"]] = card_obj
-                        except Exception as e:
-                            num_cards -= 1
-                            print(f"Failed to load card: {card.get('name', 'Unknown')}, Error: {e}")
-                            continue
             except Exception as e:
                 print(f"Failed to load pack {pack['name']}: {e}")
                 continue
-            
-            print(f"Loaded {num_cards} cards from {pack['name']}")
+
+            for card in data["cards"]:
+                # Skip cards without IDs
+                if not card.get("id"):
+                    continue
+                try:
+                    # Build once so broken records are reported now rather than mid-match
+                    card_obj = self._build_card(card)
+                except Exception as e:
+                    print(f"Failed to load card: {card.get('name', 'Unknown')}, Error: {e}")
+                    continue
+                pack_records.append((card, self._card_metadata(card_obj)))
+
+            packs.append((pack["name"], pack_file))
+            records.append(pack_records)
+
+        return {"packs": packs, "records": records, "sources": sources}
+
+    @staticmethod
+    def _card_metadata(card: AbstractCard) -> CardMetadata:
+        """Summarize a built card for the indexes"""
+        ability = getattr(card, "ability", None)
+        if not isinstance(ability, Ability):
+            ability = Ability.NONE if hasattr(card, "ability") else None
+        faction = getattr(card, "faction", None)
+        if not isinstance(faction, Faction):
+            faction = None
+        return (type(card), ability, faction, tuple(getattr(card, "row", None) or ()), card.name,
+                getattr(card, "value", 0), card.count)
+
+    @staticmethod
+    def _build_card(card: dict) -> AbstractCard:
+        """Create a card object from its pack record"""
+        class_name = card["card_class"]
+        card_obj = globals()[class_name]()
+        card_obj.id = card["id"]
+        # Cards have __slots__, so fields the class does not declare are ignored rather than set
+        fields = {name for cls in type(card_obj).__mro__ for name in getattr(cls, "__slots__", ())}
+
+        for key, value in card.items():
+            if key in ("card_class", "id", "filename") or key not in fields or key.startswith("_"):
+                continue
+
+            # Handle enums
+            try:
+                if key == "type" and value:
+                    if class_name == "WeatherCard":
+                        value = Weather[value]
+                    elif class_name == "SpecialCard":
+                        value = Special[value]
+                elif key == "faction" and value:
+                    value = Faction[value]
+                elif key == "ability" and value:
+                    if not value:
+                        value = None
+                    else:
+                        # Packs spell abilities either short ("bond") or as the enum name ("TIGHT_BOND")
+                        value = ABILITY_MAP.get(value.lower()) or (value if value in Ability.__members__ else None)
+                        if value:
+                            value = Ability[value]
+                elif key == "row" and value:
+                    if isinstance(value, list):
+                        value = [CombatRow[r] for r in value]
+                    else:
+                        continue
+
+                setattr(card_obj, key, value)
+            except (KeyError, ValueError):
+                if key == "ability":
+                    setattr(card_obj, key, Ability.NONE)
+                else:
+                    setattr(card_obj, key, None)
+        card_obj.freeze()
+        return card_obj
+
+    def _source_fingerprint(self, path: str, previous: Optional[tuple] = None) -> Optional[tuple]:
+        """Return (path, mtime_ns, size, sha256) for a catalog source file.
+
+        When the mtime and size match a previous fingerprint the stored hash is
+        reused, so a fresh cache is validated with stat() calls only.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if previous and previous[1] == stat.st_mtime_ns and previous[2] == stat.st_size:
+            return previous
+        with open(path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        return (path, stat.st_mtime_ns, stat.st_size, digest)
+
+    def _read_catalog_cache(self) -> Optional[dict]:
+        """Load the compiled catalog if it exists and every pack is unchanged"""
+        try:
+            with open(self.cache_file, "rb") as f:
+                cache = pickle.load(f)
+        except Exception:
+            return None
+
+        if not isinstance(cache, dict) or cache.get("version") != CATALOG_CACHE_VERSION:
+            return None
+
+        # The include file lists the packs, so it is checked like any other source
+        for previous in cache["sources"]:
+            current = self._source_fingerprint(previous[0], previous)
+            if current is None or current[3] != previous[3]:
+                return None
+        return cache["catalog"]
+
+    def _write_catalog_cache(self, catalog: dict):
+        """Store the parsed catalog keyed on the fingerprints of its sources"""
+        sources = []
+        for path in [self.include_file] + catalog["sources"]:
+            fingerprint = self._source_fingerprint(path)
+            if fingerprint is None:
+                return  # Missing pack, never cache a partial catalog
+            sources.append(fingerprint)
+
+        cache = {
+            "version": CATALOG_CACHE_VERSION,
+            "sources": sources,
+            "catalog": catalog,
+        }
+        tmp_file = f"{self.cache_file}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_file, "wb") as f:
+                pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, self.cache_file)
+        except OSError:
+            # Read-only checkout: keep working from the TOML packs
+            try:
+                os.remove(tmp_file)
+            except OSError:
+                pass
+
     def get_card_by_id(self, id: str) -> AbstractCard:
         self._load_cards()
-        return self.cards[id]
+        card = self.cards.get(id)
+        if card is None:
+            pack_index, position = self._card_locations[id]
+            card = self.cards[id] = self._build_card(self._records[pack_index][position][0])
+        return card
 
@@ -52,5 +52,8 @@ class AbstractView(ABC):
 
     @abstractmethod
     def handle_events(self, timeout: int = 100):
-        """Handle any pending input events with optional timeout"""
+        """Handle pending input events, waiting up to timeout ms for the first one.
+
+        Returns True if anything was handled that needs a redraw.
+        """
         pass
@@ -3,6 +3,7 @@ from typing import List, Optional
 from model.Card import AbstractCard, Ability, HeroCard, UnitCard, WeatherCard, SpecialCard, Weather, Special
 from controller.Player import INITIAL_LIVES  # Import the constant
 from .AbstractView import AbstractView
+from .FrameBuffer import FrameBuffer
 
 class BoardView(AbstractView):  # Inherit from AbstractView
     # Default view configuration
@@ -32,6 +33,7 @@ class BoardView(AbstractView):  # Inherit from AbstractView
         self.player2 = None
         self.current_line = 0  # Add line tracker
         self.pad = None  # Add pad for double buffering
+        self.frame = None  # Frame drawn this update, only its changes reach the pad
         self.screen_too_small = False  # Add flag for screen size warning
         
         # Initialize configuration
@@ -64,6 +66,7 @@ class BoardView(AbstractView):  # Inherit from AbstractView
         # Create pad slightly larger than screen
         self.pad = curses.newpad(self.max_y + 1, self.max_x + 1)
         self.pad.keypad(True)
+        self.frame = FrameBuffer(self.max_y, self.max_x)
 
     def end_curses(self):
         if self.pad:
@@ -81,7 +84,7 @@ class BoardView(AbstractView):  # Inherit from AbstractView
     def draw_board(self, board, player_score, opponent_score, is_player_turn, player_hand: List[AbstractCard]):
         try:
             if self.screen_too_small:
-                self.pad.clear()
+                self.frame.reset()
                 warning = "Terminal window too small. Minimum size: 80x30"
                 size_info = f"Current size: {self.max_x}x{self.max_y}"
                 self.safe_addstr(0, 0, warning)
@@ -100,6 +103,8 @@ class BoardView(AbstractView):  # Inherit from AbstractView
                     # Recreate pad with new size
                     self.pad = curses.newpad(self.max_y + 1, self.max_x + 1)
                     self.pad.keypad(True)
+                    self.pad.clearok(True)  # Terminal contents are unknown after a resize
+                    self.frame.resize(self.max_y, self.max_x)
                 return
             
             # Store the board reference and scores
@@ -108,7 +113,7 @@ class BoardView(AbstractView):  # Inherit from AbstractView
             self.opponent_score = opponent_score
             self.is_player_turn = is_player_turn
             
-            self.pad.clear()  # Clear pad instead of screen
+            self.frame.reset()  # Start a blank frame, refresh_screen() sends only what differs
             
             # Calculate game area width and log area width
             game_area_width = self.max_x - self.config['log_width'] - 3  # -3 for borders and separator
@@ -131,7 +136,7 @@ class BoardView(AbstractView):  # Inherit from AbstractView
             self.safe_addstr(1, (game_area_width - len(title)) // 2, title)
             
             # Weather and turn info
-            weather_str = ", ".join([w.name for w in (board.weather if board else [])]) or "Clear"
+            weather_str = ", ".join([w.name for w in sorted(board.weather if board else [], key=lambda w: w.value)]) or "Clear"
             self.safe_addstr(2, 2, f"Weather: [{weather_str}]")
             turn_str = "Player" if is_player_turn else "Opponent"
             self.safe_addstr(2, game_area_width - 20, f"Turn: {turn_str}")
@@ -174,18 +179,16 @@ class BoardView(AbstractView):  # Inherit from AbstractView
             pass  # Ignore curses errors from writing outside window
 
     def safe_addstr(self, y, x, string, color_pair=0):
-        """Safely add a string to the screen with optional color"""
-        try:
-            if y < self.max_y and x < self.max_x:
-                remaining_space = self.max_x - x - 1
-                if remaining_space > 0:
-                    self.pad.addstr(y, x, string[:remaining_space], color_pair)
-        except curses.error:
-            pass
+        """Safely add a string to the frame with optional color"""
+        if 0 <= y < self.max_y and 0 <= x < self.max_x:
+            remaining_space = self.max_x - x - 1
+            if remaining_space > 0:
+                self.frame.write(y, x, string[:remaining_space], color_pair)
 
     def refresh_screen(self):
-        """Refresh the screen using the pad"""
+        """Copy the changed parts of the frame to the pad and refresh the screen"""
         try:
+            self.frame.flush(self.pad)
             self.pad.refresh(0, 0, 0, 0, self.max_y - 1, self.max_x - 1)
         except curses.error:
             pass
@@ -228,7 +231,7 @@ class BoardView(AbstractView):  # Inherit from AbstractView
                 card_str = ""
                 for card in cards:
                     name_width = self.config['battlefield_spacing']
-                    if isinstance(card, HeroCard):
+                    if isinstance(card.prototype, HeroCard):
                         card_str += f"╣{card.name[:name_width]:<{name_width}}╠ "
                     else:
                         card_str += f"[{card.name[:name_width]:<{name_width}}] "
@@ -276,7 +279,7 @@ class BoardView(AbstractView):  # Inherit from AbstractView
             border_width = width + 2  # Add 2 for borders
             
             # Draw card box with configurable width
-            is_hero = isinstance(card, HeroCard)
+            is_hero = isinstance(card.prototype, HeroCard)
             border_top = "╔" + "═" * width + "╗" if is_hero else "┌" + "─" * width + "┐"
             border_side = "║" if is_hero else "│"
             border_bottom = "╚" + "═" * width + "╝" if is_hero else "└" + "─" * width + "┘"
@@ -302,7 +305,7 @@ class BoardView(AbstractView):  # Inherit from AbstractView
             if hasattr(card, 'ability') and card.ability and card.ability != Ability.NONE:
                 ability_str = card.ability.name[:width]
                 self.safe_addstr(start_line + 5, x_pos, f"{border_side}{ability_str:<{width}}{border_side}")
-            elif hasattr(card, 'type'):
+            elif getattr(card, 'type', None):
                 type_str = card.type.name[:width]
                 self.safe_addstr(start_line + 5, x_pos, f"{border_side}{type_str:<{width}}{border_side}")
             else:
@@ -315,19 +318,19 @@ class BoardView(AbstractView):  # Inherit from AbstractView
                 self.safe_addstr(start_line + 1, x_pos, "╔" + "═" * width + "╗")
                 for y in range(2, 6):
                     # Replace first and last char of each line with hero border
-                    self.pad.addch(start_line + y, x_pos, "║")
-                    self.pad.addch(start_line + y, x_pos + width + 1, "║")
+                    self.frame.write(start_line + y, x_pos, "║")
+                    self.frame.write(start_line + y, x_pos + width + 1, "║")
                 self.safe_addstr(start_line + 6, x_pos, "╚" + "═" * width + "╝")
             
             # Apply colors after drawing full card
             if is_hero:
                 for y in range(start_line + 1, start_line + 7):
-                    self.pad.chgat(y, x_pos, border_width, curses.color_pair(2))
+                    self.frame.set_attr(y, x_pos, border_width, curses.color_pair(2))
             
             # Highlight selected card
             if i + self.hand_offset == self.hand_selected:
                 for y in range(start_line + 1, start_line + 7):
-                    self.pad.chgat(y, x_pos, border_width, curses.color_pair(1))
+                    self.frame.set_attr(y, x_pos, border_width, curses.color_pair(1))
         
         if len(hand) > self.config['max_visible_cards']:
             self.safe_addstr(start_line + 7, 4, "Use <- -> to scroll")
@@ -509,10 +512,15 @@ class BoardView(AbstractView):  # Inherit from AbstractView
         if not self.screen_too_small:
             self.pad = curses.newpad(self.max_y + 1, self.max_x + 1)
             self.pad.keypad(True)
+            self.pad.clearok(True)  # Terminal contents are unknown after a resize
+            self.frame.resize(self.max_y, self.max_x)
 
     def handle_events(self, timeout: int = 100):
-        """Handle curses events"""
+        """Handle curses events, returning as soon as input arrives"""
+        # getch() with a timeout waits on the input fd, so it wakes on the first key
         self.stdscr.timeout(timeout)
         key = self.stdscr.getch()
         if key == curses.KEY_RESIZE:
             self.handle_resize()
+            return True
+        return False
@@ -0,0 +1,64 @@
+import pygame
+from typing import Callable, Dict, Hashable, Tuple
+
+class CardAtlas:
+    """Card faces drawn once into large atlas pages and reused as sub-surfaces.
+
+    Faces are keyed by whatever the view passes in, normally
+    (card ID, width, height, style), and packed shelf by shelf into pages
+    of page_size. Drawing a card is then a single blit of its cached
+    sub-surface. Everything is dropped when validate() sees a new layout
+    signature, which the view derives from its window size and config.
+    """
+    def __init__(self, page_size: Tuple[int, int] = (2048, 2048)):
+        self.page_size = page_size
+        self.signature = None
+        self.renders = 0  # Faces drawn since the last invalidation
+        self._pages = []
+        self._sprites: Dict[Hashable, pygame.Surface] = {}
+        self._shelf_x = 0
+        self._shelf_y = 0
+        self._shelf_height = 0
+
+    def __len__(self):
+        return len(self._sprites)
+
+    def validate(self, signature: Hashable):
+        """Invalidate the atlas if the layout it was drawn for changed"""
+        if signature != self.signature:
+            self.invalidate()
+            self.signature = signature
+
+    def invalidate(self):
+        self._pages = []
+        self._sprites = {}
+        self._shelf_x = self._shelf_y = self._shelf_height = 0
+        self.renders = 0
+
+    def get(self, key: Hashable, size: Tuple[int, int], draw: Callable[[pygame.Surface], None]) -> pygame.Surface:
+        """Return the face for key, calling draw(surface) to fill it on first use"""
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            sprite = self._allocate(size)
+            draw(sprite)
+            self._sprites[key] = sprite
+            self.renders += 1
+        return sprite
+
+    def _allocate(self, size: Tuple[int, int]) -> pygame.Surface:
+        width, height = size
+        page_width, page_height = self.page_size
+        if width > page_width or height > page_height:
+            return pygame.Surface(size)  # Too large to share a page
+        if self._pages and self._shelf_x + width > page_width:
+            # Start a new shelf below the current one
+            self._shelf_x = 0
+            self._shelf_y += self._shelf_height
+            self._shelf_height = 0
+        if not self._pages or self._shelf_y + height > page_height:
+            self._pages.append(pygame.Surface(self.page_size))
+            self._shelf_x = self._shelf_y = self._shelf_height = 0
+        sprite = self._pages[-1].subsurface((self._shelf_x, self._shelf_y, width, height))
+        self._shelf_x += width
+        self._shelf_height = max(self._shelf_height, height)
+        return sprite
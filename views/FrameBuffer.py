@@ -0,0 +1,76 @@
+from typing import List
+
+class FrameBuffer:
+    """Off-screen copy of a curses frame that only pushes changed cells.
+
+    Views draw a whole frame into the buffer with write() and set_attr(),
+    then flush() compares every line with the previously flushed frame and
+    writes just the changed span of each line to the curses window. Since
+    the window is never cleared, curses in turn only sends those cells to
+    the terminal, so update cost follows the size of the change.
+    """
+    def __init__(self, height: int, width: int):
+        self.cells_written = 0  # Total cells sent to the window, for diagnostics
+        self.lines_written = 0
+        self.resize(height, width)
+
+    def resize(self, height: int, width: int):
+        """Start over with a blank frame, matching a freshly created window"""
+        self.height = height
+        self.width = width
+        self.chars: List[List[str]] = [[" "] * width for _ in range(height)]
+        self.attrs: List[List[int]] = [[0] * width for _ in range(height)]
+        self._shown_chars = [line[:] for line in self.chars]
+        self._shown_attrs = [line[:] for line in self.attrs]
+
+    def reset(self):
+        """Blank the frame being drawn, the shown frame stays for diffing"""
+        width = self.width
+        self.chars = [[" "] * width for _ in range(self.height)]
+        self.attrs = [[0] * width for _ in range(self.height)]
+
+    def write(self, y: int, x: int, text: str, attr: int = 0):
+        """Put text at (y, x), clipped to the frame"""
+        if not 0 <= y < self.height or x < 0 or x >= self.width:
+            return
+        text = text[:self.width - x]
+        end = x + len(text)
+        self.chars[y][x:end] = text
+        self.attrs[y][x:end] = [attr] * len(text)
+
+    def set_attr(self, y: int, x: int, length: int, attr: int):
+        """Change the attribute of length cells, like window.chgat()"""
+        if not 0 <= y < self.height or x < 0 or x >= self.width:
+            return
+        end = min(self.width, x + length)
+        self.attrs[y][x:end] = [attr] * (end - x)
+
+    def flush(self, window) -> int:
+        """Write every changed span to window and return the number of cells written"""
+        written = 0
+        for y in range(self.height):
+            chars, attrs = self.chars[y], self.attrs[y]
+            shown_chars, shown_attrs = self._shown_chars[y], self._shown_attrs[y]
+            if chars == shown_chars and attrs == shown_attrs:
+                continue
+            first = 0
+            while chars[first] == shown_chars[first] and attrs[first] == shown_attrs[first]:
+                first += 1
+            last = self.width - 1
+            while chars[last] == shown_chars[last] and attrs[last] == shown_attrs[last]:
+                last -= 1
+            # Emit the span in runs of equal attributes
+            start = first
+            while start <= last:
+                attr = attrs[start]
+                end = start + 1
+                while end <= last and attrs[end] == attr:
+                    end += 1
+                window.addstr(y, start, "".join(chars[start:end]), attr)
+                start = end
+            written += last - first + 1
+            self.lines_written += 1
+            self._shown_chars[y] = chars[:]
+            self._shown_attrs[y] = attrs[:]
+        self.cells_written += written
+        return written
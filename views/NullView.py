@@ -0,0 +1,55 @@
+from collections import deque
+from typing import List, Optional
+from model.Card import AbstractCard
+from .AbstractView import AbstractView
+
+class NullView(AbstractView):
+    """View that draws nothing and never waits, used for headless matches"""
+    DEFAULT_CONFIG = {
+        'log_lines': 0,  # Number of log messages kept (0 discards them)
+    }
+
+    def __init__(self, config=None):
+        self.config = self.DEFAULT_CONFIG.copy()
+        if config:
+            self.config.update(config)
+        self.log = deque(maxlen=self.config['log_lines'])
+        self.board = None
+        self.player1 = None
+        self.player2 = None
+
+    def init_display(self):
+        pass
+
+    def cleanup_display(self):
+        pass
+
+    def setup_players(self, player1, player2):
+        self.player1 = player1
+        self.player2 = player2
+
+    def draw_board(self, board, player_score, opponent_score, is_player_turn, player_hand: List[AbstractCard]):
+        pass
+
+    def get_user_card_choice(self, hand) -> Optional[int]:
+        # Nobody is at the keyboard, so a human seat always passes
+        return "PASS"
+
+    def get_user_row_choice(self, card) -> Optional[str]:
+        if not hasattr(card, 'row') or not card.row:
+            return "CLOSE"
+        return card.row[0].name
+
+    def get_graveyard_card_choice(self, revivable_cards) -> Optional[int]:
+        if not revivable_cards:
+            return None
+        return revivable_cards[0][0]
+
+    def add_log_message(self, message: str):
+        self.log.append(message)
+
+    def handle_resize(self):
+        pass
+
+    def handle_events(self, timeout: int = 100):
+        return False
@@ -2,6 +2,8 @@ import pygame
 from typing import List, Optional, Tuple
 from model.Card import AbstractCard
 from .AbstractView import AbstractView
+from .TextCache import TextCache
+from .CardAtlas import CardAtlas
 
 class PyGameView(AbstractView):
     COLORS = {
@@ -37,10 +39,13 @@ class PyGameView(AbstractView):
             'title_font_size': 32,
             'line_height': 25,
             'battlefield_card_height': 80,
-            'battlefield_card_width': 160   # Wider battlefield cards
+            'battlefield_card_width': 160,  # Wider battlefield cards
+            'text_cache_size': 512          # Rendered text surfaces and layouts kept between frames
         }
         if config:
             self.config.update(config)
+        self.text_cache = TextCache(self.config['text_cache_size'])
+        self.card_atlas = CardAtlas()
         self.board = None
         self.last_scores = (0, 0)
         self.card_scroll_pos = 0
@@ -65,6 +70,7 @@ class PyGameView(AbstractView):
         pygame.display.set_caption("Gwent PyGame")
         self.font = pygame.font.SysFont('monospace', self.config['font_size'])
         self.title_font = pygame.font.SysFont('monospace', self.config['title_font_size'])
+        self.text_cache.clear()
         
     def cleanup_display(self):
         if self.ui_manager:
@@ -76,6 +82,8 @@ class PyGameView(AbstractView):
         self.player2 = player2
 
     def draw_board(self, board, player_score, opponent_score, is_player_turn, player_hand):
+        # Card faces depend only on the window size and config
+        self.card_atlas.validate((self.width, self.height, self.font, tuple(sorted(self.config.items()))))
         self.player_hand = player_hand
         self.board = board
         self.last_scores = (player_score, opponent_score)
@@ -86,7 +94,7 @@ class PyGameView(AbstractView):
                          (self.game_area_width, 0), 
                          (self.game_area_width, self.height))
 
-        title = self.title_font.render("GWENT CLI", True, self.COLORS['white'])
+        title = self._render("GWENT CLI", self.COLORS['white'], self.title_font)
         self.screen.blit(title, (self.game_area_width // 2 - title.get_width() // 2, 10))
 
         self._draw_stats(player_score, opponent_score, is_player_turn)
@@ -97,11 +105,10 @@ class PyGameView(AbstractView):
         pygame.display.flip()
 
     def _draw_stats(self, player_score, opponent_score, is_player_turn):
-        weather = self.font.render("Weather: [Clear]", True, self.COLORS['white'])
+        weather = self._render("Weather: [Clear]", self.COLORS['white'])
         self.screen.blit(weather, (10, 50))
         
-        turn = self.font.render(f"Turn: {'Player' if is_player_turn else 'Opponent'}", 
-                                True, self.COLORS['white'])
+        turn = self._render(f"Turn: {'Player' if is_player_turn else 'Opponent'}", self.COLORS['white'])
         self.screen.blit(turn, (self.game_area_width - 200, 50))
 
     def _draw_battlefields(self, board):
@@ -113,7 +120,7 @@ class PyGameView(AbstractView):
         
         for side in ['enemy', 'player']:
             title = f"{'Opponent' if side == 'enemy' else 'Your'} Battlefield:"
-            text = self.font.render(title, True, self.COLORS['white'])
+            text = self._render(title, self.COLORS['white'])
             self.screen.blit(text, (10, y_offset))
             
             y_offset += 40
@@ -124,7 +131,7 @@ class PyGameView(AbstractView):
             
             for row_name in rows:
                 value = sum(card.value for card in rows_data[row_name] if hasattr(card, 'value'))
-                row_text = self.font.render(f"[{row_name}] Value: {value}", True, self.COLORS['white'])
+                row_text = self._render(f"[{row_name}] Value: {value}", self.COLORS['white'])
                 self.screen.blit(row_text, (10, y_offset))
                 
                 self._draw_battlefield_row(row_name, rows_data[row_name], y_offset, row_height, side == 'player')
@@ -150,23 +157,13 @@ class PyGameView(AbstractView):
         self.row_scroll_positions[side][row_name] = scroll_pos
         
         visible_cards = cards[scroll_pos:scroll_pos + cards_per_view]
+        card_size = (card_width, row_height - 50)
         card_x = 20
         for card in visible_cards:
-            # Draw card box background and border
-            pygame.draw.rect(self.screen, self.COLORS['black'], 
-                             (card_x, y_offset + 40, card_width, row_height - 50))
-            pygame.draw.rect(self.screen, self.COLORS['white'], 
-                             (card_x, y_offset + 40, card_width, row_height - 50), 1)
-            
-            # Wrap the text so it fits within the card box
-            wrapped_lines = self._wrap_text(f"{card.name} ({card.value})", card_width - 10)
-            line_y = y_offset + 45
-            for line in wrapped_lines:
-                rendered_line = self.font.render(line, True, self.COLORS['white'])
-                self.screen.blit(rendered_line, (card_x + 5, line_y))
-                line_y += self.config['line_height']
-                if line_y > y_offset + row_height - 50:
-                    break
+            # Keyed on the copy's strength too, since the face shows it
+            face = self.card_atlas.get((card.id, getattr(card, 'value', None), card_size, 'field'), card_size,
+                                       lambda surface, card=card: self._draw_field_card_face(surface, card))
+            self.screen.blit(face, (card_x, y_offset + 40))
             card_x += spacing
         
         if len(cards) > cards_per_view:
@@ -174,22 +171,51 @@ class PyGameView(AbstractView):
                                  10, row_height - 40,
                                  len(cards), cards_per_view, scroll_pos)
 
+    def _draw_field_card_face(self, surface, card):
+        """Draw a battlefield card at the origin of surface"""
+        width, height = surface.get_size()
+        surface.fill(self.COLORS['black'])
+        pygame.draw.rect(surface, self.COLORS['white'], (0, 0, width, height), 1)
+
+        # Wrap the text so it fits within the card box
+        label = f"{card.name} ({card.value})" if hasattr(card, 'value') else card.name
+        wrapped_lines = self._wrap_text(label, width - 10)
+        line_y = 5
+        for line in wrapped_lines:
+            surface.blit(self._render(line, self.COLORS['white']), (5, line_y))
+            line_y += self.config['line_height']
+            if line_y > height - 40:
+                break
+
+    def _draw_hand_card_face(self, surface, card, color):
+        """Draw a hand card at the origin of surface, bordered and labelled in color"""
+        width, height = surface.get_size()
+        surface.fill(self.COLORS['gray'])
+        pygame.draw.rect(surface, color, (0, 0, width, height), 2)
+
+        text_x = 10
+        text_y = 10
+        line_height = self.config['line_height']
+
+        surface.blit(self._render(card.name[:15], color), (text_x, text_y))
+
+        if hasattr(card, 'value'):
+            surface.blit(self._render(f"Value: {card.value}", color), (text_x, text_y + line_height))
+
+        if hasattr(card, 'row') and card.row:
+            row_str = '/'.join(r.name[0] for r in card.row)
+            surface.blit(self._render(f"Row: {row_str}", color), (text_x, text_y + line_height * 2))
+
+        if hasattr(card, 'ability') and card.ability:
+            surface.blit(self._render(str(card.ability.name)[:12], color), (text_x, text_y + line_height * 3))
+
     def _wrap_text(self, text, max_width):
         """Splits text into multiple lines so each line fits within max_width."""
-        words = text.split(' ')
-        lines = []
-        current_line = ""
-        for word in words:
-            test_line = f"{current_line} {word}" if current_line else word
-            if self.font.size(test_line)[0] <= max_width:
-                current_line = test_line
-            else:
-                if current_line:
-                    lines.append(current_line)
-                current_line = word
-        if current_line:
-            lines.append(current_line)
-        return lines
+        return self.text_cache.wrap(self.font, text, max_width)
+
+    def _render(self, text, color, font=None):
+        """Render text with the given font (default: self.font), reusing cached surfaces"""
+        return self.text_cache.render(font or self.font, text, color)
 
     def _draw_hand(self, hand):
         if not hand:
@@ -201,7 +227,7 @@ class PyGameView(AbstractView):
                          (0, y_pos - 30, self.game_area_width, self.config['card_height'] + 70))
 
         title = f"Your Hand ({len(hand)} cards)"
-        self.screen.blit(self.font.render(title, True, self.COLORS['white']), (10, y_pos - 30))
+        self.screen.blit(self._render(title, self.COLORS['white']), (10, y_pos - 30))
 
         visible_width = self.game_area_width - 40
         cards_per_view = visible_width // self.config['card_spacing']
@@ -210,40 +236,19 @@ class PyGameView(AbstractView):
         visible_cards = hand[self.card_scroll_pos:self.card_scroll_pos + cards_per_view]
 
         if self.card_scroll_pos > 0:
-            left_arrow = self.font.render("←", True, self.COLORS['white'])
+            left_arrow = self._render("←", self.COLORS['white'])
             self.screen.blit(left_arrow, (5, y_pos + self.config['card_height'] // 2))
         if self.card_scroll_pos + cards_per_view < len(hand):
-            right_arrow = self.font.render("→", True, self.COLORS['white'])
+            right_arrow = self._render("→", self.COLORS['white'])
             self.screen.blit(right_arrow, (self.game_area_width - 20, y_pos + self.config['card_height'] // 2))
 
+        card_size = (self.config['card_width'], self.config['card_height'])
         for i, card in enumerate(visible_cards):
             x_pos = 10 + i * self.config['card_spacing']
             color = self.COLORS['yellow'] if i + self.card_scroll_pos == self.selected_card else self.COLORS['white']
-            
-            pygame.draw.rect(self.screen, self.COLORS['gray'], 
-                             (x_pos, y_pos, self.config['card_width'], self.config['card_height']))
-            pygame.draw.rect(self.screen, color, 
-                             (x_pos, y_pos, self.config['card_width'], self.config['card_height']), 2)
-
-            text_x = x_pos + 10
-            text_y = y_pos + 10
-            line_height = self.config['line_height']
-
-            name = self.font.render(card.name[:15], True, color)
-            self.screen.blit(name, (text_x, text_y))
-
-            if hasattr(card, 'value'):
-                value = self.font.render(f"Value: {card.value}", True, color)
-                self.screen.blit(value, (text_x, text_y + line_height))
-
-            if hasattr(card, 'row') and card.row:
-                row_str = '/'.join(r.name[0] for r in card.row)
-                row_text = self.font.render(f"Row: {row_str}", True, color)
-                self.screen.blit(row_text, (text_x, text_y + line_height * 2))
-
-            if hasattr(card, 'ability') and card.ability:
-                ability = self.font.render(str(card.ability.name)[:12], True, color)
-                self.screen.blit(ability, (text_x, text_y + line_height * 3))
+            face = self.card_atlas.get((card.id, card_size, color), card_size,
+                                       lambda surface, card=card: self._draw_hand_card_face(surface, card, color))
+            self.screen.blit(face, (x_pos, y_pos))
 
         if len(hand) > cards_per_view:
             thumb_rect = self._draw_horizontal_scrollbar(10, y_pos + self.config['card_height'] + 5,
@@ -280,39 +285,41 @@ class PyGameView(AbstractView):
     def _draw_log(self):
         y_pos = 10
         log_x = self.game_area_width + 10
-        title = self.font.render("Game Log", True, self.COLORS['white'])
+        title = self._render("Game Log", self.COLORS['white'])
         self.screen.blit(title, (log_x, y_pos))
         pygame.draw.line(self.screen, self.COLORS['white'],
                          (log_x, y_pos + 25),
                          (self.width - 10, y_pos + 25))
         y_pos += 35
         for entry in self.log[-10:]:
-            text = self.font.render(entry[:25], True, self.COLORS['white'])
+            text = self._render(entry[:25], self.COLORS['white'])
             self.screen.blit(text, (log_x, y_pos))
             y_pos += 20
 
     def get_user_card_choice(self, hand) -> Optional[int]:
+        redraw = True
         while True:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    return None
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        return None
-                    elif event.key == pygame.K_RETURN:
-                        return self.selected_card
-                    elif event.key == pygame.K_LEFT:
-                        self.selected_card = max(0, self.selected_card - 1)
-                        self._adjust_scroll_to_selected()
-                    elif event.key == pygame.K_RIGHT:
-                        self.selected_card = min(len(hand) - 1, self.selected_card + 1)
-                        self._adjust_scroll_to_selected()
-                    elif event.key == pygame.K_p:
-                        return "PASS"
-            if self.board:
+            if redraw and self.board:
                 self.draw_board(self.board, self.last_scores[0], 
                                 self.last_scores[1], True, hand)
-            pygame.time.wait(50)
+            # Sleep until the next event instead of polling
+            event = pygame.event.wait()
+            redraw = event.type != pygame.MOUSEMOTION
+            if event.type == pygame.QUIT:
+                return None
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    return None
+                elif event.key == pygame.K_RETURN:
+                    return self.selected_card
+                elif event.key == pygame.K_LEFT:
+                    self.selected_card = max(0, self.selected_card - 1)
+                    self._adjust_scroll_to_selected()
+                elif event.key == pygame.K_RIGHT:
+                    self.selected_card = min(len(hand) - 1, self.selected_card + 1)
+                    self._adjust_scroll_to_selected()
+                elif event.key == pygame.K_p:
+                    return "PASS"
 
     def _adjust_scroll_to_selected(self):
         cards_per_view = (self.game_area_width - 40) // self.config['card_spacing']
@@ -327,46 +334,48 @@ class PyGameView(AbstractView):
         valid_rows = [r.name for r in card.row]
         if len(valid_rows) == 1:
             return valid_rows[0]
-        text = self.font.render("Choose row (c)lose, (r)anged, (s)iege:", True, self.COLORS['white'])
+        text = self._render("Choose row (c)lose, (r)anged, (s)iege:", self.COLORS['white'])
         self.screen.blit(text, (10, self.height - 30))
         pygame.display.flip()
         while True:
-            for event in pygame.event.get():
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_c:
-                        return "CLOSE"
-                    elif event.key == pygame.K_r:
-                        return "RANGED"
-                    elif event.key == pygame.K_s:
-                        return "SIEGE"
-                elif event.type == pygame.QUIT:
-                    raise KeyboardInterrupt
+            event = pygame.event.wait()
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_c:
+                    return "CLOSE"
+                elif event.key == pygame.K_r:
+                    return "RANGED"
+                elif event.key == pygame.K_s:
+                    return "SIEGE"
+            elif event.type == pygame.QUIT:
+                raise KeyboardInterrupt
 
     def get_graveyard_card_choice(self, revivable_cards) -> Optional[int]:
         if not revivable_cards:
             return None
         selection = 0
+        redraw = True
         while True:
-            self.screen.fill(self.COLORS['black'])
-            text = self.font.render("Choose card to revive (Enter to select, ESC to cancel):", 
-                                    True, self.COLORS['white'])
-            self.screen.blit(text, (10, 10))
-            for i, (idx, card) in enumerate(revivable_cards):
-                color = self.COLORS['yellow'] if i == selection else self.COLORS['white']
-                card_text = f"{i+1}) {card.name} ({card.value})"
-                text = self.font.render(card_text, True, color)
-                self.screen.blit(text, (10, 40 + i * 25))
-            pygame.display.flip()
-            for event in pygame.event.get():
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        return None
-                    elif event.key == pygame.K_RETURN:
-                        return revivable_cards[selection][0]
-                    elif event.key == pygame.K_UP:
-                        selection = max(0, selection - 1)
-                    elif event.key == pygame.K_DOWN:
-                        selection = min(len(revivable_cards) - 1, selection + 1)
+            if redraw:
+                self.screen.fill(self.COLORS['black'])
+                text = self._render("Choose card to revive (Enter to select, ESC to cancel):", self.COLORS['white'])
+                self.screen.blit(text, (10, 10))
+                for i, (idx, card) in enumerate(revivable_cards):
+                    color = self.COLORS['yellow'] if i == selection else self.COLORS['white']
+                    card_text = f"{i+1}) {card.name} ({card.value})"
+                    text = self._render(card_text, color)
+                    self.screen.blit(text, (10, 40 + i * 25))
+                pygame.display.flip()
+            event = pygame.event.wait()
+            redraw = event.type != pygame.MOUSEMOTION
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    return None
+                elif event.key == pygame.K_RETURN:
+                    return revivable_cards[selection][0]
+                elif event.key == pygame.K_UP:
+                    selection = max(0, selection - 1)
+                elif event.key == pygame.K_DOWN:
+                    selection = min(len(revivable_cards) - 1, selection + 1)
 
     def add_log_message(self, message: str):
         self.log.append(message)
@@ -375,13 +384,15 @@ class PyGameView(AbstractView):
         pass
 
     def handle_events(self, timeout: int = 100):
-        clock = pygame.time.Clock()
-        clock.tick(60)
-        for event in pygame.event.get():
+        """Handle queued events, waiting up to timeout ms only while the queue is empty"""
+        handled = False
+        event = pygame.event.wait(timeout) if timeout > 0 else pygame.event.poll()
+        while event.type != pygame.NOEVENT:
             if event.type == pygame.QUIT:
                 raise KeyboardInterrupt
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 self._handle_mouse_click(event)
+                handled = True
             elif event.type == pygame.MOUSEBUTTONUP:
                 if event.button == 1:
                     self.scrollbar_dragging = False
@@ -389,9 +400,14 @@ class PyGameView(AbstractView):
             elif event.type == pygame.MOUSEMOTION:
                 if self.scrollbar_dragging:
                     self._handle_scrollbar_drag(event.pos)
+                    handled = True
             elif event.type == pygame.KEYDOWN:
                 self._handle_keyboard_event(event)
-        pygame.time.wait(timeout)
+                handled = True
+            elif event.type in (pygame.VIDEOEXPOSE, pygame.VIDEORESIZE):
+                handled = True
+            event = pygame.event.poll()
+        return handled
 
     def _handle_mouse_click(self, event):
         if event.button == 1:
@@ -0,0 +1,72 @@
+from collections import OrderedDict
+from typing import Tuple
+
+class TextCache:
+    """Bounded LRU cache of rendered text surfaces and wrapped line layouts.
+
+    Surfaces are keyed by (text, font, color, antialias) and layouts by
+    (text, font, width), so a frame only renders text that is new since
+    the entries it reuses were drawn. The least recently used entry is
+    dropped once either cache holds capacity entries.
+    """
+    def __init__(self, capacity: int = 512):
+        self.capacity = capacity
+        self._surfaces = OrderedDict()
+        self._layouts = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._surfaces) + len(self._layouts)
+
+    def render(self, font, text: str, color, antialias: bool = True):
+        """Return font.render(text, antialias, color), rendering only on a miss"""
+        key = (text, font, color, antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self._store(self._surfaces, key, surface)
+        return surface
+
+    def wrap(self, font, text: str, max_width: int) -> Tuple[str, ...]:
+        """Split text into lines no wider than max_width, measuring only on a miss"""
+        key = (text, font, max_width)
+        lines = self._layouts.get(key)
+        if lines is not None:
+            self._layouts.move_to_end(key)
+            self.hits += 1
+            return lines
+        self.misses += 1
+        lines = []
+        current_line = ""
+        for word in text.split(' '):
+            test_line = f"{current_line} {word}" if current_line else word
+            if font.size(test_line)[0] <= max_width:
+                current_line = test_line
+            else:
+                if current_line:
+                    lines.append(current_line)
+                current_line = word
+        if current_line:
+            lines.append(current_line)
+        lines = tuple(lines)
+        self._store(self._layouts, key, lines)
+        return lines
+
+    def _store(self, entries: OrderedDict, key, value):
+        entries[key] = value
+        if len(entries) > self.capacity:
+            entries.popitem(last=False)
+
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def clear(self):
+        """Drop every entry, e.g. after the fonts were recreated"""
+        self._surfaces.clear()
+        self._layouts.clear()
@@ -1,15 +1,63 @@
-from typing import Optional
+import importlib
+from typing import Callable, Dict, List, Optional, Union
 from .AbstractView import AbstractView
-from .BoardView import BoardView
-from .PyGameView import PyGameView
+
+# Views are registered as "module:Class" and only imported when selected, so
+# a curses or headless run never pays for (or needs) pygame
+ViewSource = Union[str, Callable[[Optional[dict]], AbstractView]]
 
 class ViewFactory:
-    @staticmethod
-    def create_view(view_type: str, config: Optional[dict] = None) -> AbstractView:
-        """Create a view instance based on type"""
-        if view_type.lower() == "curses":
-            return BoardView(config)
-        elif view_type.lower() == "pygame":
-            return PyGameView(config)
-        else:
-            raise ValueError(f"Unknown view type: {view_type}")
+    # Third-party packages can add views under this entry point group
+    ENTRY_POINT_GROUP = "gwent_cli.views"
+
+    _registry: Dict[str, ViewSource] = {
+        "curses": "views.BoardView:BoardView",
+        "pygame": "views.PyGameView:PyGameView",
+        "headless": "views.NullView:NullView",
+    }
+
+    @classmethod
+    def register_view(cls, name: str, view: ViewSource):
+        """Register a view class, factory or "module:Class" path under name"""
+        cls._registry[name.lower()] = view
+
+    @classmethod
+    def available_views(cls) -> List[str]:
+        """Names of the registered views and of views installed as entry points"""
+        names = set(cls._registry)
+        names.update(entry_point.name.lower() for entry_point in cls._entry_points())
+        return sorted(names)
+
+    @classmethod
+    def is_available(cls, view_type: str) -> bool:
+        return view_type.lower() in cls._registry or cls._find_entry_point(view_type) is not None
+
+    @classmethod
+    def create_view(cls, view_type: str, config: Optional[dict] = None) -> AbstractView:
+        """Create a view instance based on type, importing its module on first use"""
+        name = view_type.lower()
+        view = cls._registry.get(name)
+        if view is None:
+            entry_point = cls._find_entry_point(name)
+            if entry_point is None:
+                raise ValueError(f"Unknown view type: {view_type}")
+            view = entry_point.load()
+        elif isinstance(view, str):
+            module_name, _, attribute = view.partition(":")
+            view = getattr(importlib.import_module(module_name), attribute)
+        # Remember the resolved class so later lookups skip the import machinery
+        cls._registry[name] = view
+        return view(config)
+
+    @classmethod
+    def _entry_points(cls):
+        # Imported here since scanning installed packages is only needed for unknown names
+        from importlib import metadata
+        return metadata.entry_points(group=cls.ENTRY_POINT_GROUP)
+
+    @classmethod
+    def _find_entry_point(cls, view_type: str):
+        for entry_point in cls._entry_points():
+            if entry_point.name.lower() == view_type.lower():
+                return entry_point
+        return None